@@ -0,0 +1,193 @@
+# action_executor.py
+"""
+Bounded executor for voice command side effects (opening the browser, messaging, ...)
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+from config import ACTION_CONFIG
+from timer_scheduler import get_scheduler
+
+
+class Action:
+    """One submitted side effect and its bookkeeping"""
+
+    __slots__ = ('name', 'func', 'args', 'group', 'timeout', 'on_done', 'timer', 'started', 'done')
+
+    def __init__(self, name, func, args, group, timeout, on_done):
+        self.name = name
+        self.func = func
+        self.args = args
+        self.group = group
+        self.timeout = timeout
+        self.on_done = on_done
+        self.timer = None
+        self.started = None
+        self.done = False
+
+
+class ActionExecutor:
+    """
+    Command handlers submit their side effects here and return at once, so the listener goes
+    straight back to capturing audio. At most `workers` actions run at a time, and each group
+    (e.g. "browser") has its own concurrency limit; further actions wait, and once max_pending
+    actions are waiting or running submit() refuses new ones.
+    Every action has a timeout on the shared timer scheduler, counted from when a worker starts it.
+    When it expires on_done reports a TimeoutError; a thread cannot be killed, so the call keeps its
+    slot until it returns, but its late result is ignored. on_done(name, result, error) runs exactly
+    once per accepted action; actions that never ran because of shutdown() get a CancelledError.
+    After shutdown() submit() refuses new actions.
+    """
+
+    def __init__(self, workers=None, max_pending=None, timeout=None, group_limits=None):
+        self.workers = workers or ACTION_CONFIG['workers']
+        self.max_pending = max_pending or ACTION_CONFIG['max_pending']
+        self.timeout = timeout or ACTION_CONFIG['timeout_seconds']
+        self.group_limits = dict(ACTION_CONFIG['group_limits'] if group_limits is None else group_limits)
+        self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="action")
+        self.scheduler = get_scheduler()
+
+        self.lock = threading.Lock()
+        self.running = {}  # group -> actions running
+        self.waiting = {}  # group -> deque of actions over the group's limit
+        self.pending = 0  # accepted and not yet returned
+        self.closed = False
+
+        # Statistics
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.rejected = 0
+        self.cancelled = 0
+        self.total_seconds = 0.0
+
+    def submit(self, name, func, *args, group=None, timeout=None, on_done=None):
+        """Queue func(*args) without blocking; returns False if too many actions are pending or after shutdown"""
+        action = Action(name, func, args, group or name, timeout or self.timeout, on_done)
+        with self.lock:
+            if self.closed:
+                self.rejected += 1
+                print(f"[WARN] Action '{name}' rejected: executor is shut down")
+                return False
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                print(f"[WARN] Action '{name}' rejected: {self.pending} actions pending")
+                return False
+            self.pending += 1
+            self.submitted += 1
+            start = self._claim(action)
+        if start:
+            self._start(action)
+        return True
+
+    def _claim(self, action):
+        # Called with the lock held: take a slot in the group or wait for one
+        limit = self.group_limits.get(action.group, ACTION_CONFIG['default_group_limit'])
+        if self.running.get(action.group, 0) < limit:
+            self.running[action.group] = self.running.get(action.group, 0) + 1
+            return True
+        self.waiting.setdefault(action.group, deque()).append(action)
+        return False
+
+    def _start(self, action):
+        try:
+            future = self.pool.submit(self._run, action)
+        except RuntimeError:
+            # Shut down between claiming the slot and handing the action to the pool
+            self._cancel(action)
+            return
+        future.add_done_callback(lambda f: self._cancel(action) if f.cancelled() else None)
+
+    def _cancel(self, action):
+        self._finish(action, None, CancelledError(f"{action.name} cancelled by shutdown"))
+        self._release(action)
+
+    def _run(self, action):
+        # The timeout counts from here, not from submit(): time spent waiting for a worker is free
+        action.started = time.monotonic()
+        action.timer = self.scheduler.schedule(
+            action.timeout,
+            lambda: self._finish(action, None, TimeoutError(f"{action.name} took over {action.timeout}s")),
+            name=f"action-{action.name}"
+        )
+        result, error = None, None
+        try:
+            result = action.func(*action.args)
+        except Exception as e:
+            error = e
+        self.scheduler.cancel(action.timer)
+        self._finish(action, result, error)
+        self._release(action)
+
+    def _finish(self, action, result, error):
+        with self.lock:
+            if action.done:
+                return
+            action.done = True
+            if action.started is not None:
+                self.total_seconds += time.monotonic() - action.started
+            if isinstance(error, CancelledError):
+                self.cancelled += 1
+            elif isinstance(error, TimeoutError):
+                self.timed_out += 1
+            elif error is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+        if action.on_done is not None:
+            try:
+                action.on_done(action.name, result, error)
+            except Exception as e:
+                print(f"[ERROR] Action '{action.name}' callback failed: {e}")
+
+    def _release(self, action):
+        # The slot is freed only when the call has really returned
+        with self.lock:
+            self.pending -= 1
+            self.running[action.group] -= 1
+            waiting = self.waiting.get(action.group)
+            next_action = waiting.popleft() if waiting and not self.closed else None
+            if next_action is not None:
+                self.running[action.group] += 1
+        if next_action is not None:
+            self._start(next_action)
+
+    def shutdown(self):
+        """Refuse new actions and cancel those that have not started; running ones finish in the background"""
+        with self.lock:
+            self.closed = True
+            waiting = [action for queue in self.waiting.values() for action in queue]
+            self.waiting.clear()
+        # Cancelled pool futures finish their actions through the done callback
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        for action in waiting:
+            # Never claimed a slot, so only the pending count is released
+            self._finish(action, None, CancelledError(f"{action.name} cancelled by shutdown"))
+            with self.lock:
+                self.pending -= 1
+
+    def get_stats(self):
+        """Pending/completed/failed/timed out/rejected/cancelled counts and average action time"""
+        with self.lock:
+            finished = self.completed + self.failed + self.timed_out
+            return {
+                'pending': self.pending,
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'timed_out': self.timed_out,
+                'rejected': self.rejected,
+                'cancelled': self.cancelled,
+                'avg_ms': 1000.0 * self.total_seconds / finished if finished else 0.0
+            }
+
+    def format_stats(self):
+        """Short text line for overlay or console"""
+        stats = self.get_stats()
+        return (f"actions: {stats['pending']} pending {stats['completed']} done {stats['failed']} failed "
+                f"{stats['timed_out']} timed out {stats['rejected']} rejected {stats['cancelled']} cancelled "
+                f"{stats['avg_ms']:.0f}ms")
@@ -8,14 +8,19 @@ from config import CAMERA_CONFIG
 
 
 class CameraManager:
-    def __init__(self):
+    def __init__(self, source=None):
+        # Device index or a stream URL / video file path
+        self.source = CAMERA_CONFIG['source'] if source is None else source
         self.cap = None
         self.initialize_camera()
 
     def initialize_camera(self):
         """Initialize camera with configuration settings"""
-        # Set up camera with DirectShow backend (Windows)
-        self.cap = cv2.VideoCapture(0, cv2.CAP_DSHOW)
+        if isinstance(self.source, int):
+            # Set up camera with DirectShow backend (Windows)
+            self.cap = cv2.VideoCapture(self.source, cv2.CAP_DSHOW)
+        else:
+            self.cap = cv2.VideoCapture(self.source)
 
         # Configure camera settings
         self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_CONFIG['width'])
@@ -23,10 +28,10 @@ class CameraManager:
         self.cap.set(cv2.CAP_PROP_FPS, CAMERA_CONFIG['fps'])
 
         if not self.cap.isOpened():
-            raise RuntimeError("[ERROR] Camera not accessible.")
+            raise RuntimeError(f"[ERROR] Camera {self.source} not accessible.")
 
         print(
-            f"[INFO] Camera initialized: {CAMERA_CONFIG['width']}x{CAMERA_CONFIG['height']} @ {CAMERA_CONFIG['fps']}fps")
+            f"[INFO] Camera {self.source} initialized: {CAMERA_CONFIG['width']}x{CAMERA_CONFIG['height']} @ {CAMERA_CONFIG['fps']}fps")
 
     def read_frame(self):
         """
@@ -8,9 +8,11 @@ import os
 # === Directory Configuration ===
 BASE_DIR = os.path.dirname(__file__)
 KNOWN_FACES_DIR = os.path.join(BASE_DIR, "Faces")
+KNOWN_VOICES_DIR = os.path.join(BASE_DIR, "Voices")
 
 # === Camera Configuration ===
 CAMERA_CONFIG = {
+    'source': 0,  # device index, or a stream URL / video file path
     'width': 1280,
     'height': 720,
     'fps': 30,
@@ -24,14 +26,16 @@ RECOGNITION_CONFIG = {
     'base_threshold': 0.5,
     'brightness_adjustment': 0.2,
     'upsample_times': 1,
-    'model': 'hog'
+    'model': 'hog',
+    'worker_processes': 2  # 0 runs recognition on a thread in the main process
 }
 
 # === Gaze Detection Configuration ===
 GAZE_CONFIG = {
     'threshold': 0.3,
     'eye_line_threshold': 0.3,
-    'symmetry_threshold': 0.4
+    'symmetry_threshold': 0.4,
+    'input_size': (640, 360)  # frame size FaceMesh runs on (the governor may shrink it)
 }
 
 # === Voice Recognition Configuration ===
@@ -40,7 +44,54 @@ VOICE_CONFIG = {
     'dynamic_energy_threshold': True,
     'timeout': 5,
     'phrase_time_limit': 5,
-    'language': 'en-IN'
+    'language': 'en-IN',
+    'transcriber_workers': 2,  # phrases transcribed concurrently while capture keeps listening
+    'transcriber_processes': False,  # run the speech backend in worker processes
+    'transcriber_queue': 4,  # phrases waiting for a worker before the oldest is dropped
+    'command_plugins': []  # modules with register_commands(registry) adding voice commands
+}
+
+# === Speech-to-Text Backend Configuration ===
+SPEECH_CONFIG = {
+    'backend': 'google',  # 'google' (online), 'vosk' or 'sphinx' (offline)
+    'fallback_backend': 'google',  # used when the configured backend cannot be loaded; None to fail
+    'vosk_model_path': os.path.join(BASE_DIR, "models", "vosk-model-small-en-in-0.4"),
+    'sphinx_language': 'en-US'
+}
+
+# === Voice Activity Detection Configuration ===
+VAD_CONFIG = {
+    'aggressiveness': 2,  # webrtcvad 0 (lenient) .. 3 (strict)
+    'frame_ms': 30,  # 10, 20 or 30
+    'min_speech_ms': 300,  # phrases with less detected speech are not transcribed
+    'padding_ms': 300  # silence kept before and after the speech
+}
+
+# === Voice Command Action Configuration ===
+ACTION_CONFIG = {
+    'workers': 4,  # command side effects running at once
+    'max_pending': 8,  # waiting + running actions before new ones are refused
+    'timeout_seconds': 10,  # an action reports a timeout after this long
+    'group_limits': {'browser': 1, 'messaging': 1},  # concurrency per action group
+    'default_group_limit': 2
+}
+
+# === Wake Word Configuration ===
+WAKE_WORD_CONFIG = {
+    'enabled': True,  # needs vosk and SPEECH_CONFIG['vosk_model_path']; without them every phrase is transcribed
+    'phrases': ['hey camera'],  # lower-case, words must be in the Vosk model's vocabulary
+    'window_seconds': 5,  # after a lone wake word, the next phrase within this time is the command
+    'min_command_ms': 500,  # audio after the wake word needed to treat it as the command itself
+    'hangover_ms': 300,  # quiet audio still fed to the spotter after speech
+    'cpu_budget': 0.15,  # share of one core the spotter may use
+    'budget_window_seconds': 5
+}
+
+# === Speaker Verification Configuration ===
+SPEAKER_CONFIG = {
+    'enabled': True,  # needs resemblyzer and voices enrolled with speaker_verification.py; off otherwise
+    'threshold': 0.75,  # cosine similarity to an enrolled sample of the person in view
+    'timeout_seconds': 5  # longest a command waits for its speaker embedding
 }
 
 # === Verification System Configuration ===
@@ -55,7 +106,72 @@ VERIFICATION_CONFIG = {
 SYSTEM_CONFIG = {
     'no_face_reset_frames': 45,  # frames before reset (roughly 1.5 seconds at 30 FPS)
     'tf_log_level': '3',
-    'cv2_threads': 1
+    'cv2_threads': 1,
+    'headless': False  # same as the --headless command line flag
+}
+
+# === UI Configuration ===
+UI_CONFIG = {
+    'max_cached_sprites': 256,  # pre-rendered overlay text sprites kept in memory
+    'display_fps': 15  # preview refresh rate, independent of the processing rate
+}
+
+# === Headless Control Configuration ===
+CONTROL_CONFIG = {
+    'host': '127.0.0.1',  # loopback only
+    'port': 8765
+}
+
+# === Preview Server Configuration ===
+PREVIEW_CONFIG = {
+    'enabled': False,  # same as the --preview-port command line flag
+    'host': '0.0.0.0',  # viewers are still limited to loopback/private/link-local addresses
+    'port': 8080,
+    'fps': 10,  # frames annotated and JPEG-encoded per second while viewers are connected
+    'jpeg_quality': 70,
+    'client_queue': 2  # frames buffered per viewer before the oldest is dropped
+}
+
+# === Recorder Configuration ===
+RECORDER_CONFIG = {
+    'enabled': False,  # same as the --record command line flag
+    'output_dir': os.path.join(BASE_DIR, "recordings"),
+    'codec': 'mp4v',  # 'mp4v' writes .mp4 segments, 'MJPG' writes .avi segments
+    'preroll_seconds': 2.0,  # annotated frames kept from before an unknown person triggers recording
+    'postroll_seconds': 3.0,  # keep recording after access is denied or granted
+    'segment_seconds': 60,  # rotate segments by duration...
+    'segment_max_mb': 50,  # ...or by size
+    'queue_size': 30  # frames waiting for the encoder before the oldest is dropped
+}
+
+# === Pipeline Configuration ===
+PIPELINE_CONFIG = {
+    'queue_depth': 1,  # latest-wins queues: only the newest frame is kept
+    'stats_interval': 5.0  # seconds between pipeline stats printouts in debug mode
+}
+
+# === Latency Governor Configuration ===
+GOVERNOR_CONFIG = {
+    'enabled': True,
+    'target_latency_ms': 120,  # capture -> decision/display latency to hold
+    'recognition_budget_ms': 400,  # service time allowed for one recognition pass
+    'hysteresis': 0.25,  # no change while within +/-25% of the target
+    'adjust_interval': 1.0,  # seconds between steps, one knob moves one step at a time
+    'smoothing': 0.2,  # EMA factor for measurements
+    'resize_factor_range': (0.25, 0.75),
+    'resize_step': 0.125,
+    'upsample_range': (0, 2),
+    'gaze_input_width_range': (320, 640),  # FaceMesh input width, height keeps the aspect ratio
+    'gaze_input_step': 160,
+    'max_gaze_interval': 4,  # FaceMesh on at least every 4th frame
+    'max_display_interval': 3  # display at no less than a third of its refresh rate
+}
+
+# === Multi-Camera Configuration ===
+MULTI_STREAM_CONFIG = {
+    'sources': [0, 1, 2, 3],  # one entry per entrance camera
+    'gaze_workers': 2,  # threads running FaceMesh, shared fairly across streams
+    'stats_interval': 10.0  # seconds between per-stream throughput reports
 }
 
 # === MediaPipe Landmarks ===
@@ -0,0 +1,80 @@
+# control_server.py
+"""
+Local control channel for headless mode: line commands over a loopback socket and POSIX signals
+"""
+
+import signal
+import socketserver
+import threading
+from config import CONTROL_CONFIG
+
+LOOPBACK_HOSTS = ('127.0.0.1', 'localhost', '::1')
+
+
+class _ControlRequestHandler(socketserver.StreamRequestHandler):
+    """Reads one command per line and writes one reply per line"""
+
+    def handle(self):
+        for raw_line in self.rfile:
+            command = raw_line.decode('utf-8', errors='ignore').strip().lower()
+            if not command:
+                continue
+            reply = self.server.command_handler(command)
+            self.wfile.write((reply + "\n").encode('utf-8'))
+            if command == 'quit':
+                break
+
+
+class _ControlTCPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class ControlServer:
+    """
+    Accepts control commands (reset, debug, quit, status) from local clients,
+    e.g. `echo reset | nc 127.0.0.1 8765`
+    """
+
+    def __init__(self, command_handler, host=None, port=None):
+        self.host = host or CONTROL_CONFIG['host']
+        self.port = port if port is not None else CONTROL_CONFIG['port']
+        if self.host not in LOOPBACK_HOSTS:
+            raise ValueError(f"[ERROR] Control server must bind to a loopback address, got {self.host}")
+
+        self.command_handler = command_handler
+        self.server = None
+        self.thread = None
+
+    def start(self):
+        """Start serving on a background thread"""
+        self.server = _ControlTCPServer((self.host, self.port), _ControlRequestHandler)
+        self.server.command_handler = self.command_handler
+        self.thread = threading.Thread(target=self.server.serve_forever, name="control-server", daemon=True)
+        self.thread.start()
+        print(f"[INFO] Control server listening on {self.host}:{self.port}")
+
+    def stop(self):
+        """Stop serving and close the socket"""
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+def install_signal_handlers(command_handler):
+    """
+    Map signals to control commands:
+    SIGTERM/SIGINT -> quit, SIGHUP -> reset, SIGUSR1 -> debug (where the platform has them)
+    Must be called from the main thread.
+    """
+    mapping = {
+        'SIGTERM': 'quit',
+        'SIGINT': 'quit',
+        'SIGHUP': 'reset',
+        'SIGUSR1': 'debug'
+    }
+    for signal_name, command in mapping.items():
+        signum = getattr(signal, signal_name, None)
+        if signum is not None:
+            signal.signal(signum, lambda _signum, _frame, command=command: command_handler(command))
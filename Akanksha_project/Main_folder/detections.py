@@ -0,0 +1,73 @@
+# detections.py
+"""
+Compact detection and per-frame result records shared by recognition and decision code
+"""
+
+from config import VERIFICATION_CONFIG
+
+UNKNOWN_NAME = "Unknown Face"
+KNOWN_COLOR = (0, 255, 0)
+UNKNOWN_COLOR = (0, 0, 255)
+
+
+class Detection:
+    """One recognized face; module-level with __slots__ so it pickles cheaply from worker processes"""
+
+    __slots__ = ('name', 'location', 'color', 'distance', 'confidence', 'encoding')
+
+    def __init__(self, name, location, color, distance, confidence, encoding=None):
+        self.name = name
+        self.location = location  # (top, right, bottom, left) in frame coordinates
+        self.color = color
+        self.distance = distance
+        self.confidence = confidence
+        self.encoding = encoding
+
+    @property
+    def is_unknown(self):
+        return self.name == UNKNOWN_NAME
+
+    def to_event(self):
+        """JSON-friendly fields for the event log"""
+        return {
+            'name': self.name,
+            'location': self.location,
+            'distance': round(float(self.distance), 4),
+            'confidence': round(float(self.confidence), 4)
+        }
+
+    def __repr__(self):
+        return f"Detection({self.name!r}, {self.location}, confidence={float(self.confidence):.2f})"
+
+
+class FrameResult:
+    """
+    Detections for one recognized frame with the aggregates every consumer needs,
+    computed once here instead of rescanning the list in each decision and drawing step.
+    Treat as read-only after construction: it is shared between the decision and display threads.
+    """
+
+    __slots__ = ('frame_id', 'session_id', 'detections', 'names', 'known_names',
+                 'has_unknown', 'has_authorized')
+
+    def __init__(self, frame_id, session_id, detections):
+        self.frame_id = frame_id
+        self.session_id = session_id
+        self.detections = tuple(detections)
+        self.names = [d.name for d in self.detections]
+        self.known_names = [name for name in self.names if name != UNKNOWN_NAME]
+        self.has_unknown = len(self.known_names) < len(self.names)
+        self.has_authorized = VERIFICATION_CONFIG['authorized_name'] in self.known_names
+
+    def __bool__(self):
+        return bool(self.detections)
+
+    def __len__(self):
+        return len(self.detections)
+
+    def __iter__(self):
+        return iter(self.detections)
+
+
+# Shared result for "nothing recognized yet"
+EMPTY_RESULT = FrameResult(None, None, ())
@@ -0,0 +1,53 @@
+# event_log.py
+"""
+Recognition and verification events written as JSON lines
+"""
+
+import json
+import threading
+import time
+
+
+class EventEmitter:
+    """
+    Writes one JSON object per line to a stream; a None stream disables output.
+    Listeners receive every event in-process, whether or not a stream is set.
+    """
+
+    def __init__(self, stream=None, owns_stream=False):
+        self.stream = stream
+        self.owns_stream = owns_stream
+        self.lock = threading.Lock()
+        self.listeners = []
+
+    def add_listener(self, listener):
+        """
+        Call listener(event_type, fields) for every event
+        Listeners run on the emitting thread (often under a session lock) and must return quickly
+        """
+        self.listeners.append(listener)
+
+    def is_enabled(self):
+        """Check if events are being written"""
+        return self.stream is not None
+
+    def emit(self, event_type, **fields):
+        """Write an event with a wall-clock timestamp"""
+        for listener in self.listeners:
+            listener(event_type, fields)
+
+        if self.stream is None:
+            return
+        event = {'event': event_type, 'time': round(time.time(), 3)}
+        event.update(fields)
+        line = json.dumps(event, default=str)
+        with self.lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+    def close(self):
+        """Stop emitting; closes the stream if it was opened for this emitter"""
+        with self.lock:
+            if self.stream is not None and self.owns_stream:
+                self.stream.close()
+            self.stream = None
@@ -8,6 +8,7 @@ import cv2
 import face_recognition
 import numpy as np
 from config import KNOWN_FACES_DIR, RECOGNITION_CONFIG
+from detections import Detection, UNKNOWN_NAME, KNOWN_COLOR, UNKNOWN_COLOR
 
 
 class FaceRecognitionManager:
@@ -45,61 +46,74 @@ class FaceRecognitionManager:
                 else:
                     print(f"[WARN] No face detected in {filename}")
 
-    def recognize_faces(self, frame):
+    def recognize_faces(self, frame, boxes=None, resize_factor=None, upsample_times=None):
         """
         Recognize faces in the given frame
-        Returns list of detection dictionaries
+        Returns list of Detection records
         """
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        small = cv2.resize(rgb, (0, 0),
-                           fx=RECOGNITION_CONFIG['resize_factor'],
-                           fy=RECOGNITION_CONFIG['resize_factor'])
-
+        return recognize_frame(frame, self.known_face_encodings, self.known_face_names, boxes,
+                               resize_factor, upsample_times)
+
+
+def recognize_frame(frame, known_face_encodings, known_face_names, boxes=None,
+                    resize_factor=None, upsample_times=None):
+    """
+    Locate, encode and match faces in a BGR frame against the known gallery.
+    If boxes (top, right, bottom, left in frame coordinates) are given, face
+    location is skipped and only those faces are encoded.
+    resize_factor / upsample_times override RECOGNITION_CONFIG (used by the latency governor).
+    Module-level so recognition worker processes can call it without a manager.
+    """
+    if resize_factor is None:
+        resize_factor = RECOGNITION_CONFIG['resize_factor']
+    if upsample_times is None:
+        upsample_times = RECOGNITION_CONFIG['upsample_times']
+    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    small = cv2.resize(rgb, (0, 0), fx=resize_factor, fy=resize_factor)
+
+    if boxes is None:
         locations = face_recognition.face_locations(
             small,
-            number_of_times_to_upsample=RECOGNITION_CONFIG['upsample_times'],
+            number_of_times_to_upsample=upsample_times,
             model=RECOGNITION_CONFIG['model']
         )
-
-        detections = []
-        if locations:
-            encodings = face_recognition.face_encodings(small, locations)
-            brightness = np.mean(frame)
-            threshold = (RECOGNITION_CONFIG['base_threshold'] +
-                         RECOGNITION_CONFIG['brightness_adjustment'] *
-                         (128 - brightness) / 128)
-
-            for enc, loc in zip(encodings, locations):
-                # Scale back up locations
-                scale = 1 / RECOGNITION_CONFIG['resize_factor']
-                top, right, bottom, left = [int(v * scale) for v in loc]
-
-                # Filter out small faces
-                if (right - left < RECOGNITION_CONFIG['min_face_size'] or
-                        bottom - top < RECOGNITION_CONFIG['min_face_size']):
-                    continue
-
-                # Find best match
-                distances = face_recognition.face_distance(self.known_face_encodings, enc)
-
-                if len(distances) > 0:
-                    best_idx = np.argmin(distances)
-                    best_dist = distances[best_idx]
-
-                    name, color = "Unknown Face", (0, 0, 255)
-                    confidence = 0
-
-                    if best_dist < threshold:
-                        name = self.known_face_names[best_idx]
-                        color = (0, 255, 0)
-                        confidence = 1 - best_dist
-
-                    detections.append({
-                        "name": name,
-                        "location": (top, right, bottom, left),
-                        "color": color,
-                        "distance": best_dist,
-                        "confidence": confidence
-                    })
-
-        return detections
\ No newline at end of file
+    else:
+        locations = [tuple(int(v * resize_factor) for v in box) for box in boxes]
+
+    detections = []
+    if locations:
+        encodings = face_recognition.face_encodings(small, locations)
+        brightness = np.mean(frame)
+        threshold = (RECOGNITION_CONFIG['base_threshold'] +
+                     RECOGNITION_CONFIG['brightness_adjustment'] *
+                     (128 - brightness) / 128)
+
+        for enc, loc in zip(encodings, locations):
+            # Scale back up locations
+            scale = 1 / resize_factor
+            top, right, bottom, left = [int(v * scale) for v in loc]
+
+            # Filter out small faces
+            if (right - left < RECOGNITION_CONFIG['min_face_size'] or
+                    bottom - top < RECOGNITION_CONFIG['min_face_size']):
+                continue
+
+            # Find best match
+            distances = face_recognition.face_distance(known_face_encodings, enc)
+
+            if len(distances) > 0:
+                best_idx = np.argmin(distances)
+                best_dist = distances[best_idx]
+
+                name, color = UNKNOWN_NAME, UNKNOWN_COLOR
+                confidence = 0
+
+                if best_dist < threshold:
+                    name = known_face_names[best_idx]
+                    color = KNOWN_COLOR
+                    confidence = 1 - best_dist
+
+                detections.append(Detection(name, (top, right, bottom, left), color,
+                                            best_dist, confidence, enc))
+
+    return detections
@@ -8,7 +8,9 @@ from config import LANDMARKS, GAZE_CONFIG
 
 
 class GazeDetector:
-    def __init__(self):
+    def __init__(self, input_size=None):
+        # input_size: callable returning the FaceMesh input (width, height), e.g. the latency governor's
+        self.input_size = input_size or (lambda: GAZE_CONFIG['input_size'])
         self.mp_face_mesh = mp.solutions.face_mesh
         self.face_mesh = self.mp_face_mesh.FaceMesh(refine_landmarks=True)
 
@@ -21,7 +23,7 @@ class GazeDetector:
     def _resize_frame_for_processing(self, frame):
         """Resize frame for efficient processing"""
         import cv2
-        frame_small = cv2.resize(frame, (640, 360))
+        frame_small = cv2.resize(frame, self.input_size())
         return cv2.cvtColor(frame_small, cv2.COLOR_BGR2RGB)
 
     def is_person_looking_at_camera(self, frame, landmarks):
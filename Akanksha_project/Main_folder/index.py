@@ -12,147 +12,256 @@ logging.getLogger('mediapipe').setLevel(logging.ERROR)
 
 # === Imports ===
 import cv2
+import sys
+import json
 import time
-from config import SYSTEM_CONFIG, VERIFICATION_CONFIG
+import argparse
+import threading
+from config import SYSTEM_CONFIG, PIPELINE_CONFIG, PREVIEW_CONFIG, RECORDER_CONFIG
 from camera_manager import CameraManager
 from face_recognition_module import FaceRecognitionManager
+from recognition_executor import RecognitionExecutor
 from gaze_detection import GazeDetector
 from voice_recognition import VoiceRecognitionManager
-from verification_system import VerificationSystem
+from speech_backends import BACKENDS
+from stream_session import StreamSession
+from detections import FrameResult
 from ui_manager import UIManager
+from pipeline import Pipeline, PipelineStage, LatestQueue
+from control_server import ControlServer, install_signal_handlers
+from event_log import EventEmitter
+from latency_governor import LatencyGovernor
+from timer_scheduler import get_scheduler
+from display import DisplayThread
+from preview_server import PreviewServer
+from recorder import SessionRecorder
 
 # Set OpenCV threads
 cv2.setNumThreads(SYSTEM_CONFIG['cv2_threads'])
 
+# Keyboard shortcuts map to the same commands the headless control channel accepts
+KEY_COMMANDS = {
+    ord('q'): 'quit',
+    ord('d'): 'debug',
+    ord('r'): 'reset'
+}
+
 
 class FaceRecognitionApp:
-    def __init__(self):
+    def __init__(self, headless=None, control_port=None, events=None, preview_port=None, record=None,
+                 speech_backend=None):
         print("[INFO] Initializing Face Recognition System...")
+        self.headless = SYSTEM_CONFIG['headless'] if headless is None else headless
 
         # Initialize all components
         self.camera_manager = CameraManager()
         self.face_recognition_manager = FaceRecognitionManager()
-        self.gaze_detector = GazeDetector()
-        self.voice_manager = VoiceRecognitionManager()
-        self.verification_system = VerificationSystem()
-        self.ui_manager = UIManager()
+        self.recognition_executor = RecognitionExecutor(self.face_recognition_manager)
+        self.voice_manager = VoiceRecognitionManager(speech_backend)
+        preview_enabled = PREVIEW_CONFIG['enabled'] or preview_port is not None
+        record_enabled = RECORDER_CONFIG['enabled'] if record is None else record
+        # No window or overlay work in headless mode unless the preview or recorder needs annotated frames
+        self.ui_manager = UIManager() if not self.headless or preview_enabled or record_enabled else None
+        self.control_server = ControlServer(self.handle_command, port=control_port) if self.headless else None
+        self.events = events or EventEmitter()
+        self.governor = LatencyGovernor()
+        # FaceMesh input size is one of the governor's knobs
+        self.gaze_detector = GazeDetector(input_size=self.governor.get_gaze_input_size)
+        # The preview refreshes on its own thread and rate; the governor can slow it down
+        self.display = None
+        if not self.headless:
+            self.display = DisplayThread(self.render_display, on_key=self.handle_keyboard_input,
+                                         setup=self.ui_manager.create_window, teardown=self.ui_manager.cleanup,
+                                         interval_scale=lambda: self.governor.display_interval)
+        elif record_enabled:
+            # Headless: annotate frames for the recorder at the display rate, without a window
+            self.display = DisplayThread(self.render_recording, show_window=False)
+        self.recorder = None
+        if record_enabled:
+            # Verification events start and stop the recording
+            self.recorder = SessionRecorder(self.events, self.display.fps, rate=self.display.get_render_rate)
+            self.events.add_listener(self.recorder.on_event)
+        self.preview_server = None
+        if preview_enabled:
+            self.preview_server = PreviewServer(self.render_preview, self.get_status, port=preview_port)
 
         # State variables
         self.debug_mode = False
-        self.recognition_done = False
-        self.last_detections = []
-        self.processed_faces = set()
-        self.gaze_detected = False
-        self.unknown_person_detected = False
-        self.no_face_counter = 0
+        self.frame_count = 0
+        self.last_stats_time = time.monotonic()
+        self.stop_event = threading.Event()
+
+        self._build_pipeline()
+
+        # Tracker, gaze and verification state of the single camera stream
+        self.session = StreamSession(0, self.events, self.recognition_queue.put,
+                                     on_reset=self.voice_manager.clear_last_input)
+        self.verification_system = self.session.verification_system
+
+        # Shared state is written by the decision stage and snapshotted by the display thread
+        self.state_lock = self.session.lock
 
         print("[INFO] Face Recognition System initialized successfully!")
 
-    def reset_system_state(self):
+    def _build_pipeline(self):
+        """
+        Create the stages: capture -> gaze -> decision, with recognition running
+        beside them at whatever rate it can sustain and the display thread sampling capture
+        """
+        depth = PIPELINE_CONFIG['queue_depth']
+        self.pipeline = Pipeline()
+
+        self.gaze_queue = self.pipeline.add_queue(LatestQueue('gaze', depth))
+        self.recognition_queue = self.pipeline.add_queue(LatestQueue('recognition', 1))
+        self.decision_queue = self.pipeline.add_queue(LatestQueue('decision', depth))
+        self.result_queue = self.pipeline.add_queue(LatestQueue('result', 1))
+
+        self.pipeline.add_stage(PipelineStage('capture', self.capture_stage))
+        self.pipeline.add_stage(PipelineStage('gaze', self.gaze_stage, self.gaze_queue))
+        self.pipeline.add_stage(PipelineStage('recognition', self.recognition_stage, self.recognition_queue))
+        self.pipeline.add_stage(PipelineStage('decision', self.decision_stage, self.decision_queue))
+
+    def reset_system_state(self, reason="no_face"):
         """Reset the system state when no face is detected"""
-        self.last_detections.clear()
-        self.processed_faces.clear()
-        self.recognition_done = False
-        self.voice_manager.clear_last_input()
-        self.no_face_counter = 0
-        self.verification_system.reset_verification_system()
-        print("[INFO] No face detected for extended time - system reset")
-
-    def process_frame(self, frame):
-        """Process a single frame for gaze detection and face recognition"""
-        # Detect gaze and face landmarks
-        self.gaze_detected, has_landmarks = self.gaze_detector.detect_gaze_and_face_view(frame)
-
-        if self.debug_mode and self.gaze_detected:
-            print("[DEBUG] Gaze and clear face view detected")
-
-        # Face recognition logic (only once per gaze session)
-        if not self.recognition_done and self.gaze_detected:
-            detections = self.face_recognition_manager.recognize_faces(frame)
-
-            if detections:
-                self.last_detections = detections
-                self.recognition_done = True
-                self.no_face_counter = 0
-
-                # Update processed faces
-                for detection in detections:
-                    self.processed_faces.add(detection['name'])
-
-                print(f"[INFO] Recognition completed. Detected: {[d['name'] for d in detections]}")
-
-                # Check if known person detected during verification
-                self.verification_system.check_for_known_person(self.last_detections)
-            else:
-                self.no_face_counter += 1
-        else:
-            # Update no face counter
-            if not has_landmarks:
-                self.no_face_counter += 1
-            else:
-                self.no_face_counter = 0
+        self.session.reset_state(reason)
+
+    # === Pipeline stages ===
+
+    def capture_stage(self):
+        """Read a frame and hand it to the gaze and render stages"""
+        ret, frame = self.camera_manager.read_frame()
+        if not ret:
+            time.sleep(0.1)
+            return False
+
+        self.frame_count += 1
+        packet = {
+            'frame_id': self.frame_count,
+            'frame': frame,
+            'timestamp': time.monotonic()
+        }
+        if self.governor.should_process_gaze(self.frame_count):
+            self.gaze_queue.put(packet)
+        if self.display is not None:
+            self.display.submit(packet)
+        if self.preview_server is not None:
+            self.preview_server.submit(packet)
+
+    def gaze_stage(self, packet):
+        """Run FaceMesh gaze detection on the newest frame"""
+        gaze_detected, has_landmarks = self.gaze_detector.detect_gaze_and_face_view(packet['frame'])
+        self.decision_queue.put(dict(packet, gaze_detected=gaze_detected, has_landmarks=has_landmarks))
+
+    def recognition_stage(self, packet):
+        """Hand a frame requested by the decision stage to the recognition workers"""
+        start = time.monotonic()
+        future = self.recognition_executor.submit(packet['frame'], options=self.governor.get_recognition_options())
+        future.add_done_callback(lambda f: self.on_recognition_done(packet, start, f))
+
+    def on_recognition_done(self, packet, start, future):
+        """Forward worker results to the decision stage"""
+        self.governor.record_recognition_cost(time.monotonic() - start)
+        try:
+            detections = future.result()
+        except Exception as e:
+            print(f"[ERROR] Face recognition failed: {e}")
+            detections = []
 
-        # Reset logic if no face detected for extended time
-        if self.no_face_counter > SYSTEM_CONFIG['no_face_reset_frames']:
-            self.reset_system_state()
+        self.result_queue.put(FrameResult(packet['frame_id'], packet['session_id'], detections))
 
-    def handle_unknown_person_detection(self):
-        """Handle unknown person detection and verification"""
-        if self.last_detections:
-            self.unknown_person_detected = any(d['name'] == "Unknown Face" for d in self.last_detections)
+    def decision_stage(self, packet):
+        """Apply gaze and recognition results and drive verification and voice state"""
+        with self.state_lock:
+            result = self.result_queue.get_nowait()
+            if result is not None:
+                self.session.apply_recognition_result(result)
 
-            if self.unknown_person_detected:
-                verification_status = self.verification_system.handle_unknown_person_verification()
+            self.session.apply_gaze_result(packet)
+            self.session.handle_unknown_person_detection()
+            self.update_voice_recognition()
 
-                # Reset recognition for retry attempts
-                if verification_status == "retry_attempt":
-                    self.recognition_done = False
-                    self.last_detections.clear()
-                    self.processed_faces.clear()
-            else:
-                # Known face detected - reset verification if needed
-                self.verification_system.check_for_known_person(self.last_detections)
-        else:
-            # No detections - face has moved away
-            if self.verification_system.is_in_progress():
-                self.verification_system.handle_face_disappeared()
-            self.unknown_person_detected = False
+        if self.headless:
+            # Without a display the decision is the last stage a frame goes through
+            self.governor.record_frame_latency(time.monotonic() - packet['timestamp'])
+
+    def render_display(self, packet):
+        """Draw the UI on the newest captured frame and show it (display thread)"""
+        frame = self.render_annotated(packet)
+        self.ui_manager.display_frame(frame)
+        self.governor.record_frame_latency(time.monotonic() - packet['timestamp'])
+        if self.recorder is not None:
+            self.recorder.submit(frame)
+
+    def render_recording(self, packet):
+        """Annotate the newest captured frame for the recorder (headless display thread)"""
+        self.recorder.submit(self.render_annotated(packet))
+
+    def render_preview(self, packet):
+        """Draw the UI for the preview server (preview encoder thread)"""
+        return self.render_annotated(packet)
+
+    def render_annotated(self, packet):
+        """Annotated copy of a captured frame"""
+        # Other stages may still be reading the captured frame, so draw on a copy
+        frame = packet['frame'].copy()
+        self.render_frame(frame, self.snapshot_state())
+        return frame
 
     def update_voice_recognition(self):
         """Update voice recognition state"""
         self.voice_manager.update_listening_state(
-            self.gaze_detected,
-            self.last_detections,
-            self.unknown_person_detected,
+            self.session.gaze_detected,
+            self.session.last_result,
+            self.session.unknown_person_detected,
             self.verification_system.is_in_progress()
         )
 
-    def render_frame(self, frame):
-        """Render the frame with all UI elements"""
+    def snapshot_state(self):
+        """Copy the state the overlay needs, so drawing does not hold the state lock"""
+        with self.state_lock:
+            session = self.session
+            attempt_info = self.verification_system.get_attempt_info()
+            return {
+                'result': session.last_result,  # read-only, shared without copying
+                'unknown_person_detected': session.unknown_person_detected,
+                'gaze_detected': session.gaze_detected,
+                'recognition_done': session.recognition_done,
+                'verification': {
+                    'in_progress': attempt_info['in_progress'],
+                    'current_attempt': attempt_info['current_attempt'],
+                    'max_attempts': attempt_info['max_attempts'],
+                    'message': self.verification_system.get_verification_message(),
+                    'cooldown_remaining': self.verification_system.get_cooldown_remaining()
+                },
+                'listening': self.voice_manager.is_listening,
+                'voice_input': self.voice_manager.get_last_input()
+            }
+
+    def render_frame(self, frame, state):
+        """Render the frame with all UI elements from a state snapshot"""
+        result = state['result']
+        verification = state['verification']
+
         # Draw face detections
-        if self.last_detections:
-            self.ui_manager.draw_face_detections(frame, self.last_detections, self.debug_mode)
+        if result:
+            self.ui_manager.draw_face_detections(frame, result.detections, self.debug_mode)
 
         # Generate and draw main message
         main_message = self.ui_manager.generate_main_message(
-            self.last_detections,
-            self.verification_system,
-            self.unknown_person_detected
+            result,
+            verification,
+            state['unknown_person_detected']
         )
         self.ui_manager.draw_main_message(frame, main_message)
 
         # Draw voice status
-        is_authorized_detected = (
-                self.last_detections and
-                any(d['name'] == VERIFICATION_CONFIG['authorized_name'] for d in self.last_detections) and
-                not self.verification_system.is_in_progress()
-        )
+        is_authorized_detected = result.has_authorized and not verification['in_progress']
 
         self.ui_manager.draw_voice_status(
             frame,
-            self.voice_manager.is_listening,
-            self.verification_system.is_in_progress(),
-            self.unknown_person_detected
+            state['listening'],
+            verification['in_progress'],
+            state['unknown_person_detected']
         )
 
         # Draw listening indicator for authorized users
@@ -160,10 +269,10 @@ class FaceRecognitionApp:
             self.ui_manager.draw_listening_indicator(frame, True)
 
         # Draw voice input
-        voice_input = self.voice_manager.get_last_input()
-        if not voice_input and self.verification_system.get_verification_message():
-            voice_input = self.verification_system.get_verification_message()
-        elif not voice_input and not self.gaze_detected:
+        voice_input = state['voice_input']
+        if not voice_input and verification['message']:
+            voice_input = verification['message']
+        elif not voice_input and not state['gaze_detected']:
             voice_input = "Please look at the camera to activate"
 
         self.ui_manager.draw_voice_input(frame, voice_input)
@@ -171,64 +280,116 @@ class FaceRecognitionApp:
         # Draw debug information
         if self.debug_mode:
             debug_info = {
-                "Gaze": "YES" if self.gaze_detected else "NO",
-                "Recognition": "DONE" if self.recognition_done else "PENDING",
-                "Verification": "YES" if self.verification_system.is_in_progress() else "NO"
+                "Gaze": "YES" if state['gaze_detected'] else "NO",
+                "Recognition": "DONE" if state['recognition_done'] else "PENDING",
+                "Verification": "YES" if verification['in_progress'] else "NO",
+                "Attempts": f"{verification['current_attempt']}/{verification['max_attempts']}"
             }
-            attempt_info = self.verification_system.get_attempt_info()
-            debug_info["Attempts"] = f"{attempt_info['current_attempt']}/{attempt_info['max_attempts']}"
 
             self.ui_manager.draw_debug_info(frame, debug_info)
+            self.ui_manager.draw_pipeline_stats(frame, self.get_stats_lines() + self.governor.format_lines())
 
         # Draw help text
         self.ui_manager.draw_help_text(frame)
 
-        # Display frame
-        self.ui_manager.display_frame(frame)
-
     def handle_keyboard_input(self, key):
         """Handle keyboard input"""
-        if key == ord('q'):
-            return False  # Exit
-        elif key == ord('d'):
+        command = KEY_COMMANDS.get(key)
+        if command:
+            self.handle_command(command)
+
+    def handle_command(self, command):
+        """
+        Apply a control command from the keyboard, control socket or a signal
+        Returns a short reply string
+        """
+        if command == 'quit':
+            self.request_stop()
+        elif command == 'debug':
             self.debug_mode = not self.debug_mode
+            self.session.debug_mode = self.debug_mode
             print(f"[INFO] Debug mode: {'ON' if self.debug_mode else 'OFF'}")
-        elif key == ord('r'):  # Manual reset
-            self.verification_system.reset_verification_system()
-            self.reset_system_state()
+            return f"debug {'on' if self.debug_mode else 'off'}"
+        elif command == 'reset':  # Manual reset
+            with self.state_lock:
+                self.verification_system.reset_verification_system()
+                self.reset_system_state(reason="manual")
             print("[INFO] Manual system reset")
-
-        return True  # Continue
+        elif command == 'status':
+            return json.dumps(self.get_status(), default=str)
+        else:
+            return f"unknown command: {command}"
+
+        return "ok"
+
+    def request_stop(self):
+        """Ask the main loop to finish"""
+        self.stop_event.set()
+
+    def get_status(self):
+        """Snapshot of the current recognition and verification state"""
+        status = self.session.get_status()
+        status['listening'] = self.voice_manager.is_listening
+        status['speech'] = self.voice_manager.backend.get_stats()
+        status['vad'] = self.voice_manager.vad_gate.get_stats()
+        status['wake_word'] = self.voice_manager.wake_word.get_stats()
+        status['transcriber'] = self.voice_manager.transcriber.get_stats()
+        status['commands'] = self.voice_manager.command_registry.get_stats()
+        status['actions'] = self.voice_manager.action_executor.get_stats()
+        status['speaker'] = self.voice_manager.speaker_verifier.get_stats()
+        status['debug'] = self.debug_mode
+        status['operating_point'] = self.governor.get_operating_point()
+        return status
+
+    def get_stats_lines(self):
+        """Pipeline, recognition pool and display statistics as text lines"""
+        lines = self.pipeline.format_stats() + [self.recognition_executor.format_stats(),
+                                                self.voice_manager.vad_gate.format_stats(),
+                                                self.voice_manager.wake_word.format_stats(),
+                                                self.voice_manager.transcriber.format_stats(),
+                                                self.voice_manager.command_registry.format_stats(),
+                                                self.voice_manager.action_executor.format_stats(),
+                                                self.voice_manager.speaker_verifier.format_stats()]
+        if self.display is not None:
+            lines.append(self.display.format_stats())
+        if self.preview_server is not None:
+            lines.append(self.preview_server.format_stats())
+        if self.recorder is not None:
+            lines.append(self.recorder.format_stats())
+        return lines
+
+    def print_pipeline_stats(self):
+        """Print queue depths and stage throughput periodically in debug mode"""
+        now = time.monotonic()
+        if not self.debug_mode or now - self.last_stats_time < PIPELINE_CONFIG['stats_interval']:
+            return
+        self.last_stats_time = now
+        print("[PIPELINE] " + " | ".join(self.get_stats_lines()))
 
     def run(self):
         """Main application loop"""
         try:
             print("[INFO] Starting Face Recognition System...")
-            print("[CONTROLS] Press 'q' to quit, 'd' to toggle debug, 'r' to reset")
-
-            while True:
-                # Read frame from camera
-                ret, frame = self.camera_manager.read_frame()
-                if not ret:
-                    time.sleep(0.1)
-                    continue
-
-                # Process frame
-                self.process_frame(frame)
-
-                # Handle unknown person detection and verification
-                self.handle_unknown_person_detection()
-
-                # Update voice recognition state
-                self.update_voice_recognition()
-
-                # Render frame with UI
-                self.render_frame(frame)
+            self.pipeline.start()
+            if self.preview_server is not None:
+                self.preview_server.start()
+            if self.recorder is not None:
+                self.recorder.start()
+
+            if self.headless:
+                print("[CONTROLS] Send 'quit', 'debug', 'reset' or 'status' to the control port "
+                      "(or SIGTERM / SIGHUP / SIGUSR1)")
+                self.control_server.start()
+                install_signal_handlers(self.handle_command)
+                if self.display is not None:
+                    self.display.start()
+            else:
+                print("[CONTROLS] Press 'q' to quit, 'd' to toggle debug, 'r' to reset")
+                self.display.start()
 
-                # Handle keyboard input
-                key = self.ui_manager.wait_for_key()
-                if not self.handle_keyboard_input(key):
-                    break
+            # All stages and the display run in the background
+            while not self.stop_event.wait(1.0):
+                self.print_pipeline_stats()
 
         except KeyboardInterrupt:
             print("\n[INFO] Shutting down gracefully...")
@@ -239,11 +400,58 @@ class FaceRecognitionApp:
 
     def cleanup(self):
         """Clean up all resources"""
+        if self.control_server is not None:
+            self.control_server.stop()
+        if self.preview_server is not None:
+            self.preview_server.stop()
+        if self.display is not None:
+            # Closes the window on the display thread
+            self.display.stop()
+        if self.recorder is not None:
+            # Writes the queued frames and closes the current segment
+            self.recorder.stop()
+        self.pipeline.stop()
+        print("[PIPELINE] " + " | ".join(self.get_stats_lines()))
+        self.recognition_executor.shutdown()
+        self.voice_manager.stop()
+        get_scheduler().stop()
         self.camera_manager.release()
-        self.ui_manager.cleanup()
+        self.events.emit('shutdown')
+        self.events.close()
         print("[INFO] All resources released")
 
 
+def main():
+    """Parse command line options and start the application"""
+    parser = argparse.ArgumentParser(description="Face Recognition System")
+    parser.add_argument('--headless', action='store_true',
+                        help="run without any window or overlay drawing")
+    parser.add_argument('--control-port', type=int, default=None,
+                        help="loopback port for control commands in headless mode")
+    parser.add_argument('--events', default=None,
+                        help="append JSON line events to this file (headless default: stdout)")
+    parser.add_argument('--preview-port', type=int, default=None,
+                        help="serve an MJPEG preview and status JSON on this port (local network only)")
+    parser.add_argument('--record', action='store_true', default=None,
+                        help="record annotated video of access attempts to the recordings folder")
+    parser.add_argument('--speech-backend', choices=sorted(BACKENDS), default=None,
+                        help="speech-to-text engine (default: SPEECH_CONFIG['backend'])")
+    args = parser.parse_args()
+
+    headless = args.headless or SYSTEM_CONFIG['headless']
+    events = EventEmitter()
+    if args.events:
+        events = EventEmitter(open(args.events, 'a', encoding='utf-8'), owns_stream=True)
+    elif headless:
+        # Events own stdout; route the regular [INFO] logging to stderr
+        events = EventEmitter(sys.stdout)
+        sys.stdout = sys.stderr
+
+    app = FaceRecognitionApp(headless=headless, control_port=args.control_port, events=events,
+                             preview_port=args.preview_port, record=args.record,
+                             speech_backend=args.speech_backend)
+    app.run()
+
+
 if __name__ == "__main__":
-    app = FaceRecognitionApp()
-    app.run()
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -0,0 +1,184 @@
+# latency_governor.py
+"""
+Latency-budget governor: trades recognition resolution and frame rates for latency
+"""
+
+import threading
+import time
+from config import GAZE_CONFIG, GOVERNOR_CONFIG, RECOGNITION_CONFIG
+
+
+class LatencyGovernor:
+    """
+    Measures frame latency and recognition cost and moves the operating point
+    one bounded step at a time to hold the configured targets.
+
+    Frame latency (capture -> decision/display) is held with the display rate, the FaceMesh
+    input size and the FaceMesh rate.
+    Recognition cost is held with the recognition scale and upsampling.
+    """
+
+    def __init__(self, config=None):
+        self.config = config or GOVERNOR_CONFIG
+        self.enabled = self.config['enabled']
+        self.lock = threading.Lock()
+
+        # Operating point, starting from the static configuration
+        self.resize_factor = RECOGNITION_CONFIG['resize_factor']
+        self.upsample_times = RECOGNITION_CONFIG['upsample_times']
+        self.gaze_input_width = GAZE_CONFIG['input_size'][0]
+        self.gaze_interval = 1  # run FaceMesh on every Nth frame
+        self.display_interval = 1  # display refresh rate divided by N
+
+        # Smoothed measurements (seconds)
+        self.frame_latency = None
+        self.recognition_cost = None
+        self.last_frame_adjust = 0.0
+        self.last_recognition_adjust = 0.0
+
+    # === Measurements ===
+
+    def _smooth(self, current, sample):
+        if current is None:
+            return sample
+        alpha = self.config['smoothing']
+        return current + alpha * (sample - current)
+
+    def record_frame_latency(self, seconds):
+        """Record capture-to-output latency of one frame and adjust frame rates if needed"""
+        with self.lock:
+            self.frame_latency = self._smooth(self.frame_latency, seconds)
+            if self.enabled:
+                self._adjust_frame_rates()
+
+    def record_recognition_cost(self, seconds):
+        """Record the service time of one recognition pass and adjust its resolution if needed"""
+        with self.lock:
+            self.recognition_cost = self._smooth(self.recognition_cost, seconds)
+            if self.enabled:
+                self._adjust_recognition()
+
+    # === Control ===
+
+    def _pressure(self, measured, target_ms):
+        """+1 over budget, -1 comfortably under budget, 0 inside the hysteresis band"""
+        target = target_ms / 1000.0
+        hysteresis = self.config['hysteresis']
+        if measured > target * (1 + hysteresis):
+            return 1
+        if measured < target * (1 - hysteresis):
+            return -1
+        return 0
+
+    def _adjust_frame_rates(self):
+        now = time.monotonic()
+        if now - self.last_frame_adjust < self.config['adjust_interval']:
+            return
+
+        min_width, max_width = self.config['gaze_input_width_range']
+        step = self.config['gaze_input_step']
+
+        pressure = self._pressure(self.frame_latency, self.config['target_latency_ms'])
+        if pressure > 0:
+            # Shed display work first, then FaceMesh resolution, then FaceMesh frames
+            if self.display_interval < self.config['max_display_interval']:
+                self.display_interval += 1
+            elif self.gaze_input_width - step >= min_width:
+                self.gaze_input_width -= step
+            elif self.gaze_interval < self.config['max_gaze_interval']:
+                self.gaze_interval += 1
+            else:
+                return
+        elif pressure < 0:
+            # Restore in reverse order
+            if self.gaze_interval > 1:
+                self.gaze_interval -= 1
+            elif self.gaze_input_width + step <= max_width:
+                self.gaze_input_width += step
+            elif self.display_interval > 1:
+                self.display_interval -= 1
+            else:
+                return
+        else:
+            return
+
+        self.last_frame_adjust = now
+        print(f"[GOVERNOR] Frame latency {self.frame_latency * 1000:.0f}ms -> "
+              f"gaze {self.gaze_input_width}px every {self.gaze_interval} frames, "
+              f"display at 1/{self.display_interval} rate")
+
+    def _adjust_recognition(self):
+        now = time.monotonic()
+        if now - self.last_recognition_adjust < self.config['adjust_interval']:
+            return
+
+        min_scale, max_scale = self.config['resize_factor_range']
+        min_upsample, max_upsample = self.config['upsample_range']
+        step = self.config['resize_step']
+
+        pressure = self._pressure(self.recognition_cost, self.config['recognition_budget_ms'])
+        if pressure > 0:
+            # Upsampling is the most expensive knob, drop it first
+            if self.upsample_times > min_upsample:
+                self.upsample_times -= 1
+            elif self.resize_factor - step >= min_scale:
+                self.resize_factor = round(self.resize_factor - step, 3)
+            else:
+                return
+        elif pressure < 0:
+            if self.resize_factor + step <= max_scale:
+                self.resize_factor = round(self.resize_factor + step, 3)
+            elif self.upsample_times < max_upsample:
+                self.upsample_times += 1
+            else:
+                return
+        else:
+            return
+
+        self.last_recognition_adjust = now
+        print(f"[GOVERNOR] Recognition {self.recognition_cost * 1000:.0f}ms -> "
+              f"scale {self.resize_factor:.3f}, upsample {self.upsample_times}")
+
+    # === Operating point ===
+
+    def get_recognition_options(self):
+        """Current recognition scale and upsampling"""
+        with self.lock:
+            return {'resize_factor': self.resize_factor, 'upsample_times': self.upsample_times}
+
+    def get_gaze_input_size(self):
+        """Current FaceMesh input size (width, height), same aspect ratio as GAZE_CONFIG['input_size']"""
+        with self.lock:
+            width = self.gaze_input_width
+        base_width, base_height = GAZE_CONFIG['input_size']
+        return width, round(width * base_height / base_width)
+
+    def should_process_gaze(self, frame_id):
+        """Check if FaceMesh should run on this frame"""
+        return frame_id % self.gaze_interval == 0
+
+    def get_operating_point(self):
+        """Current operating point and smoothed measurements"""
+        with self.lock:
+            return {
+                'enabled': self.enabled,
+                'resize_factor': self.resize_factor,
+                'upsample_times': self.upsample_times,
+                'gaze_input_width': self.gaze_input_width,
+                'gaze_interval': self.gaze_interval,
+                'display_interval': self.display_interval,
+                'frame_latency_ms': (self.frame_latency or 0.0) * 1000,
+                'recognition_ms': (self.recognition_cost or 0.0) * 1000
+            }
+
+    def format_lines(self):
+        """Operating point as short text lines for the debug overlay"""
+        point = self.get_operating_point()
+        state = "ON" if point['enabled'] else "OFF"
+        return [
+            f"governor {state}: latency {point['frame_latency_ms']:.0f}/"
+            f"{self.config['target_latency_ms']}ms recog {point['recognition_ms']:.0f}/"
+            f"{self.config['recognition_budget_ms']}ms",
+            f"scale {point['resize_factor']:.3f} upsample {point['upsample_times']} "
+            f"gaze {point['gaze_input_width']}px 1/{point['gaze_interval']} display 1/{point['display_interval']}"
+        ]
@@ -0,0 +1,390 @@
+# multi_stream.py
+"""
+Multi-camera runner: N capture sources in one process sharing one gallery and one recognition pool
+"""
+
+# === Suppress warnings and logs from TensorFlow and MediaPipe ===
+import os
+import logging
+
+os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
+logging.getLogger('mediapipe').setLevel(logging.ERROR)
+
+# === Imports ===
+import cv2
+import sys
+import json
+import time
+import argparse
+import threading
+from config import SYSTEM_CONFIG, MULTI_STREAM_CONFIG
+from camera_manager import CameraManager
+from face_recognition_module import FaceRecognitionManager
+from recognition_executor import RecognitionExecutor
+from gaze_detection import GazeDetector
+from stream_session import StreamSession
+from detections import FrameResult
+from pipeline import PipelineStage, LatestQueue, StageStats
+from control_server import ControlServer, install_signal_handlers
+from event_log import EventEmitter
+from timer_scheduler import get_scheduler
+
+# Set OpenCV threads
+cv2.setNumThreads(SYSTEM_CONFIG['cv2_threads'])
+
+
+class CameraStream:
+    """One capture source with its own gaze graph, decision state and throughput counters"""
+
+    def __init__(self, stream_id, source, events):
+        self.stream_id = stream_id
+        self.source = source
+        self.camera_manager = CameraManager(source)
+        # FaceMesh tracks landmarks from frame to frame, so each stream keeps its own graph
+        self.gaze_detector = GazeDetector()
+
+        self.gaze_queue = LatestQueue(f'gaze-{stream_id}', 1)
+        self.recognition_queue = LatestQueue(f'recognition-{stream_id}', 1)
+        self.result_queue = LatestQueue(f'result-{stream_id}', 1)
+        self.session = StreamSession(stream_id, events, self.request_recognition)
+
+        self.capture_stage = PipelineStage(f'capture-{stream_id}', self.capture)
+        self.gaze_stats = StageStats()
+        self.recognition_stats = StageStats()
+        self.frame_count = 0
+
+        # Set by the runner to wake up its schedulers
+        self.on_frame = None
+        self.on_recognition_request = None
+
+    def capture(self):
+        """Capture stage: read the newest frame for the gaze workers"""
+        ret, frame = self.camera_manager.read_frame()
+        if not ret:
+            time.sleep(0.1)
+            return False
+
+        self.frame_count += 1
+        self.gaze_queue.put({
+            'frame_id': self.frame_count,
+            'frame': frame,
+            'timestamp': time.monotonic()
+        })
+        if self.on_frame:
+            self.on_frame()
+
+    def request_recognition(self, packet):
+        """Called by the session when this stream needs a recognition pass"""
+        self.recognition_queue.put(packet)
+        if self.on_recognition_request:
+            self.on_recognition_request()
+
+    def get_stats(self):
+        """Throughput of each stage of this stream"""
+        capture = self.capture_stage.stats.get_stats()
+        gaze = self.gaze_stats.get_stats()
+        recognition = self.recognition_stats.get_stats()
+        return {
+            'stream': self.stream_id,
+            'source': str(self.source),
+            'capture_fps': round(capture['fps'], 1),
+            'gaze_fps': round(gaze['fps'], 1),
+            'gaze_ms': round(gaze['avg_ms'], 1),
+            'recognitions': recognition['processed'],
+            'recognition_ms': round(recognition['avg_ms'], 1),
+            'frames_dropped': self.gaze_queue.get_stats()['dropped']
+        }
+
+    def format_stats(self):
+        """One console line with this stream's throughput"""
+        stats = self.get_stats()
+        return (f"stream {stats['stream']} ({stats['source']}): capture {stats['capture_fps']:.1f}/s "
+                f"gaze {stats['gaze_fps']:.1f}/s {stats['gaze_ms']:.0f}ms "
+                f"recognition {stats['recognitions']} x {stats['recognition_ms']:.0f}ms "
+                f"dropped {stats['frames_dropped']}")
+
+
+class FairScheduler:
+    """
+    Round-robin selection of streams that have pending work.
+    A stream handed out by acquire() is skipped until release(), so its gaze graph
+    and decision state are only used by one worker at a time.
+    """
+
+    def __init__(self, streams, has_work):
+        self.streams = streams
+        self.has_work = has_work
+        self.cursor = 0
+        self.leased = set()
+        self.condition = threading.Condition()
+
+    def notify(self):
+        """Wake up workers waiting for work"""
+        with self.condition:
+            self.condition.notify_all()
+
+    def acquire(self, timeout=0.1):
+        """
+        Lease the next stream with pending work
+        Returns None if no stream had work within the timeout
+        """
+        with self.condition:
+            stream = self._next_stream()
+            if stream is None:
+                self.condition.wait(timeout)
+                stream = self._next_stream()
+            if stream is not None:
+                self.leased.add(stream.stream_id)
+            return stream
+
+    def release(self, stream):
+        """Return a leased stream to the rotation"""
+        with self.condition:
+            self.leased.discard(stream.stream_id)
+            self.condition.notify_all()
+
+    def _next_stream(self):
+        count = len(self.streams)
+        for offset in range(count):
+            stream = self.streams[(self.cursor + offset) % count]
+            if stream.stream_id not in self.leased and self.has_work(stream):
+                # Start after this stream next time so every stream gets its turn
+                self.cursor = (self.cursor + offset + 1) % count
+                return stream
+        return None
+
+
+class MultiStreamRunner:
+    def __init__(self, sources, control_port=None, events=None):
+        print(f"[INFO] Initializing multi-camera system with {len(sources)} streams...")
+        self.events = events or EventEmitter()
+
+        # Loaded once and shared by every stream
+        self.face_recognition_manager = FaceRecognitionManager()
+        self.recognition_executor = RecognitionExecutor(self.face_recognition_manager)
+
+        self.streams = [CameraStream(stream_id, source, self.events)
+                        for stream_id, source in enumerate(sources)]
+
+        self.gaze_scheduler = FairScheduler(self.streams, lambda stream: stream.gaze_queue.qsize() > 0)
+        self.recognition_scheduler = FairScheduler(
+            self.streams, lambda stream: stream.recognition_queue.qsize() > 0)
+        for stream in self.streams:
+            stream.on_frame = self.gaze_scheduler.notify
+            stream.on_recognition_request = self.recognition_scheduler.notify
+
+        # Never queue more recognition work than the pool can run at once
+        self.recognition_slots = threading.BoundedSemaphore(max(1, self.recognition_executor.workers))
+
+        self.control_server = ControlServer(self.handle_command, port=control_port)
+        self.stop_event = threading.Event()
+        self.worker_threads = []
+        self.debug_mode = False
+        self.last_stats_time = time.monotonic()
+
+        print("[INFO] Multi-camera system initialized successfully!")
+
+    # === Workers ===
+
+    def gaze_worker(self):
+        """Run FaceMesh and the decision logic for whichever stream is next in line"""
+        while not self.stop_event.is_set():
+            stream = self.gaze_scheduler.acquire()
+            if stream is None:
+                continue
+            try:
+                packet = stream.gaze_queue.get_nowait()
+                if packet is not None:
+                    self.process_gaze(stream, packet)
+            except Exception as e:
+                print(f"[ERROR] Stream {stream.stream_id} gaze processing failed: {e}")
+            finally:
+                self.gaze_scheduler.release(stream)
+
+    def process_gaze(self, stream, packet):
+        """Gaze detection followed by the stream's decision step"""
+        start = time.monotonic()
+        gaze_detected, has_landmarks = stream.gaze_detector.detect_gaze_and_face_view(packet['frame'])
+        stream.gaze_stats.record(time.monotonic() - start)
+
+        packet = dict(packet, gaze_detected=gaze_detected, has_landmarks=has_landmarks)
+        session = stream.session
+        with session.lock:
+            result = stream.result_queue.get_nowait()
+            if result is not None:
+                session.apply_recognition_result(result)
+
+            session.apply_gaze_result(packet)
+            session.handle_unknown_person_detection()
+
+    def recognition_dispatcher(self):
+        """Hand recognition requests to the shared pool, one stream at a time in turn"""
+        while not self.stop_event.is_set():
+            if not self.recognition_slots.acquire(timeout=0.1):
+                continue
+
+            stream = self.recognition_scheduler.acquire()
+            packet = None
+            if stream is not None:
+                packet = stream.recognition_queue.get_nowait()
+                self.recognition_scheduler.release(stream)
+            if packet is None:
+                self.recognition_slots.release()
+                continue
+
+            start = time.monotonic()
+            try:
+                future = self.recognition_executor.submit(packet['frame'])
+            except Exception as e:
+                print(f"[ERROR] Stream {stream.stream_id} recognition submit failed: {e}")
+                self.recognition_slots.release()
+                continue
+            future.add_done_callback(
+                lambda f, stream=stream, packet=packet, start=start:
+                self.on_recognition_done(stream, packet, start, f))
+
+    def on_recognition_done(self, stream, packet, start, future):
+        """Forward pool results to the stream's next decision step"""
+        self.recognition_slots.release()
+        try:
+            detections = future.result()
+        except Exception as e:
+            print(f"[ERROR] Stream {stream.stream_id} face recognition failed: {e}")
+            detections = []
+
+        stream.recognition_stats.record(time.monotonic() - start)
+        stream.result_queue.put(FrameResult(packet['frame_id'], packet['session_id'], detections))
+
+    # === Control ===
+
+    def handle_command(self, command):
+        """
+        Apply a control command: quit, debug, status, reset (all streams) or 'reset <stream>'
+        Returns a short reply string
+        """
+        parts = command.split()
+        if not parts:
+            return "empty command"
+
+        if parts[0] == 'quit':
+            self.stop_event.set()
+        elif parts[0] == 'debug':
+            self.debug_mode = not self.debug_mode
+            for stream in self.streams:
+                stream.session.debug_mode = self.debug_mode
+            print(f"[INFO] Debug mode: {'ON' if self.debug_mode else 'OFF'}")
+            return f"debug {'on' if self.debug_mode else 'off'}"
+        elif parts[0] == 'reset':
+            targets = self.streams
+            if len(parts) > 1:
+                targets = [stream for stream in self.streams if str(stream.stream_id) == parts[1]]
+                if not targets:
+                    return f"unknown stream: {parts[1]}"
+            for stream in targets:
+                stream.session.reset_state(reason="manual")
+        elif parts[0] == 'status':
+            return json.dumps([stream.session.get_status() for stream in self.streams], default=str)
+        elif parts[0] == 'stats':
+            return json.dumps([stream.get_stats() for stream in self.streams])
+        else:
+            return f"unknown command: {command}"
+
+        return "ok"
+
+    def report_stats(self):
+        """Print and emit per-stream throughput every stats_interval seconds"""
+        now = time.monotonic()
+        if now - self.last_stats_time < MULTI_STREAM_CONFIG['stats_interval']:
+            return
+        self.last_stats_time = now
+
+        for stream in self.streams:
+            print("[STREAMS] " + stream.format_stats())
+        print("[STREAMS] " + self.recognition_executor.format_stats())
+        self.events.emit('stats', streams=[stream.get_stats() for stream in self.streams],
+                         pool=self.recognition_executor.get_stats())
+
+    # === Lifecycle ===
+
+    def run(self):
+        """Start all streams and workers, then serve control commands until quit"""
+        try:
+            print("[INFO] Starting multi-camera system...")
+            for stream in self.streams:
+                stream.capture_stage.start()
+
+            for index in range(MULTI_STREAM_CONFIG['gaze_workers']):
+                self.worker_threads.append(
+                    threading.Thread(target=self.gaze_worker, name=f"gaze-worker-{index}", daemon=True))
+            self.worker_threads.append(
+                threading.Thread(target=self.recognition_dispatcher, name="recognition-dispatcher", daemon=True))
+            for thread in self.worker_threads:
+                thread.start()
+
+            print("[CONTROLS] Send 'quit', 'debug', 'reset [stream]', 'status' or 'stats' to the control port")
+            self.control_server.start()
+            install_signal_handlers(self.handle_command)
+
+            while not self.stop_event.wait(1.0):
+                self.report_stats()
+
+        except KeyboardInterrupt:
+            print("\n[INFO] Shutting down gracefully...")
+        except Exception as e:
+            print(f"[ERROR] {str(e)}")
+        finally:
+            self.cleanup()
+
+    def cleanup(self):
+        """Clean up all resources"""
+        self.stop_event.set()
+        self.control_server.stop()
+        for stream in self.streams:
+            stream.capture_stage.stop()
+        for stream in self.streams:
+            stream.capture_stage.join(2.0)
+        for thread in self.worker_threads:
+            thread.join(2.0)
+
+        for stream in self.streams:
+            print("[STREAMS] " + stream.format_stats())
+        self.recognition_executor.shutdown()
+        get_scheduler().stop()
+        for stream in self.streams:
+            stream.camera_manager.release()
+
+        self.events.emit('shutdown')
+        self.events.close()
+        print("[INFO] All resources released")
+
+
+def parse_source(value):
+    """Device indexes are given as numbers, anything else is a URL or file path"""
+    return int(value) if value.isdigit() else value
+
+
+def main():
+    """Parse command line options and start the multi-camera runner"""
+    parser = argparse.ArgumentParser(description="Multi-camera Face Recognition System")
+    parser.add_argument('--sources', nargs='+', type=parse_source, default=None,
+                        help="camera indexes or stream URLs (default: MULTI_STREAM_CONFIG['sources'])")
+    parser.add_argument('--control-port', type=int, default=None,
+                        help="loopback port for control commands")
+    parser.add_argument('--events', default=None,
+                        help="append JSON line events to this file (default: stdout)")
+    args = parser.parse_args()
+
+    if args.events:
+        events = EventEmitter(open(args.events, 'a', encoding='utf-8'), owns_stream=True)
+    else:
+        # Events own stdout; route the regular [INFO] logging to stderr
+        events = EventEmitter(sys.stdout)
+        sys.stdout = sys.stderr
+
+    sources = args.sources or MULTI_STREAM_CONFIG['sources']
+    runner = MultiStreamRunner(sources, control_port=args.control_port, events=events)
+    runner.run()
+
+
+if __name__ == "__main__":
+    main()
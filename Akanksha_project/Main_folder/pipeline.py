@@ -0,0 +1,237 @@
+# pipeline.py
+"""
+Staged processing pipeline: bounded latest-wins queues connecting worker threads
+"""
+
+import threading
+import time
+from collections import deque
+
+
+class LatestQueue:
+    """
+    Bounded queue where the newest item always wins.
+    When the queue is full the oldest item is dropped instead of blocking the producer.
+    """
+
+    def __init__(self, name, maxsize=1):
+        self.name = name
+        self.maxsize = max(1, maxsize)
+        self._items = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        self.put_count = 0
+        self.dropped_count = 0
+
+    def put(self, item):
+        """Add an item, dropping the oldest one if the queue is full"""
+        with self._condition:
+            if self._closed:
+                return
+            if len(self._items) >= self.maxsize:
+                self._items.popleft()
+                self.dropped_count += 1
+            self._items.append(item)
+            self.put_count += 1
+            self._condition.notify()
+
+    def get(self, timeout=None):
+        """
+        Take the oldest queued item
+        Returns None on timeout or when the queue is closed
+        """
+        with self._condition:
+            if not self._items and not self._closed:
+                self._condition.wait(timeout)
+            if self._items:
+                return self._items.popleft()
+            return None
+
+    def get_nowait(self):
+        """Take an item without waiting, None if empty"""
+        with self._condition:
+            if self._items:
+                return self._items.popleft()
+            return None
+
+    def clear(self):
+        """Discard all queued items"""
+        with self._condition:
+            self._items.clear()
+
+    def close(self):
+        """Wake up all waiting consumers and reject further items"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def qsize(self):
+        """Current queue depth"""
+        with self._condition:
+            return len(self._items)
+
+    def get_stats(self):
+        """Get queue depth and drop counters"""
+        with self._condition:
+            return {
+                'depth': len(self._items),
+                'maxsize': self.maxsize,
+                'put': self.put_count,
+                'dropped': self.dropped_count
+            }
+
+
+class StageStats:
+    """Throughput and service time bookkeeping for a single stage"""
+
+    def __init__(self, window_seconds=2.0):
+        self.window_seconds = window_seconds
+        self.processed = 0
+        self.total_service_time = 0.0
+        self.last_service_time = 0.0
+        self._timestamps = deque()
+        self._lock = threading.Lock()
+
+    def record(self, service_time):
+        """Record one processed item and how long it took"""
+        now = time.monotonic()
+        with self._lock:
+            self.processed += 1
+            self.total_service_time += service_time
+            self.last_service_time = service_time
+            self._timestamps.append(now)
+            self._trim(now)
+
+    def _trim(self, now):
+        while self._timestamps and now - self._timestamps[0] > self.window_seconds:
+            self._timestamps.popleft()
+
+    def get_rate(self):
+        """Items per second over the sliding window"""
+        now = time.monotonic()
+        with self._lock:
+            self._trim(now)
+            return len(self._timestamps) / self.window_seconds
+
+    def get_stats(self):
+        """Get processed count, rate and service times (ms)"""
+        rate = self.get_rate()
+        with self._lock:
+            average = self.total_service_time / self.processed if self.processed else 0.0
+            return {
+                'processed': self.processed,
+                'fps': rate,
+                'avg_ms': average * 1000,
+                'last_ms': self.last_service_time * 1000
+            }
+
+
+class PipelineStage:
+    """
+    Worker thread for one pipeline stage.
+    With an input queue the handler is called once per item; without one the handler
+    acts as a source and is called in a loop (it should block, e.g. on camera read).
+    """
+
+    def __init__(self, name, handler, input_queue=None, poll_timeout=0.1):
+        self.name = name
+        self.handler = handler
+        self.input_queue = input_queue
+        self.poll_timeout = poll_timeout
+        self.stats = StageStats()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the stage worker thread"""
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self.run, name=f"stage-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Ask the worker to stop after the current item"""
+        self._stop_event.set()
+
+    def join(self, timeout=None):
+        """Wait for the worker thread to finish"""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def is_running(self):
+        """Check if the worker thread is alive"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def is_stopped(self):
+        """Check if the stage was asked to stop"""
+        return self._stop_event.is_set()
+
+    def run(self):
+        """Stage loop, runs until stop() is called"""
+        while not self._stop_event.is_set():
+            if self.input_queue is not None:
+                item = self.input_queue.get(timeout=self.poll_timeout)
+                if item is None:
+                    continue
+            else:
+                item = None
+
+            start = time.monotonic()
+            try:
+                handled = self.handler(item) if self.input_queue is not None else self.handler()
+            except Exception as e:
+                print(f"[ERROR] Stage '{self.name}' failed: {e}")
+                time.sleep(self.poll_timeout)
+                continue
+
+            # Sources return False when they had nothing to produce
+            if handled is not False:
+                self.stats.record(time.monotonic() - start)
+
+
+class Pipeline:
+    """Collection of stages and the queues that connect them"""
+
+    def __init__(self):
+        self.stages = []
+        self.queues = []
+
+    def add_queue(self, queue):
+        """Register a queue so its depth is reported and it is closed on stop"""
+        self.queues.append(queue)
+        return queue
+
+    def add_stage(self, stage):
+        """Register a stage so it is started, stopped and reported"""
+        self.stages.append(stage)
+        return stage
+
+    def start(self):
+        """Start all stage workers"""
+        for stage in self.stages:
+            stage.start()
+
+    def stop(self, timeout=2.0):
+        """Stop all stages, wake up blocked consumers and wait for workers"""
+        for stage in self.stages:
+            stage.stop()
+        for queue in self.queues:
+            queue.close()
+        for stage in self.stages:
+            stage.join(timeout)
+
+    def get_stats(self):
+        """Get per-stage throughput and per-queue depth"""
+        return {
+            'stages': {stage.name: stage.stats.get_stats() for stage in self.stages},
+            'queues': {queue.name: queue.get_stats() for queue in self.queues}
+        }
+
+    def format_stats(self):
+        """Format pipeline statistics as short text lines (for overlay or console)"""
+        stats = self.get_stats()
+        lines = []
+        for name, stage in stats['stages'].items():
+            lines.append(f"{name}: {stage['fps']:.1f}/s {stage['avg_ms']:.0f}ms")
+        for name, queue in stats['queues'].items():
+            lines.append(f"q-{name}: {queue['depth']}/{queue['maxsize']} drop {queue['dropped']}")
+        return lines
@@ -0,0 +1,201 @@
+# preview_server.py
+"""
+Local-network HTTP preview: annotated frames as MJPEG and the current status as JSON
+"""
+
+import ipaddress
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import cv2
+from config import PREVIEW_CONFIG
+from pipeline import LatestQueue
+
+BOUNDARY = "frame"
+
+INDEX_PAGE = b"""<html><head><title>Face Recognition Preview</title></head>
+<body style="margin:0;background:#000">
+<img src="/stream.mjpg" style="max-width:100%">
+</body></html>
+"""
+
+
+def is_local_address(host):
+    """Check if an address is loopback, link-local or in a private range"""
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return host == 'localhost'
+    if address.version == 6 and address.ipv4_mapped:
+        address = address.ipv4_mapped
+    return address.is_loopback or address.is_private or address.is_link_local
+
+
+class _PreviewRequestHandler(BaseHTTPRequestHandler):
+    """Serves the viewer page, the MJPEG stream and the status JSON"""
+
+    def do_GET(self):
+        # Route on the path alone, so query strings such as cache busters are ignored
+        path = urlsplit(self.path).path
+        if path == '/':
+            self.send_bytes(INDEX_PAGE, 'text/html')
+        elif path == '/status':
+            status = self.server.preview.status_provider()
+            self.send_bytes(json.dumps(status, default=str).encode('utf-8'), 'application/json')
+        elif path == '/stream.mjpg':
+            self.stream()
+        else:
+            self.send_error(404)
+
+    def send_bytes(self, body, content_type):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def stream(self):
+        preview = self.server.preview
+        client_queue = preview.add_client()
+        try:
+            self.send_response(200)
+            self.send_header('Content-Type', f'multipart/x-mixed-replace; boundary={BOUNDARY}')
+            self.send_header('Cache-Control', 'no-store')
+            self.end_headers()
+            while preview.is_running():
+                jpeg = client_queue.get(timeout=1.0)
+                if jpeg is None:
+                    continue
+                self.wfile.write(f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+                                 f"Content-Length: {len(jpeg)}\r\n\r\n".encode('ascii'))
+                self.wfile.write(jpeg)
+                self.wfile.write(b"\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            preview.remove_client(client_queue)
+
+    def log_message(self, format, *args):
+        # Per-request logging would flood the console while streaming
+        pass
+
+
+class _PreviewHTTPServer(ThreadingHTTPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def verify_request(self, request, client_address):
+        # Only viewers on the local network
+        return is_local_address(client_address[0])
+
+
+class PreviewServer:
+    """
+    Optional MJPEG preview for headless units. submit() never blocks the caller: an encoder thread
+    renders and JPEG-encodes the newest frame at most `fps` times per second, only while viewers are
+    connected, and shares the bytes with every client. Each client has a small queue that drops
+    old frames when it cannot keep up.
+    """
+
+    def __init__(self, render, status_provider, host=None, port=None, fps=None):
+        self.host = host or PREVIEW_CONFIG['host']
+        self.port = port if port is not None else PREVIEW_CONFIG['port']
+        if not is_local_address(self.host) and self.host != '0.0.0.0':
+            raise ValueError(f"[ERROR] Preview server must bind to a local network address, got {self.host}")
+
+        self.render = render  # render(packet) -> annotated BGR frame
+        self.status_provider = status_provider
+        self.fps = fps or PREVIEW_CONFIG['fps']
+        self.encode_params = [cv2.IMWRITE_JPEG_QUALITY, PREVIEW_CONFIG['jpeg_quality']]
+
+        self.latest = None
+        self.latest_lock = threading.Lock()
+        self.clients = []
+        self.clients_lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.server = None
+        self.server_thread = None
+        self.encoder_thread = None
+        self.encoded = 0
+
+    def submit(self, packet):
+        """Offer the newest frame packet (latest wins)"""
+        with self.latest_lock:
+            self.latest = packet
+
+    def add_client(self):
+        """Register a viewer and return its frame queue"""
+        client_queue = LatestQueue('preview-client', PREVIEW_CONFIG['client_queue'])
+        with self.clients_lock:
+            self.clients.append(client_queue)
+        print(f"[INFO] Preview viewer connected ({len(self.clients)} total)")
+        return client_queue
+
+    def remove_client(self, client_queue):
+        """Unregister a viewer"""
+        with self.clients_lock:
+            if client_queue in self.clients:
+                self.clients.remove(client_queue)
+        print(f"[INFO] Preview viewer disconnected ({len(self.clients)} total)")
+
+    def is_running(self):
+        """Check if the server is still serving"""
+        return not self.stop_event.is_set()
+
+    def start(self):
+        """Start the HTTP server and the encoder thread"""
+        self.server = _PreviewHTTPServer((self.host, self.port), _PreviewRequestHandler)
+        self.server.preview = self
+        self.server_thread = threading.Thread(target=self.server.serve_forever, name="preview-server", daemon=True)
+        self.server_thread.start()
+        self.encoder_thread = threading.Thread(target=self._encode_loop, name="preview-encoder", daemon=True)
+        self.encoder_thread.start()
+        print(f"[INFO] Preview server on http://{self.host}:{self.port}/ (local network only)")
+
+    def stop(self):
+        """Stop serving and close the socket"""
+        self.stop_event.set()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        if self.encoder_thread is not None:
+            self.encoder_thread.join()
+            self.encoder_thread = None
+
+    def _encode_loop(self):
+        interval = 1.0 / self.fps
+        while not self.stop_event.wait(interval):
+            with self.clients_lock:
+                clients = list(self.clients)
+            if not clients:
+                continue  # No viewers: no rendering or encoding at all
+
+            with self.latest_lock:
+                packet, self.latest = self.latest, None
+            if packet is None:
+                continue
+
+            try:
+                frame = self.render(packet)
+                ok, buffer = cv2.imencode('.jpg', frame, self.encode_params)
+            except Exception as e:
+                print(f"[ERROR] Preview encoding failed: {e}")
+                continue
+            if not ok:
+                continue
+
+            # One encoded frame shared by all viewers; slow viewers lose their oldest frame
+            jpeg = buffer.tobytes()
+            for client_queue in clients:
+                client_queue.put(jpeg)
+            self.encoded += 1
+
+    def format_stats(self):
+        """Short text line for overlay or console"""
+        with self.clients_lock:
+            viewers = len(self.clients)
+        return f"preview: {viewers} viewers, {self.encoded} frames encoded"
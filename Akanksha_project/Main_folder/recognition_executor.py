@@ -0,0 +1,197 @@
+# recognition_executor.py
+"""
+Process-pool face recognition with dlib models and the known gallery preloaded in every worker
+"""
+
+import os
+import threading
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+from config import RECOGNITION_CONFIG
+
+# Per-process state, filled in by _init_worker
+_worker_state = {}
+
+
+def _init_worker(known_face_encodings, known_face_names):
+    """Runs once in every worker: load dlib models and keep the gallery in memory"""
+    import cv2
+    import face_recognition_module  # importing face_recognition loads the dlib models
+
+    cv2.setNumThreads(1)
+    _worker_state['encodings'] = known_face_encodings
+    _worker_state['names'] = known_face_names
+    _worker_state['segments'] = {}
+    _worker_state['recognize'] = face_recognition_module.recognize_frame
+
+
+def _attach_segment(slot_name):
+    """Attach to a shared memory slot once and keep the mapping for later requests"""
+    segment = _worker_state['segments'].get(slot_name)
+    if segment is None:
+        segment = shared_memory.SharedMemory(name=slot_name)
+        if os.name == "posix":
+            # The parent owns the segment; stop this process's tracker from unlinking it
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(segment._name, "shared_memory")
+        _worker_state['segments'][slot_name] = segment
+    return segment
+
+
+def _recognize_in_worker(slot_name, shape, dtype, frame, boxes, options):
+    """Worker entry point: read the frame from shared memory (or the pickled copy) and recognize"""
+    if frame is None:
+        segment = _attach_segment(slot_name)
+        frame = np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+    return _worker_state['recognize'](frame, _worker_state['encodings'], _worker_state['names'], boxes,
+                                      **options)
+
+
+class SharedFrameSlots:
+    """Fixed set of shared memory buffers used to hand frames to worker processes without pickling"""
+
+    def __init__(self, slot_count):
+        self.slot_count = slot_count
+        self.slot_size = 0
+        self.segments = []
+        self.free_slots = []
+        self.lock = threading.Lock()
+
+    def _allocate(self, nbytes):
+        self.slot_size = nbytes
+        for _ in range(self.slot_count):
+            segment = shared_memory.SharedMemory(create=True, size=nbytes)
+            self.segments.append(segment)
+            self.free_slots.append(segment)
+
+    def acquire(self, frame):
+        """
+        Copy the frame into a free slot
+        Returns the slot, or None if no slot is free or the frame does not fit
+        """
+        with self.lock:
+            if not self.segments:
+                self._allocate(frame.nbytes)
+            if frame.nbytes > self.slot_size or not self.free_slots:
+                return None
+            segment = self.free_slots.pop()
+
+        view = np.ndarray(frame.shape, dtype=frame.dtype, buffer=segment.buf)
+        np.copyto(view, frame)
+        return segment
+
+    def release(self, segment):
+        """Return a slot to the free list"""
+        with self.lock:
+            self.free_slots.append(segment)
+
+    def close(self):
+        """Free all shared memory"""
+        with self.lock:
+            for segment in self.segments:
+                segment.close()
+                segment.unlink()
+            self.segments.clear()
+            self.free_slots.clear()
+
+
+class RecognitionExecutor:
+    """
+    Runs face recognition on a pool of worker processes so it is not limited by the GIL.
+    With workers=0 recognition runs on a single background thread in this process.
+    """
+
+    def __init__(self, face_recognition_manager, workers=None):
+        if workers is None:
+            workers = RECOGNITION_CONFIG['worker_processes']
+        self.face_recognition_manager = face_recognition_manager
+        self.workers = workers
+
+        self.submitted = 0
+        self.completed = 0
+        self.in_flight = 0
+        self.total_service_time = 0.0
+        self.stats_lock = threading.Lock()
+
+        if workers > 0:
+            # spawn: forking a process that already runs camera and MediaPipe threads is unsafe
+            self.slots = SharedFrameSlots(workers * 2)
+            self.pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(face_recognition_manager.known_face_encodings,
+                          face_recognition_manager.known_face_names)
+            )
+            print(f"[INFO] Recognition pool started with {workers} worker processes")
+        else:
+            self.slots = None
+            self.pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="recognition")
+
+    def submit(self, frame, boxes=None, options=None):
+        """
+        Queue a frame for recognition
+        options may override 'resize_factor' and 'upsample_times'
+        Returns a Future resolving to the list of detection dictionaries
+        """
+        start = time.monotonic()
+        segment = None
+        options = options or {}
+
+        if self.slots is None:
+            future = self.pool.submit(self.face_recognition_manager.recognize_faces, frame, boxes, **options)
+        else:
+            segment = self.slots.acquire(frame)
+            if segment is not None:
+                future = self.pool.submit(_recognize_in_worker, segment.name,
+                                          frame.shape, frame.dtype.str, None, boxes, options)
+            else:
+                # No free slot: fall back to pickling the frame
+                future = self.pool.submit(_recognize_in_worker, None, None, None, frame, boxes, options)
+
+        with self.stats_lock:
+            self.submitted += 1
+            self.in_flight += 1
+
+        future.add_done_callback(lambda f: self._on_done(segment, start))
+        return future
+
+    def _on_done(self, segment, start):
+        if segment is not None:
+            self.slots.release(segment)
+        with self.stats_lock:
+            self.completed += 1
+            self.in_flight -= 1
+            self.total_service_time += time.monotonic() - start
+
+    def recognize_faces(self, frame, boxes=None, options=None):
+        """Blocking recognition of a single frame"""
+        return self.submit(frame, boxes, options).result()
+
+    def get_stats(self):
+        """Get submitted/completed counts, in-flight requests and average service time (ms)"""
+        with self.stats_lock:
+            average = self.total_service_time / self.completed if self.completed else 0.0
+            return {
+                'workers': self.workers,
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'in_flight': self.in_flight,
+                'avg_ms': average * 1000
+            }
+
+    def format_stats(self):
+        """Short text line for overlay or console"""
+        stats = self.get_stats()
+        return (f"pool x{stats['workers']}: {stats['completed']} done "
+                f"{stats['in_flight']} busy {stats['avg_ms']:.0f}ms")
+
+    def shutdown(self):
+        """Stop the workers and free shared memory"""
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        if self.slots is not None:
+            self.slots.close()
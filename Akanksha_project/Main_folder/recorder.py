@@ -0,0 +1,201 @@
+# recorder.py
+"""
+Annotated session recorder: verification events start and stop recording, a background thread encodes
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+import cv2
+from config import RECORDER_CONFIG
+from pipeline import LatestQueue
+from timer_scheduler import get_scheduler
+
+# Verification statuses that begin or extend a recording, and those that end it after the post-roll
+START_STATUSES = ('first_attempt', 'retry_attempt')
+END_STATUSES = ('access_denied', 'known_person', 'face_disappeared')
+
+
+class SessionRecorder:
+    """
+    Records annotated frames of access attempts to segmented video files.
+    submit() never blocks: while idle frames only fill the pre-roll buffer, while recording they go
+    to a bounded queue (oldest dropped when full) that an encoder thread writes with cv2.VideoWriter.
+    Segments rotate after RECORDER_CONFIG['segment_seconds'] or ['segment_max_mb'].
+    Each segment is written at the rate frames actually arrive (`rate`, e.g. the display thread's
+    measured render rate), so footage keeps real time when the governor or a slow render thins it.
+    Queued frames carry their session name, so a new session never ends up in the previous file.
+    """
+
+    def __init__(self, events, fps, output_dir=None, rate=None):
+        self.events = events
+        self.fps = fps
+        self.rate = rate or (lambda: self.fps)  # callable: current frames per second
+        self.output_dir = output_dir or RECORDER_CONFIG['output_dir']
+        self.codec = RECORDER_CONFIG['codec']
+        self.extension = '.avi' if self.codec == 'MJPG' else '.mp4'
+        self.segment_seconds = RECORDER_CONFIG['segment_seconds']
+        self.segment_max_bytes = RECORDER_CONFIG['segment_max_mb'] * 1024 * 1024
+        self.scheduler = get_scheduler()
+
+        preroll_frames = max(1, int(RECORDER_CONFIG['preroll_seconds'] * fps))
+        self.preroll = deque(maxlen=preroll_frames)
+        self.queue = LatestQueue('recorder', RECORDER_CONFIG['queue_size'] + preroll_frames)
+        self.lock = threading.Lock()
+        self.recording = False
+        self.session_name = None
+        self.stop_timer = None
+
+        # Encoder thread state
+        self.writer = None
+        self.writer_session = None
+        self.segment_fps = fps
+        self.segment_path = None
+        self.segment_size = None
+        self.segment_started = 0.0
+        self.segment_frames = 0
+        self.segment_index = 0
+        self.stop_event = threading.Event()
+        self.thread = None
+
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    # === Producer side ===
+
+    def submit(self, frame):
+        """Offer an annotated frame the caller will not modify again"""
+        with self.lock:
+            if self.recording:
+                self.queue.put((self.session_name, frame))
+            else:
+                self.preroll.append(frame)
+
+    def on_event(self, event_type, fields):
+        """EventEmitter listener: verification events drive recording"""
+        if event_type == 'verification':
+            if fields.get('status') in START_STATUSES:
+                self.start_recording()
+            elif fields.get('status') in END_STATUSES:
+                self.schedule_stop()
+        elif event_type == 'reset':
+            self.schedule_stop()
+
+    def start_recording(self):
+        """Start (or extend) a recording, beginning with the pre-roll frames"""
+        with self.lock:
+            self.scheduler.cancel(self.stop_timer)
+            self.stop_timer = None
+            if self.recording:
+                return
+            self.recording = True
+            session_name = time.strftime('access_%Y%m%d_%H%M%S')
+            if self.session_name is not None and self.session_name.startswith(session_name):
+                # Re-triggered within the same second: keep the sessions in separate files
+                session_name = f"{session_name}_{time.monotonic_ns() % 1000000:06d}"
+            self.session_name = session_name
+            while self.preroll:
+                self.queue.put((self.session_name, self.preroll.popleft()))
+        print(f"[RECORDER] Recording started: {self.session_name}")
+
+    def schedule_stop(self):
+        """Stop recording after the post-roll"""
+        with self.lock:
+            if not self.recording or self.stop_timer is not None:
+                return
+            self.stop_timer = self.scheduler.schedule(RECORDER_CONFIG['postroll_seconds'], self.stop_recording,
+                                                      name="recorder-postroll")
+
+    def stop_recording(self):
+        """Stop recording now; queued frames are still written"""
+        with self.lock:
+            self.scheduler.cancel(self.stop_timer)
+            self.stop_timer = None
+            if not self.recording:
+                return
+            self.recording = False
+        print(f"[RECORDER] Recording stopped: {self.session_name}")
+
+    # === Encoder thread ===
+
+    def start(self):
+        """Start the encoder thread"""
+        self.thread = threading.Thread(target=self._encode_loop, name="recorder", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop recording, write the queued frames and close the file"""
+        self.stop_recording()
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def _encode_loop(self):
+        while True:
+            item = self.queue.get(timeout=0.5)
+            if item is not None:
+                self._write(*item)
+                continue
+
+            # Queue drained: close the file once the session has ended
+            with self.lock:
+                recording = self.recording
+            if not recording and self.writer is not None:
+                self._close_segment()
+            if self.stop_event.is_set():
+                break
+
+        if self.writer is not None:
+            self._close_segment()
+
+    def _write(self, session_name, frame):
+        height, width = frame.shape[:2]
+        if self.writer is not None and (session_name != self.writer_session or self._segment_full((width, height))):
+            self._close_segment()
+        if session_name != self.writer_session:
+            # First frame of a new session: its segments are numbered from 1 again
+            self.writer_session = session_name
+            self.segment_index = 0
+        if self.writer is None:
+            self._open_segment((width, height))
+        self.writer.write(frame)
+        self.segment_frames += 1
+
+    def _segment_full(self, frame_size):
+        if frame_size != self.segment_size:
+            return True
+        if time.monotonic() - self.segment_started >= self.segment_seconds:
+            return True
+        # Checking the file size once a second is enough
+        if self.segment_frames % max(1, int(self.segment_fps)) == 0 and os.path.exists(self.segment_path):
+            return os.path.getsize(self.segment_path) >= self.segment_max_bytes
+        return False
+
+    def _open_segment(self, frame_size):
+        self.segment_index += 1
+        filename = f"{self.writer_session}_{self.segment_index:03d}{self.extension}"
+        self.segment_path = os.path.join(self.output_dir, filename)
+        self.segment_size = frame_size
+        # Frames arrive at the render rate, not the nominal display rate
+        self.segment_fps = max(1.0, round(self.rate(), 1))
+        self.writer = cv2.VideoWriter(self.segment_path, cv2.VideoWriter_fourcc(*self.codec), self.segment_fps,
+                                      frame_size)
+        if not self.writer.isOpened():
+            print(f"[ERROR] Could not open video writer for {self.segment_path} (codec {self.codec})")
+        self.segment_started = time.monotonic()
+        self.segment_frames = 0
+
+    def _close_segment(self):
+        self.writer.release()
+        self.writer = None
+        self.events.emit('recording', path=self.segment_path, frames=self.segment_frames,
+                         seconds=round(time.monotonic() - self.segment_started, 1))
+        print(f"[RECORDER] Saved {self.segment_path} ({self.segment_frames} frames at {self.segment_fps} fps)")
+
+    def format_stats(self):
+        """Short text line for overlay or console"""
+        queue_stats = self.queue.get_stats()
+        state = "REC" if self.recording else "idle"
+        return f"recorder {state}: queue {queue_stats['depth']}/{queue_stats['maxsize']}, {queue_stats['dropped']} dropped"
@@ -0,0 +1,235 @@
+# speaker_verification.py
+"""
+Speaker verification: voice commands are only dispatched when the voice matches the face in view
+
+Enrollment: python speaker_verification.py enroll NAME [--samples 3] [--seconds 5]
+Samples are stored as Voices/NAME_<n>.wav (named like the face images) and their embeddings are
+cached in Voices/embeddings.npz, recomputed only when the samples change.
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import speech_recognition as sr
+from config import KNOWN_VOICES_DIR, SPEAKER_CONFIG
+
+EMBEDDING_SAMPLE_RATE = 16000
+CACHE_FILE = "embeddings.npz"
+
+
+def audio_to_samples(audio):
+    """sr.AudioData -> float32 samples at 16 kHz in [-1, 1]"""
+    data = audio.get_raw_data(convert_rate=EMBEDDING_SAMPLE_RATE, convert_width=2)
+    return np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+class SpeakerVerifier:
+    """
+    Keeps the enrolled voice embeddings as one normalized (samples x 256) matrix. Each command
+    phrase is embedded with Resemblyzer on a worker thread while it is being transcribed, and
+    compared with every enrolled sample in a single matrix-vector product. A phrase is accepted
+    when the closest sample is similar enough and belongs to one of the names whose face is in view.
+    Without resemblyzer or enrolled samples the stage is disabled and commands pass unchecked.
+    """
+
+    def __init__(self, voices_dir=None):
+        self.voices_dir = voices_dir or KNOWN_VOICES_DIR
+        self.threshold = SPEAKER_CONFIG['threshold']
+        self.encoder = None
+        self.preprocess_wav = None
+        self.names = []
+        self.embeddings = np.zeros((0, 256), dtype=np.float32)
+        self.pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speaker")
+
+        self.lock = threading.Lock()
+        self.accepted = 0
+        self.rejected = 0
+        self.embedded = 0
+        self.embed_seconds = 0.0
+        self.wait_seconds = 0.0
+
+        if not SPEAKER_CONFIG['enabled']:
+            return
+        try:
+            from resemblyzer import VoiceEncoder, preprocess_wav
+        except ImportError:
+            print("[WARN] resemblyzer not installed - speaker verification disabled")
+            return
+        self.encoder = VoiceEncoder(device="cpu", verbose=False)
+        self.preprocess_wav = preprocess_wav
+        self.load_embeddings()
+        if not self.names:
+            print(f"[WARN] No enrolled voices in {self.voices_dir} - speaker verification disabled")
+
+    @property
+    def enabled(self):
+        return self.encoder is not None and len(self.names) > 0
+
+    # === Enrollment ===
+
+    def _sample_files(self):
+        if not os.path.isdir(self.voices_dir):
+            return []
+        return sorted(f for f in os.listdir(self.voices_dir) if f.lower().endswith('.wav'))
+
+    def load_embeddings(self):
+        """Load the cached embeddings, recomputing them if any sample was added, removed or changed"""
+        files = self._sample_files()
+        signature = np.array([f"{f}:{os.path.getsize(os.path.join(self.voices_dir, f))}:"
+                              f"{os.path.getmtime(os.path.join(self.voices_dir, f))}" for f in files])
+        cache_path = os.path.join(self.voices_dir, CACHE_FILE)
+
+        if files and os.path.exists(cache_path):
+            try:
+                cached = np.load(cache_path)
+                if np.array_equal(cached['signature'], signature):
+                    self.names = [str(name) for name in cached['names']]
+                    self.embeddings = cached['embeddings']
+                    print(f"[INFO] Loaded {len(self.names)} cached voice embeddings")
+                    return
+            except Exception as e:
+                print(f"[WARN] Voice embedding cache unreadable, rebuilding: {e}")
+
+        names, embeddings = [], []
+        for filename in files:
+            wav = self.preprocess_wav(os.path.join(self.voices_dir, filename))
+            if len(wav) == 0:
+                print(f"[WARN] No speech in {filename}")
+                continue
+            names.append(os.path.splitext(filename)[0].split('_')[0])
+            embeddings.append(self.encoder.embed_utterance(wav))
+            print(f"[SUCCESS] Enrolled voice {filename} as '{names[-1]}'")
+
+        self.names = names
+        self.embeddings = np.array(embeddings, dtype=np.float32).reshape(-1, 256)
+        if files:
+            np.savez(cache_path, names=np.array(names), embeddings=self.embeddings, signature=signature)
+
+    def enroll(self, name, audio):
+        """Store a voice sample for name and refresh the embeddings"""
+        os.makedirs(self.voices_dir, exist_ok=True)
+        index = 1
+        while os.path.exists(os.path.join(self.voices_dir, f"{name}_{index}.wav")):
+            index += 1
+        path = os.path.join(self.voices_dir, f"{name}_{index}.wav")
+        with open(path, 'wb') as f:
+            f.write(audio.get_wav_data(convert_rate=EMBEDDING_SAMPLE_RATE, convert_width=2))
+        print(f"[INFO] Saved {path}")
+        self.load_embeddings()
+
+    # === Verification ===
+
+    def submit(self, audio):
+        """Start embedding a phrase on the worker thread; returns a future for check()"""
+        if not self.enabled:
+            return None
+        return self.pool.submit(self._embed, audio)
+
+    def _embed(self, audio):
+        start = time.monotonic()
+        wav = self.preprocess_wav(audio_to_samples(audio), source_sr=EMBEDDING_SAMPLE_RATE)
+        embedding = self.encoder.embed_utterance(wav) if len(wav) else None
+        with self.lock:
+            self.embedded += 1
+            self.embed_seconds += time.monotonic() - start
+        return embedding
+
+    def check(self, future, allowed_names):
+        """
+        Wait for a phrase's embedding and compare it with the enrolled voices.
+        Returns (accepted, speaker name or None, similarity, milliseconds the command waited).
+        """
+        if future is None:
+            return True, None, 1.0, 0.0
+
+        start = time.monotonic()
+        try:
+            embedding = future.result(timeout=SPEAKER_CONFIG['timeout_seconds'])
+        except Exception as e:
+            print(f"[ERROR] Speaker embedding failed: {e}")
+            embedding = None
+        waited = time.monotonic() - start
+
+        speaker, similarity = None, 0.0
+        if embedding is not None:
+            # Embeddings are L2-normalized, so one product gives every cosine similarity
+            similarities = self.embeddings @ embedding
+            best = int(np.argmax(similarities))
+            speaker, similarity = self.names[best], float(similarities[best])
+        accepted = speaker is not None and similarity >= self.threshold and speaker in allowed_names
+
+        with self.lock:
+            self.wait_seconds += waited
+            if accepted:
+                self.accepted += 1
+            else:
+                self.rejected += 1
+        return accepted, speaker, similarity, 1000.0 * waited
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self):
+        """Accepted/rejected commands, embedding time and the latency added to each command"""
+        with self.lock:
+            checked = self.accepted + self.rejected
+            return {
+                'enabled': self.enabled,
+                'enrolled': sorted(set(self.names)),
+                'accepted': self.accepted,
+                'rejected': self.rejected,
+                'embed_ms': 1000.0 * self.embed_seconds / self.embedded if self.embedded else 0.0,
+                'added_ms': 1000.0 * self.wait_seconds / checked if checked else 0.0
+            }
+
+    def format_stats(self):
+        """Short text line for overlay or console"""
+        stats = self.get_stats()
+        if not stats['enabled']:
+            return "speaker: off"
+        return (f"speaker: {stats['accepted']} accepted, {stats['rejected']} rejected, "
+                f"embed {stats['embed_ms']:.0f}ms, +{stats['added_ms']:.0f}ms per command")
+
+
+def record_samples(name, samples, seconds):
+    """Record enrollment samples from the microphone"""
+    verifier = SpeakerVerifier()
+    if verifier.encoder is None:
+        print("[ERROR] Speaker verification is disabled or resemblyzer is missing")
+        return 1
+
+    recognizer = sr.Recognizer()
+    with sr.Microphone(sample_rate=EMBEDDING_SAMPLE_RATE) as source:
+        recognizer.adjust_for_ambient_noise(source, duration=1)
+        for index in range(samples):
+            input(f"[INFO] Sample {index + 1}/{samples}: press Enter and speak for {seconds} seconds...")
+            audio = recognizer.record(source, duration=seconds)
+            verifier.enroll(name, audio)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Speaker verification enrollment")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    enroll_parser = subparsers.add_parser('enroll', help="record voice samples for a person")
+    enroll_parser.add_argument('name', help="same name as the person's face image")
+    enroll_parser.add_argument('--samples', type=int, default=3)
+    enroll_parser.add_argument('--seconds', type=float, default=5)
+    subparsers.add_parser('list', help="list enrolled voices")
+    args = parser.parse_args()
+
+    if args.command == 'enroll':
+        return record_samples(args.name, args.samples, args.seconds)
+
+    verifier = SpeakerVerifier()
+    print(f"[INFO] Enrolled: {verifier.get_stats()['enrolled']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+# speech_benchmark.py
+"""
+Compare speech backends on recorded WAV fixtures: latency and word error rate per backend
+
+Usage: python speech_benchmark.py fixtures_dir [--backends google,vosk,sphinx]
+Each fixture is a WAV file with the expected transcript in a .txt file of the same name.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import speech_recognition as sr
+from speech_backends import BACKENDS, create_backend
+
+
+def normalize_words(text):
+    """Lower-case words without punctuation, for a fair comparison between engines"""
+    cleaned = ''.join(c if c.isalnum() or c.isspace() else ' ' for c in text.lower())
+    return cleaned.split()
+
+
+def word_errors(reference, hypothesis):
+    """Word-level edit distance (substitutions + insertions + deletions)"""
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hypothesis, 1):
+            current.append(min(previous[j] + 1,
+                               current[j - 1] + 1,
+                               previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1]
+
+
+def load_fixtures(fixtures_dir):
+    """List of (name, AudioData, expected words)"""
+    fixtures = []
+    for filename in sorted(os.listdir(fixtures_dir)):
+        if not filename.lower().endswith('.wav'):
+            continue
+        path = os.path.join(fixtures_dir, filename)
+        transcript_path = os.path.splitext(path)[0] + '.txt'
+        if not os.path.exists(transcript_path):
+            print(f"[WARN] No transcript for {filename}, skipped")
+            continue
+        with sr.AudioFile(path) as source:
+            audio = sr.Recognizer().record(source)
+        with open(transcript_path, encoding='utf-8') as f:
+            expected = normalize_words(f.read())
+        fixtures.append((filename, audio, expected))
+    return fixtures
+
+
+def benchmark_backend(backend, fixtures, verbose=False):
+    """Run every fixture through one backend"""
+    latencies = []
+    errors = 0
+    words = 0
+    for name, audio, expected in fixtures:
+        start = time.monotonic()
+        try:
+            text = backend.recognize(audio)
+        except sr.UnknownValueError:
+            text = ""
+        except sr.RequestError as e:
+            print(f"[ERROR] {backend.name}: {name}: {e}")
+            text = ""
+        latencies.append(time.monotonic() - start)
+
+        hypothesis = normalize_words(text)
+        errors += word_errors(expected, hypothesis)
+        words += len(expected)
+        if verbose:
+            print(f"  {backend.name:8s} {name}: '{text}'")
+
+    latencies.sort()
+    return {
+        'backend': backend.name,
+        'fixtures': len(fixtures),
+        'mean_ms': 1000.0 * sum(latencies) / len(latencies),
+        'p90_ms': 1000.0 * latencies[min(len(latencies) - 1, int(0.9 * len(latencies)))],
+        'wer': errors / words if words else 0.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Speech backend benchmark")
+    parser.add_argument('fixtures', help="directory of .wav files with matching .txt transcripts")
+    parser.add_argument('--backends', default=','.join(sorted(BACKENDS)),
+                        help="comma-separated backends to compare")
+    parser.add_argument('--verbose', action='store_true', help="print every transcript")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures)
+    if not fixtures:
+        print(f"[ERROR] No fixtures found in {args.fixtures}")
+        return 1
+
+    results = []
+    for name in args.backends.split(','):
+        try:
+            backend = create_backend(name.strip())
+        except (RuntimeError, ValueError) as e:
+            print(f"[ERROR] {name}: {e}")
+            continue
+        if backend.name != name.strip():
+            # create_backend fell back to another engine; do not report it under this name
+            continue
+        results.append(benchmark_backend(backend, fixtures, args.verbose))
+
+    print(f"\n{'backend':10s} {'fixtures':>8s} {'mean ms':>9s} {'p90 ms':>9s} {'WER':>7s}")
+    for result in results:
+        print(f"{result['backend']:10s} {result['fixtures']:8d} {result['mean_ms']:9.0f} "
+              f"{result['p90_ms']:9.0f} {result['wer']:7.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+# stream_session.py
+"""
+Per-camera tracker, gaze and verification state with the decision logic that drives it
+"""
+
+import threading
+from config import SYSTEM_CONFIG
+from detections import EMPTY_RESULT
+from verification_system import VerificationSystem
+
+
+class StreamSession:
+    """
+    Decision state for one camera stream.
+    Callers must hold self.lock while calling the apply_* / handle_* methods.
+    """
+
+    def __init__(self, stream_id, events, request_recognition, on_reset=None):
+        self.stream_id = stream_id
+        self.events = events
+        self.request_recognition = request_recognition  # callback(packet) queuing a frame for recognition
+        self.on_reset = on_reset
+        self.verification_system = VerificationSystem()
+        self.lock = threading.RLock()
+
+        # State variables
+        self.debug_mode = False
+        self.recognition_done = False
+        self.recognition_pending = False
+        self.session_id = 0
+        self.last_result = EMPTY_RESULT  # FrameResult of the last recognition with faces
+        self.processed_faces = set()
+        self.gaze_detected = False
+        self.unknown_person_detected = False
+        self.no_face_counter = 0
+
+    def emit(self, event_type, **fields):
+        """Emit an event tagged with this stream"""
+        self.events.emit(event_type, stream=self.stream_id, **fields)
+
+    def reset_state(self, reason="no_face"):
+        """Reset the stream state when no face is detected"""
+        with self.lock:
+            self.last_result = EMPTY_RESULT
+            self.processed_faces.clear()
+            self.recognition_done = False
+            self.session_id += 1
+            self.no_face_counter = 0
+            self.verification_system.reset_verification_system()
+            if self.on_reset:
+                self.on_reset()
+        self.emit('reset', reason=reason)
+        print(f"[INFO] Stream {self.stream_id}: no face detected for extended time - system reset")
+
+    def apply_gaze_result(self, packet):
+        """Update gaze state and request recognition once per gaze session"""
+        self.gaze_detected = packet['gaze_detected']
+
+        if self.debug_mode and self.gaze_detected:
+            print(f"[DEBUG] Stream {self.stream_id}: gaze and clear face view detected")
+
+        # Face recognition logic (only once per gaze session)
+        if not self.recognition_done and self.gaze_detected:
+            if not self.recognition_pending:
+                self.recognition_pending = True
+                self.request_recognition(dict(packet, session_id=self.session_id))
+        else:
+            # Update no face counter
+            if not packet['has_landmarks']:
+                self.no_face_counter += 1
+            else:
+                self.no_face_counter = 0
+
+        # Reset logic if no face detected for extended time
+        if self.no_face_counter > SYSTEM_CONFIG['no_face_reset_frames']:
+            self.reset_state()
+
+    def apply_recognition_result(self, result):
+        """Apply a FrameResult returned by the recognition stage"""
+        self.recognition_pending = False
+
+        # Results requested before a reset or retry belong to an old session
+        if result.session_id != self.session_id:
+            return
+
+        if result:
+            self.last_result = result
+            self.recognition_done = True
+            self.no_face_counter = 0
+
+            # Update processed faces
+            self.processed_faces.update(result.names)
+
+            print(f"[INFO] Stream {self.stream_id}: recognition completed. "
+                  f"Detected: {result.names}")
+            self.emit('recognition', frame_id=result.frame_id,
+                      faces=[detection.to_event() for detection in result])
+
+            # Check if known person detected during verification
+            self.check_for_known_person()
+        else:
+            self.no_face_counter += 1
+
+    def handle_unknown_person_detection(self):
+        """Handle unknown person detection and verification"""
+        if self.last_result:
+            self.unknown_person_detected = self.last_result.has_unknown
+
+            if self.unknown_person_detected:
+                verification_status = self.verification_system.handle_unknown_person_verification()
+                if verification_status in ("first_attempt", "retry_attempt", "access_denied"):
+                    self.emit_verification_event(verification_status)
+
+                # Reset recognition for retry attempts
+                if verification_status == "retry_attempt":
+                    self.recognition_done = False
+                    self.session_id += 1
+                    self.last_result = EMPTY_RESULT
+                    self.processed_faces.clear()
+            else:
+                # Known face detected - reset verification if needed
+                self.check_for_known_person()
+        else:
+            # No detections - face has moved away
+            if self.verification_system.is_in_progress():
+                self.verification_system.handle_face_disappeared()
+                self.emit_verification_event("face_disappeared")
+            self.unknown_person_detected = False
+
+    def check_for_known_person(self):
+        """End a running verification if a known person is now detected"""
+        if self.verification_system.check_for_known_person(self.last_result):
+            self.emit_verification_event("known_person")
+
+    def emit_verification_event(self, status):
+        """Emit a verification state change as a JSON line event"""
+        attempt_info = self.verification_system.get_attempt_info()
+        self.emit('verification', status=status,
+                  attempt=attempt_info['current_attempt'],
+                  max_attempts=attempt_info['max_attempts'],
+                  message=self.verification_system.get_verification_message())
+
+    def get_status(self):
+        """Snapshot of the current recognition and verification state"""
+        with self.lock:
+            attempt_info = self.verification_system.get_attempt_info()
+            return {
+                'stream': self.stream_id,
+                'gaze_detected': self.gaze_detected,
+                'recognition_done': self.recognition_done,
+                'faces': self.last_result.names,
+                'unknown_person_detected': self.unknown_person_detected,
+                'verification_in_progress': attempt_info['in_progress'],
+                'attempt': attempt_info['current_attempt'],
+                'max_attempts': attempt_info['max_attempts'],
+                'cooldown_remaining': round(self.verification_system.get_cooldown_remaining(), 1)
+            }
@@ -0,0 +1,66 @@
+"""
+Speech benchmark scoring checks: python -m pytest tests
+"""
+
+import os
+import sys
+import wave
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+sr = pytest.importorskip("speech_recognition")
+from speech_benchmark import benchmark_backend, load_fixtures, normalize_words, word_errors
+
+
+class ScriptedBackend:
+    """Returns a fixed transcript per fixture, or raises the recognizer's exception"""
+
+    name = "scripted"
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+
+    def recognize(self, audio):
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+
+def test_normalize_words_drops_case_and_punctuation():
+    assert normalize_words("Send a message, to Nikhil!") == ["send", "a", "message", "to", "nikhil"]
+    assert normalize_words("  ") == []
+
+
+def test_word_errors_counts_substitutions_insertions_and_deletions():
+    reference = ["send", "message", "to", "nikhil"]
+    assert word_errors(reference, reference) == 0
+    assert word_errors(reference, ["send", "message", "to", "nikita"]) == 1
+    assert word_errors(reference, ["send", "a", "message", "to", "nikhil"]) == 1
+    assert word_errors(reference, ["send", "message"]) == 2
+    assert word_errors(reference, []) == 4
+    assert word_errors([], ["hello"]) == 1
+
+
+def test_benchmark_scores_misses_as_errors():
+    fixtures = [("a.wav", None, ["what", "time", "is", "it"]), ("b.wav", None, ["open", "google"])]
+    backend = ScriptedBackend(["What time is it?", sr.UnknownValueError()])
+    result = benchmark_backend(backend, fixtures)
+    assert result['fixtures'] == 2
+    assert result['wer'] == pytest.approx(2 / 6)
+
+
+def test_load_fixtures_pairs_wav_with_transcript(tmp_path):
+    for name in ("command", "untranscribed"):
+        with wave.open(str(tmp_path / f"{name}.wav"), "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(16000)
+            wav.writeframes(b"\0\0" * 1600)
+    (tmp_path / "command.txt").write_text("Open Google.", encoding="utf-8")
+
+    fixtures = load_fixtures(str(tmp_path))
+    assert [(name, expected) for name, _, expected in fixtures] == [("command.wav", ["open", "google"])]
+    assert fixtures[0][1].sample_rate == 16000
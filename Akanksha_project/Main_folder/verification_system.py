@@ -3,25 +3,31 @@
 3-attempt verification system for unknown persons
 """
 
-import time
 from config import VERIFICATION_CONFIG
+from timer_scheduler import get_scheduler
 
 
 class VerificationSystem:
-    def __init__(self):
+    def __init__(self, scheduler=None):
+        self.scheduler = scheduler or get_scheduler()
         self.unknown_attempt_count = 0
         self.max_attempts = VERIFICATION_CONFIG['max_attempts']
-        self.attempt_start_time = None
         self.verification_cooldown = VERIFICATION_CONFIG['cooldown_seconds']
-        self.last_verification_time = 0
         self.verification_in_progress = False
         self.verification_message = ""
         self.attempt_delay = VERIFICATION_CONFIG['attempt_delay']
 
+        # Deadlines registered with the scheduler; callbacks only flip these flags
+        self.attempt_timer = None
+        self.attempt_ready = False
+        self.cooldown_timer = None
+
     def reset_verification_system(self):
         """Reset the 3-attempt verification system"""
+        self.scheduler.cancel(self.attempt_timer)
+        self.attempt_timer = None
+        self.attempt_ready = False
         self.unknown_attempt_count = 0
-        self.attempt_start_time = None
         self.verification_in_progress = False
         self.verification_message = ""
         print("[VERIFICATION] System reset")
@@ -31,38 +37,37 @@ class VerificationSystem:
         Handle the 3-attempt verification process for unknown persons
         Returns verification status string
         """
-        current_time = time.time()
-
         # Check if we're in cooldown period
-        if current_time - self.last_verification_time < self.verification_cooldown:
-            remaining_cooldown = self.verification_cooldown - (current_time - self.last_verification_time)
-            self.verification_message = f"Access denied. Try again in {int(remaining_cooldown)}s"
+        cooldown_timer = self.cooldown_timer
+        if cooldown_timer is not None:
+            self.verification_message = f"Access denied. Try again in {int(cooldown_timer.remaining())}s"
             return "cooldown"
 
         # Start new verification cycle if not already in progress
         if not self.verification_in_progress:
             self.verification_in_progress = True
             self.unknown_attempt_count = 1
-            self.attempt_start_time = current_time
+            self.start_attempt_timer()
             self.verification_message = f"Unknown person detected. Attempt {self.unknown_attempt_count}/{self.max_attempts}"
             print(f"[VERIFICATION] Starting attempt {self.unknown_attempt_count}/{self.max_attempts}")
             return "first_attempt"
 
         # Continue existing verification cycle
         else:
-            # Check if enough time has passed for next attempt
-            if current_time - self.attempt_start_time >= self.attempt_delay:
+            # Check if the attempt delay timer has fired
+            if self.attempt_ready:
                 self.unknown_attempt_count += 1
-                self.attempt_start_time = current_time
 
                 if self.unknown_attempt_count <= self.max_attempts:
+                    self.start_attempt_timer()
                     self.verification_message = f"Verification failed. Attempt {self.unknown_attempt_count}/{self.max_attempts}"
                     print(f"[VERIFICATION] Attempt {self.unknown_attempt_count}/{self.max_attempts}")
                     return "retry_attempt"
                 else:
                     # All attempts exhausted
                     self.verification_message = "Access denied. Maximum attempts reached."
-                    self.last_verification_time = current_time
+                    self.cooldown_timer = self.scheduler.schedule(
+                        self.verification_cooldown, self._on_cooldown_end, name="verification-cooldown")
                     self.reset_verification_system()
                     print("[VERIFICATION] All attempts exhausted. Access denied.")
                     return "access_denied"
@@ -72,17 +77,32 @@ class VerificationSystem:
 
         return "unknown"
 
-    def check_for_known_person(self, last_detections):
+    def start_attempt_timer(self):
+        """Register the delay before the next attempt may start"""
+        self.attempt_ready = False
+        self.scheduler.cancel(self.attempt_timer)
+        handle = self.attempt_timer = self.scheduler.schedule(
+            self.attempt_delay, lambda: self._on_attempt_delay(handle), name="verification-attempt")
+
+    def _on_attempt_delay(self, handle):
+        if handle is not self.attempt_timer:
+            # Cancelled or replaced after it fired: the newer timer decides
+            return
+        if self.verification_in_progress:
+            self.attempt_ready = True
+
+    def _on_cooldown_end(self):
+        self.cooldown_timer = None
+
+    def check_for_known_person(self, frame_result):
         """
         Check if a known person is now detected and reset verification if so
         Returns True if known person detected during verification
         """
-        if self.verification_in_progress and last_detections:
-            for detection in last_detections:
-                if detection['name'] != "Unknown Face":
-                    print(f"[VERIFICATION] Known person '{detection['name']}' detected. Resetting verification.")
-                    self.reset_verification_system()
-                    return True
+        if self.verification_in_progress and frame_result.known_names:
+            print(f"[VERIFICATION] Known person '{frame_result.known_names[0]}' detected. Resetting verification.")
+            self.reset_verification_system()
+            return True
         return False
 
     def is_in_progress(self):
@@ -109,7 +129,7 @@ class VerificationSystem:
 
     def get_cooldown_remaining(self):
         """Get remaining cooldown time in seconds"""
-        current_time = time.time()
-        if current_time - self.last_verification_time < self.verification_cooldown:
-            return self.verification_cooldown - (current_time - self.last_verification_time)
+        cooldown_timer = self.cooldown_timer
+        if cooldown_timer is not None:
+            return cooldown_timer.remaining()
         return 0
\ No newline at end of file
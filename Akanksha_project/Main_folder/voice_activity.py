@@ -0,0 +1,99 @@
+# voice_activity.py
+"""
+Voice activity detection gate: only audio with real speech reaches the speech recognizer
+"""
+
+import threading
+
+import speech_recognition as sr
+from config import VAD_CONFIG
+
+try:
+    import webrtcvad
+except ImportError:
+    webrtcvad = None
+
+# webrtcvad accepts 16-bit mono PCM at these rates in 10, 20 or 30 ms frames
+VAD_SAMPLE_RATE = 16000
+VAD_FRAME_MS = (10, 20, 30)
+
+
+class VoiceActivityGate:
+    """
+    Splits a captured phrase into short frames and runs webrtcvad on each. Phrases with too
+    little speech (door slams, clicks, distant chatter) are rejected before any recognizer call;
+    accepted ones are trimmed to the speech plus a little padding.
+    Without webrtcvad installed every phrase passes untouched.
+    """
+
+    def __init__(self, aggressiveness=None, frame_ms=None):
+        self.frame_ms = frame_ms or VAD_CONFIG['frame_ms']
+        if self.frame_ms not in VAD_FRAME_MS:
+            raise ValueError(f"[ERROR] VAD frames must be 10, 20 or 30 ms, got {self.frame_ms}")
+        self.frame_bytes = VAD_SAMPLE_RATE * self.frame_ms // 1000 * 2
+        self.min_speech_frames = max(1, VAD_CONFIG['min_speech_ms'] // self.frame_ms)
+        self.padding_frames = VAD_CONFIG['padding_ms'] // self.frame_ms
+
+        self.vad = None
+        if webrtcvad is not None:
+            self.vad = webrtcvad.Vad(aggressiveness if aggressiveness is not None else VAD_CONFIG['aggressiveness'])
+        else:
+            print("[WARN] webrtcvad not installed - voice activity gate disabled")
+
+        self.lock = threading.Lock()
+        self.accepted = 0
+        self.rejected = 0
+        self.speech_seconds = 0.0
+        self.trimmed_seconds = 0.0
+
+    @property
+    def enabled(self):
+        return self.vad is not None
+
+    def filter(self, audio):
+        """Trimmed sr.AudioData if the phrase holds speech, None if it should not be transcribed"""
+        if self.vad is None:
+            return audio
+
+        data = audio.get_raw_data(convert_rate=VAD_SAMPLE_RATE, convert_width=2)
+        frames = [data[i:i + self.frame_bytes]
+                  for i in range(0, len(data) - self.frame_bytes + 1, self.frame_bytes)]
+        flags = [self.vad.is_speech(frame, VAD_SAMPLE_RATE) for frame in frames]
+        speech_frames = sum(flags)
+
+        if speech_frames < self.min_speech_frames:
+            with self.lock:
+                self.rejected += 1
+            return None
+
+        # Trim leading and trailing silence, keeping some padding around the speech
+        first = flags.index(True)
+        last = len(flags) - 1 - flags[::-1].index(True)
+        start = max(0, first - self.padding_frames)
+        end = min(len(frames), last + 1 + self.padding_frames)
+
+        with self.lock:
+            self.accepted += 1
+            self.speech_seconds += speech_frames * self.frame_ms / 1000.0
+            self.trimmed_seconds += (len(frames) - (end - start)) * self.frame_ms / 1000.0
+        return sr.AudioData(b"".join(frames[start:end]), VAD_SAMPLE_RATE, 2)
+
+    def get_stats(self):
+        """Accepted/rejected phrase counts and the acceptance rate"""
+        with self.lock:
+            total = self.accepted + self.rejected
+            return {
+                'enabled': self.enabled,
+                'accepted': self.accepted,
+                'rejected': self.rejected,
+                'accept_rate': self.accepted / total if total else 0.0,
+                'trimmed_seconds': round(self.trimmed_seconds, 1)
+            }
+
+    def format_stats(self):
+        """Short text line for overlay or console"""
+        stats = self.get_stats()
+        if not stats['enabled']:
+            return "vad: off"
+        return (f"vad: {stats['accepted']} accepted, {stats['rejected']} rejected "
+                f"({stats['accept_rate']:.0%}), {stats['trimmed_seconds']}s silence trimmed")
@@ -7,22 +7,51 @@ import time
 import threading
 import webbrowser
 import speech_recognition as sr
-from config import VOICE_CONFIG, VERIFICATION_CONFIG
+from config import VOICE_CONFIG, WAKE_WORD_CONFIG
+from speech_backends import create_backend
+from voice_activity import VoiceActivityGate
+from wake_word import WakeWordSpotter
+from transcriber import Transcriber
+from voice_commands import CommandRegistry
+from action_executor import ActionExecutor
+from speaker_verification import SpeakerVerifier
 
 
 class VoiceRecognitionManager:
-    def __init__(self):
+    def __init__(self, backend=None):
+        self.backend = create_backend(backend)
+        self.vad_gate = VoiceActivityGate()
+        self.wake_word = WakeWordSpotter()
+        self.wake_deadline = 0.0  # a lone wake word makes the next phrase before this time the command
+        # Second factor: the voice must belong to a person whose face is in view
+        self.speaker_verifier = SpeakerVerifier()
+        self.speaker_checks = {}  # phrase seq -> (embedding future, names in view when it was spoken)
+        self.speaker_lock = threading.Lock()
+        self.face_names = []
         self.recognizer = sr.Recognizer()
         self.recognizer.energy_threshold = VOICE_CONFIG['energy_threshold']
         self.recognizer.dynamic_energy_threshold = VOICE_CONFIG['dynamic_energy_threshold']
 
         self.last_voice_input = ""
         self.is_listening = False
+
+        # Side effects of commands run here, never on the listening or transcription threads
+        self.action_executor = ActionExecutor()
+
+        # Commands are matched in one pass over the transcript; plugins can add more
+        self.command_registry = CommandRegistry()
+        self._register_commands()
+        self.command_registry.load_plugins(VOICE_CONFIG['command_plugins'])
+        self.listen_condition = threading.Condition()  # signalled by update_listening_state on transitions
         self.microphone = sr.Microphone()
 
         # Calibrate microphone
         self._calibrate_microphone()
 
+        # Transcription runs on its own workers so capture never pauses for it
+        self.transcriber = Transcriber(self.backend, self._on_transcript)
+        self.transcriber.start()
+
         # Start voice listening thread
         self.voice_thread = threading.Thread(target=self._continuous_voice_listener, daemon=True)
         self.voice_thread.start()
@@ -36,16 +65,15 @@ class VoiceRecognitionManager:
         except Exception as e:
             print(f"[ERROR] Microphone calibration failed: {e}")
 
-    def should_listen(self, gaze_detected, last_detections, unknown_person_detected,
+    def should_listen(self, gaze_detected, frame_result, unknown_person_detected,
                       verification_in_progress):
         """
         Determine if voice recognition should be active
         """
         return (gaze_detected and
-                last_detections and
+                frame_result.has_authorized and
                 not unknown_person_detected and
-                not verification_in_progress and
-                any(d['name'] == VERIFICATION_CONFIG['authorized_name'] for d in last_detections))
+                not verification_in_progress)
 
     def _continuous_voice_listener(self):
         """
@@ -53,9 +81,14 @@ class VoiceRecognitionManager:
         This will be controlled by external state variables
         """
         while True:
+            # Sleep without polling until listening is switched on
+            with self.listen_condition:
+                self.listen_condition.wait_for(lambda: self.is_listening)
+
             try:
-                if self.is_listening:
-                    with self.microphone as source:
+                # The microphone stays open while listening, so the spotter hears every phrase
+                with self.microphone as source:
+                    while self.is_listening:
                         print("[VOICE] Listening...")
                         try:
                             audio = self.recognizer.listen(
@@ -63,66 +96,176 @@ class VoiceRecognitionManager:
                                 timeout=VOICE_CONFIG['timeout'],
                                 phrase_time_limit=VOICE_CONFIG['phrase_time_limit']
                             )
-                            print("[VOICE] Processing...")
 
-                            word = self.recognizer.recognize_google(
-                                audio,
-                                language=VOICE_CONFIG['language']
-                            )
-                            print(f"[WORD] {word}")
+                            # Noise without speech never reaches the recognizer
+                            audio = self.vad_gate.filter(audio)
+                            if audio is None:
+                                continue
+
+                            # Only the phrase after the wake word goes to full speech-to-text
+                            audio = self._after_wake_word(audio)
+                            if audio is None:
+                                continue
 
-                            # Process the recognized word
-                            self._process_voice_command(word)
+                            # Hand the phrase over and keep listening while it is transcribed;
+                            # the speaker is embedded at the same time
+                            self._submit_phrase(audio)
 
-                        except sr.UnknownValueError:
-                            print("[ERROR] Could not understand audio")
-                            self.last_voice_input = "Sorry, I didn't catch that."
-                        except sr.RequestError as e:
-                            print(f"[ERROR] API error: {e}")
-                            self.last_voice_input = "Voice recognition failed."
                         except sr.WaitTimeoutError:
                             # Timeout is normal, just continue
                             pass
-                else:
-                    time.sleep(0.5)
 
             except Exception as e:
                 print(f"[ERROR] Voice thread exception: {e}")
                 time.sleep(1)
 
+    def _after_wake_word(self, audio):
+        """
+        The audio to transcribe, or None while waiting for the wake word
+        """
+        if not self.wake_word.enabled:
+            return audio
+
+        if time.monotonic() < self.wake_deadline:
+            # One command per wake word
+            self.wake_deadline = 0.0
+            return audio
+
+        detected, command = self.wake_word.spot(audio, self.recognizer.energy_threshold)
+        if not detected:
+            return None
+
+        print("[VOICE] Wake word detected")
+        if command is None:
+            # Wake word on its own: wait for the command
+            self.wake_deadline = time.monotonic() + WAKE_WORD_CONFIG['window_seconds']
+            self.last_voice_input = "Listening for a command..."
+        return command
+
+    def _submit_phrase(self, audio):
+        """Queue a phrase for transcription and, with speaker verification, for embedding"""
+        future = self.speaker_verifier.submit(audio)
+        face_names = tuple(self.face_names)
+        with self.speaker_lock:
+            seq = self.transcriber.submit(audio)
+            if future is not None:
+                self.speaker_checks[seq] = (future, face_names)
+        print(f"[VOICE] Processing phrase {seq}...")
+
+    def _speaker_matches(self, seq):
+        """Whether phrase seq was spoken by a person whose face was in view"""
+        with self.speaker_lock:
+            check = self.speaker_checks.pop(seq, None)
+            # Phrases dropped by the transcriber never reach this callback
+            for old_seq in [s for s in self.speaker_checks if s < seq]:
+                del self.speaker_checks[old_seq]
+        if check is None:
+            return True
+
+        future, face_names = check
+        accepted, speaker, similarity, waited_ms = self.speaker_verifier.check(future, face_names)
+        print(f"[VOICE] Speaker {speaker or 'unknown'} ({similarity:.2f}), +{waited_ms:.0f}ms")
+        return accepted
+
+    def _on_transcript(self, seq, word, error):
+        """Transcriber callback, called in the order the phrases were spoken"""
+        if not self.is_listening:
+            # Spoken before listening was switched off (unknown person, verification): never act on it
+            with self.speaker_lock:
+                self.speaker_checks.pop(seq, None)
+            return
+        if error is None:
+            print(f"[WORD] {word}")
+
+            if not self._speaker_matches(seq):
+                self.last_voice_input = "Voice not recognized - command ignored"
+                return
+
+            # Process the recognized word
+            self._process_voice_command(word)
+        elif isinstance(error, sr.UnknownValueError):
+            print(f"[ERROR] Could not understand audio (phrase {seq})")
+            self.last_voice_input = "Sorry, I didn't catch that."
+        elif isinstance(error, sr.RequestError):
+            print(f"[ERROR] API error: {error}")
+            self.last_voice_input = "Voice recognition failed."
+        else:
+            print(f"[ERROR] Transcription failed: {error}")
+
+    def _register_commands(self):
+        """Built-in voice commands"""
+        self.command_registry.register("open_google", ["google", "open google"], self._open_google)
+        self.command_registry.register("tell_time", ["time", "what time is it"], self._tell_time)
+
     def _process_voice_command(self, word):
         """
         Process recognized voice commands
         """
-        word_lower = word.lower()
-
-        if "google" in word_lower:
-            webbrowser.open("https://www.google.com")
-            self.last_voice_input = f"Opening Google... You said: {word}"
-        elif "time" in word_lower:
-            current_time = time.strftime('%I:%M %p')
-            print(f"[TIME] {current_time}")
-            self.last_voice_input = f"Time is {current_time}"
-        else:
-            self.last_voice_input = f"You said: {word}"
-            print("[VOICE] No recognized command")
+        self.last_voice_input = self.command_registry.dispatch(word, self._unknown_command)
+
+    def _open_google(self, match):
+        if not self._run_action("open_google", webbrowser.open, "https://www.google.com",
+                                group="browser", done_message="Google opened"):
+            return "Busy with earlier commands, try again"
+        return f"Opening Google... You said: {match.text}"
 
-    def update_listening_state(self, gaze_detected, last_detections, unknown_person_detected,
+    def _run_action(self, name, func, *args, group=None, done_message=None):
+        """
+        Submit a command's side effect without waiting; last_voice_input is updated when it completes
+        """
+        def on_done(action_name, result, error):
+            if isinstance(error, TimeoutError):
+                print(f"[ERROR] Action {action_name} timed out")
+                self.last_voice_input = f"{action_name} is taking too long"
+            elif error is not None:
+                print(f"[ERROR] Action {action_name} failed: {error}")
+                self.last_voice_input = f"{action_name} failed"
+            elif done_message:
+                self.last_voice_input = done_message
+
+        return self.action_executor.submit(name, func, *args, group=group, on_done=on_done)
+
+    def _tell_time(self, match):
+        current_time = time.strftime('%I:%M %p')
+        print(f"[TIME] {current_time}")
+        return f"Time is {current_time}"
+
+    def _unknown_command(self, word):
+        print("[VOICE] No recognized command")
+        return f"You said: {word}"
+
+    def update_listening_state(self, gaze_detected, frame_result, unknown_person_detected,
                                verification_in_progress):
         """
         Update whether the voice recognition should be listening
         """
         should_listen = self.should_listen(
-            gaze_detected, last_detections, unknown_person_detected, verification_in_progress
+            gaze_detected, frame_result, unknown_person_detected, verification_in_progress
         )
+        self.face_names = frame_result.known_names
 
         if should_listen != self.is_listening:
-            self.is_listening = should_listen
+            with self.listen_condition:
+                self.is_listening = should_listen
+                self.wake_deadline = 0.0
+                self.listen_condition.notify_all()
             if should_listen:
                 print("[VOICE] Voice recognition activated")
+                if self.wake_word.enabled:
+                    print(f"[VOICE] Say '{self.wake_word.phrases[0]}' before a command")
             else:
+                # Phrases still queued or being transcribed must not outlive the listening state
+                self.transcriber.clear()
+                with self.speaker_lock:
+                    self.speaker_checks.clear()
                 print("[VOICE] Voice recognition deactivated")
 
+    def stop(self):
+        """Stop the transcription workers and drop command actions that have not started"""
+        self.transcriber.stop()
+        self.action_executor.shutdown()
+        self.speaker_verifier.shutdown()
+
     def get_last_input(self):
         """Get the last voice input message"""
         return self.last_voice_input
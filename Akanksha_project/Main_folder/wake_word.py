@@ -0,0 +1,171 @@
+# wake_word.py
+"""
+Wake word spotting: a small grammar-limited recognizer decides which phrases reach full speech-to-text
+"""
+
+import json
+import threading
+import time
+
+import numpy as np
+import speech_recognition as sr
+from config import SPEECH_CONFIG, VAD_CONFIG, WAKE_WORD_CONFIG
+from speech_backends import load_vosk_model
+
+SPOTTER_SAMPLE_RATE = 16000
+
+
+def frame_energy(data):
+    """RMS energy of 16-bit PCM bytes (same scale as Recognizer.energy_threshold)"""
+    samples = np.frombuffer(data, dtype=np.int16).astype(np.float32)
+    if samples.size == 0:
+        return 0.0
+    return float(np.sqrt(np.mean(samples * samples)))
+
+
+class WakeWordSpotter:
+    """
+    Runs Vosk restricted to a grammar of only the wake phrases (plus "[unk]" for everything else),
+    which decodes much faster than open-vocabulary recognition and never leaves the device.
+    Audio is fed in short frames; silent frames are skipped, so the spotter costs CPU only while
+    someone talks. The CPU time of every frame is measured and capped at WAKE_WORD_CONFIG['cpu_budget']
+    of one core per window: once a window has used its share, the partial hypothesis is dropped and
+    the rest of the utterance is skipped, so a phrase is never decoded with frames missing from it.
+    Without vosk or its model the spotter is disabled and every phrase is transcribed as before.
+    """
+
+    def __init__(self, phrases=None, cpu_budget=None, frame_ms=None):
+        self.phrases = [phrase.lower() for phrase in (phrases or WAKE_WORD_CONFIG['phrases'])]
+        self.cpu_budget = cpu_budget if cpu_budget is not None else WAKE_WORD_CONFIG['cpu_budget']
+        self.window_seconds = WAKE_WORD_CONFIG['budget_window_seconds']
+        self.frame_ms = frame_ms or VAD_CONFIG['frame_ms']
+        self.frame_bytes = SPOTTER_SAMPLE_RATE * self.frame_ms // 1000 * 2
+        self.hangover_frames = max(1, WAKE_WORD_CONFIG['hangover_ms'] // self.frame_ms)
+
+        self.recognizer = None
+        if WAKE_WORD_CONFIG['enabled']:
+            try:
+                model = load_vosk_model(SPEECH_CONFIG['vosk_model_path'])
+                import vosk
+                grammar = json.dumps(self.phrases + ["[unk]"])
+                self.recognizer = vosk.KaldiRecognizer(model, SPOTTER_SAMPLE_RATE, grammar)
+            except RuntimeError as e:
+                print(f"[WARN] {e} - wake word disabled, every phrase is transcribed")
+
+        self.quiet_frames = self.hangover_frames  # frames since the last loud one
+        self.fed = False  # the recognizer holds audio since its last reset
+        self.throttling = False  # the current utterance ran out of CPU budget
+        self.window_start = time.monotonic()
+        self.window_cpu = 0.0
+
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.detections = 0
+        self.frames = 0
+        self.decoded = 0
+        self.throttled = 0
+        self.cpu_seconds = 0.0
+
+    @property
+    def enabled(self):
+        return self.recognizer is not None
+
+    def process(self, frame, is_loud=True):
+        """Feed one frame of 16 kHz 16-bit mono audio; True when a wake phrase was just heard"""
+        if self.recognizer is None:
+            return False
+
+        self.frames += 1
+        self.quiet_frames = 0 if is_loud else self.quiet_frames + 1
+        if self.quiet_frames >= self.hangover_frames:
+            # Nobody is talking: skip decoding and forget the unfinished hypothesis
+            self.reset()
+            self.throttling = False
+            return False
+
+        now = time.monotonic()
+        if now - self.window_start >= self.window_seconds:
+            self.window_start = now
+            self.window_cpu = 0.0
+        if self.throttling or self.window_cpu >= self.cpu_budget * self.window_seconds:
+            if not self.throttling:
+                # Out of budget: give up on this utterance rather than decode it with gaps
+                self.reset()
+                self.throttling = True
+            self.throttled += 1
+            return False
+
+        start = time.thread_time()
+        if self.recognizer.AcceptWaveform(frame):
+            text = json.loads(self.recognizer.Result()).get('text', '')
+        else:
+            text = json.loads(self.recognizer.PartialResult()).get('partial', '')
+        elapsed = time.thread_time() - start
+        self.fed = True
+        self.window_cpu += elapsed
+        with self.lock:
+            self.decoded += 1
+            self.cpu_seconds += elapsed
+
+        if not any(phrase in text for phrase in self.phrases):
+            return False
+        self.reset()
+        with self.lock:
+            self.detections += 1
+        return True
+
+    def reset(self):
+        """Drop the partial hypothesis (end of an utterance)"""
+        if self.fed:
+            self.recognizer.Reset()
+            self.fed = False
+
+    def spot(self, audio, energy_threshold=0.0):
+        """
+        Stream a captured phrase through the spotter; frames with RMS energy below energy_threshold
+        count as quiet. A phrase that runs out of CPU budget counts as not spotted.
+        Returns (detected, command): command is the audio spoken after the wake phrase in the
+        same breath ("hey camera what time is it"), or None when the wake phrase came alone.
+        """
+        if self.recognizer is None:
+            return False, None
+
+        data = audio.get_raw_data(convert_rate=SPOTTER_SAMPLE_RATE, convert_width=2)
+        for offset in range(0, len(data) - self.frame_bytes + 1, self.frame_bytes):
+            frame = data[offset:offset + self.frame_bytes]
+            if self.process(frame, frame_energy(frame) > energy_threshold):
+                rest = data[offset + self.frame_bytes:]
+                if len(rest) // self.frame_bytes * self.frame_ms < WAKE_WORD_CONFIG['min_command_ms']:
+                    return True, None
+                return True, sr.AudioData(rest, SPOTTER_SAMPLE_RATE, 2)
+            if self.throttling:
+                break
+        # End of the phrase
+        self.reset()
+        self.throttling = False
+        return False, None
+
+    def get_stats(self):
+        """Detections, frames decoded/throttled and CPU use as a share of one core"""
+        with self.lock:
+            elapsed = max(1e-6, time.monotonic() - self.started)
+            return {
+                'enabled': self.enabled,
+                'phrases': self.phrases,
+                'detections': self.detections,
+                'decoded_frames': self.decoded,
+                'throttled_frames': self.throttled,
+                'cpu_seconds': round(self.cpu_seconds, 2),
+                'cpu_share': self.cpu_seconds / elapsed,
+                'cpu_budget': self.cpu_budget,
+                'ms_per_frame': 1000.0 * self.cpu_seconds / self.decoded if self.decoded else 0.0
+            }
+
+    def format_stats(self):
+        """Short text line for overlay or console"""
+        stats = self.get_stats()
+        if not stats['enabled']:
+            return "wake word: off"
+        return (f"wake word: {stats['detections']} heard, cpu {stats['cpu_share']:.1%} "
+                f"(budget {stats['cpu_budget']:.0%}), {stats['ms_per_frame']:.1f}ms/frame, "
+                f"{stats['throttled_frames']} throttled")
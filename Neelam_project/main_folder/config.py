@@ -23,11 +23,32 @@ LEFT_IRIS_CENTER = 468
 RIGHT_IRIS_CENTER = 473
 
 # === Voice Recognition Settings ===
-VOICE_ENERGY_THRESHOLD = 4000
-VOICE_DYNAMIC_THRESHOLD = True
 VOICE_TIMEOUT = 1
 VOICE_PHRASE_TIME_LIMIT = 3
 VOICE_LANGUAGE = "en-IN"
+VOICE_COMMAND_PLUGINS = []  # modules with register_commands(registry) adding voice commands
+
+# === Speech-to-Text Backend ===
+SPEECH_BACKEND = "google"  # "google" (online), "vosk" or "sphinx" (offline)
+SPEECH_FALLBACK_BACKEND = "google"  # used when the configured backend cannot be loaded; None to fail
+TRANSCRIBER_WORKERS = 2  # phrases transcribed concurrently while capture keeps listening
+TRANSCRIBER_USE_PROCESSES = False  # run the speech backend in worker processes
+TRANSCRIBER_QUEUE = 4  # phrases waiting for a worker before the oldest is dropped
+VOSK_MODEL_PATH = os.path.join("models", "vosk-model-small-en-in-0.4")
+SPHINX_LANGUAGE = "en-US"
+
+# === Audio Stream Settings ===
+AUDIO_SAMPLE_RATE = 16000
+AUDIO_FRAME_MS = 30  # microphone read size (10, 20 or 30 for the VAD)
+AUDIO_PREROLL_SECONDS = 0.5  # audio kept from before speech starts
+AUDIO_PAUSE_SECONDS = 0.8  # silence that ends a phrase
+AUDIO_MIN_PHRASE_SECONDS = 0.3  # phrases with less detected speech are discarded
+AUDIO_NOISE_ADAPT_SECONDS = 2.0  # time constant of the rolling noise floor
+AUDIO_THRESHOLD_RATIO = 3.0  # speech threshold = noise floor * ratio
+AUDIO_MIN_ENERGY = 300  # lowest speech threshold in a silent room
+AUDIO_PHRASE_QUEUE = 4  # finished phrases waiting for recognition
+VAD_AGGRESSIVENESS = 2  # webrtcvad 0 (lenient) .. 3 (strict)
+VAD_PADDING_SECONDS = 0.3  # silence kept before and after the speech
 
 # === Verification System Settings ===
 MAX_VERIFICATION_ATTEMPTS = 3
@@ -43,6 +64,7 @@ IMAGES_DIRECTORY = "images"
 FONT = cv2.FONT_HERSHEY_SIMPLEX if 'cv2' in globals() else None
 FONT_SCALE = 0.8
 FONT_THICKNESS = 2
+OVERLAY_MAX_SPRITES = 256  # pre-rendered overlay text sprites kept in memory
 
 # === Colors (BGR format) ===
 COLOR_UNKNOWN = (0, 0, 255)  # Red
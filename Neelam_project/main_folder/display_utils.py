@@ -3,6 +3,7 @@ Display and UI utility functions
 """
 import cv2
 from config import *
+from overlay import OverlayCompositor
 
 class DisplayManager:
     def __init__(self):
@@ -10,6 +11,7 @@ class DisplayManager:
         self.font_scale = 0.8
         self.font_thickness = 2
         self.debug_mode = False
+        self.overlay = OverlayCompositor()
     
     def draw_face_rectangles(self, frame, detections, debug_mode=False):
         """Draw rectangles and labels around detected faces"""
@@ -34,7 +36,7 @@ class DisplayManager:
             
             face_found = True
             cv2.rectangle(frame, (left, top), (right, bottom), color, 2)
-            cv2.putText(frame, label, (left, top - 10), self.font, self.font_scale, color, self.font_thickness)
+            self.overlay.draw_text(frame, label, (left, top - 10), self.font_scale, color, self.font_thickness, self.font)
         
         return frame, face_found, unknown_detected, known_detected, unknown_face_img
     
@@ -57,7 +59,7 @@ class DisplayManager:
         else:
             return frame
         
-        cv2.putText(frame, message, (50, 50), self.font, 1, color, self.font_thickness)
+        self.overlay.draw_text(frame, message, (50, 50), 1, color, self.font_thickness, self.font)
         return frame
     
     def draw_microphone_status(self, frame, unknown_detected, verification_in_progress, 
@@ -75,15 +77,15 @@ class DisplayManager:
         else:
             return frame  # No message when not speaking
         
-        cv2.putText(frame, text, (10, frame.shape[0] - 50),
-                   self.font, 0.6, color, 2)
+        self.overlay.draw_text(frame, text, (10, frame.shape[0] - 50),
+                              0.6, color, 2, self.font)
         return frame
     
     def draw_voice_input(self, frame, voice_input):
         """Draw voice input text"""
         if voice_input:
-            cv2.putText(frame, voice_input, (10, frame.shape[0] - 20), 
-                       self.font, 0.6, COLOR_TEXT, 2)
+            self.overlay.draw_text(frame, voice_input, (10, frame.shape[0] - 20), 
+                                  0.6, COLOR_TEXT, 2, self.font)
         return frame
     
     def draw_debug_info(self, frame, verification_status):
@@ -91,16 +93,16 @@ class DisplayManager:
         if not self.debug_mode:
             return frame
         
-        cv2.putText(frame, f"Verification: {'YES' if verification_status['in_progress'] else 'NO'}", 
-                   (10, 120), self.font, 0.6, COLOR_INFO, 2)
-        cv2.putText(frame, f"Attempts: {verification_status['attempt_count']}/{verification_status['max_attempts']}", 
-                   (10, 140), self.font, 0.6, COLOR_INFO, 2)
+        self.overlay.draw_text(frame, f"Verification: {'YES' if verification_status['in_progress'] else 'NO'}", 
+                              (10, 120), 0.6, COLOR_INFO, 2, self.font)
+        self.overlay.draw_text(frame, f"Attempts: {verification_status['attempt_count']}/{verification_status['max_attempts']}", 
+                              (10, 140), 0.6, COLOR_INFO, 2, self.font)
         return frame
     
     def draw_help_text(self, frame):
         """Draw help text at bottom"""
-        cv2.putText(frame, "Press 'd' to toggle debug mode, 'r' to reset", 
-                   (10, frame.shape[0] - 80), self.font, 0.6, COLOR_WHITE, 2)
+        self.overlay.draw_text(frame, "Press 'd' to toggle debug mode, 'r' to reset", 
+                              (10, frame.shape[0] - 80), 0.6, COLOR_WHITE, 2, self.font)
         return frame
     
     def toggle_debug_mode(self):
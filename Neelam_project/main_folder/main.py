@@ -51,6 +51,14 @@ class FaceRecognitionApp:
         """Check if verification is in progress"""
         return self.verification_system.is_verification_in_progress()
     
+    def update_voice_state(self):
+        """Tell the voice thread whether it may listen (it wakes only on changes)"""
+        self.voice_recognizer.update_listening_state(
+            self.is_known_face_present() and
+            not self.is_unknown_detected() and
+            not self.is_verification_in_progress()
+        )
+    
     def reset_system(self):
         """Reset the entire system"""
         self.last_detections.clear()
@@ -191,11 +199,7 @@ class FaceRecognitionApp:
     def run(self):
         """Main application loop"""
         # Start voice recognition
-        self.voice_recognizer.start_listening(
-            self.is_known_face_present,
-            self.is_unknown_detected, 
-            self.is_verification_in_progress
-        )
+        self.voice_recognizer.start_listening()
         
         try:
             while True:
@@ -216,6 +220,9 @@ class FaceRecognitionApp:
                 # Handle no face timeout
                 self.handle_no_face_timeout()
                 
+                # Wake or pause the voice thread
+                self.update_voice_state()
+                
                 # Render UI
                 frame = self.render_frame(frame)
                 
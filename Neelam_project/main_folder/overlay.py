@@ -0,0 +1,88 @@
+"""
+Overlay compositor: text rendered once into cached sprites and blended onto frames in place
+"""
+
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+from config import OVERLAY_MAX_SPRITES
+
+
+class TextSprite:
+    """Pre-rendered text: premultiplied colour and inverse alpha, ready for blending"""
+
+    def __init__(self, text, font, font_scale, color, thickness):
+        (width, height), baseline = cv2.getTextSize(text, font, font_scale, thickness)
+        pad = thickness
+        self.width = width + 2 * pad
+        self.height = height + baseline + 2 * pad
+        # Offset from the putText origin (bottom-left of the text) to the sprite's top-left corner
+        self.offset_x = -pad
+        self.offset_y = -(height + pad)
+
+        mask = np.zeros((self.height, self.width), dtype=np.uint8)
+        cv2.putText(mask, text, (pad, height + pad), font, font_scale, 255, thickness, cv2.LINE_AA)
+        alpha = (mask.astype(np.float32) / 255.0)[:, :, None]
+
+        self.premultiplied = alpha * np.array(color, dtype=np.float32)
+        self.inverse_alpha = 1.0 - alpha
+
+    def blend(self, frame, x, y):
+        """Blend the sprite onto the frame with its putText origin at (x, y), clipped to the frame"""
+        top = y + self.offset_y
+        left = x + self.offset_x
+        frame_height, frame_width = frame.shape[:2]
+
+        # Clip the sprite to the frame
+        sprite_top = max(0, -top)
+        sprite_left = max(0, -left)
+        sprite_bottom = min(self.height, frame_height - top)
+        sprite_right = min(self.width, frame_width - left)
+        if sprite_top >= sprite_bottom or sprite_left >= sprite_right:
+            return
+
+        region = frame[top + sprite_top:top + sprite_bottom, left + sprite_left:left + sprite_right]
+        inverse_alpha = self.inverse_alpha[sprite_top:sprite_bottom, sprite_left:sprite_right]
+        premultiplied = self.premultiplied[sprite_top:sprite_bottom, sprite_left:sprite_right]
+        region[:] = (region * inverse_alpha + premultiplied).astype(np.uint8)
+
+
+class OverlayCompositor:
+    """
+    Caches one sprite per (text, font, scale, colour, thickness) and blends only the sprite
+    regions onto the frame. A sprite is rendered again only when its content or style changes.
+    """
+
+    def __init__(self, max_sprites=None):
+        self.max_sprites = max_sprites or OVERLAY_MAX_SPRITES
+        self.sprites = OrderedDict()  # least recently used first
+        self.hits = 0
+        self.renders = 0
+
+    def get_sprite(self, text, font, font_scale, color, thickness):
+        """Get the cached sprite for this text and style, rendering it on first use"""
+        key = (text, font, font_scale, tuple(color), thickness)
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.sprites.move_to_end(key)
+            self.hits += 1
+            return sprite
+
+        sprite = TextSprite(text, font, font_scale, color, thickness)
+        self.sprites[key] = sprite
+        self.renders += 1
+        if len(self.sprites) > self.max_sprites:
+            self.sprites.popitem(last=False)
+        return sprite
+
+    def draw_text(self, frame, text, origin, font_scale, color, thickness=2, font=cv2.FONT_HERSHEY_SIMPLEX):
+        """Drop-in replacement for cv2.putText (origin is the bottom-left of the text)"""
+        if not text:
+            return
+        sprite = self.get_sprite(text, font, font_scale, color, thickness)
+        sprite.blend(frame, int(origin[0]), int(origin[1]))
+
+    def get_stats(self):
+        """Get cache size, hits and renders"""
+        return {'sprites': len(self.sprites), 'hits': self.hits, 'renders': self.renders}
@@ -0,0 +1,82 @@
+"""
+Voice activity detection gate: only audio with real speech reaches the speech recognizer
+"""
+
+import threading
+
+from config import VAD_AGGRESSIVENESS
+
+try:
+    import webrtcvad
+except ImportError:
+    webrtcvad = None
+
+# webrtcvad accepts 16-bit mono PCM at these rates in 10, 20 or 30 ms frames
+VAD_SAMPLE_RATES = (8000, 16000, 32000, 48000)
+VAD_FRAME_MS = (10, 20, 30)
+
+
+class VoiceActivityGate:
+    """
+    Runs webrtcvad on each microphone frame. The audio stream treats a loud frame as speech only
+    if the VAD agrees, so door slams, clicks and chatter neither start a phrase on their own nor
+    keep one open, and phrases with too little speech are rejected before any recognizer call.
+    Without webrtcvad installed every frame counts as speech (energy-only segmentation).
+    """
+
+    def __init__(self, sample_rate, frame_ms, aggressiveness=None):
+        if sample_rate not in VAD_SAMPLE_RATES or frame_ms not in VAD_FRAME_MS:
+            raise ValueError(f"VAD needs 10/20/30 ms frames at 8/16/32/48 kHz, "
+                             f"got {frame_ms} ms at {sample_rate} Hz")
+        self.sample_rate = sample_rate
+        self.frame_seconds = frame_ms / 1000.0
+
+        self.vad = None
+        if webrtcvad is not None:
+            self.vad = webrtcvad.Vad(VAD_AGGRESSIVENESS if aggressiveness is None else aggressiveness)
+        else:
+            print("[WARN] webrtcvad not installed - voice activity gate disabled")
+
+        self.lock = threading.Lock()
+        self.accepted = 0
+        self.rejected = 0
+        self.trimmed_seconds = 0.0
+
+    @property
+    def enabled(self):
+        return self.vad is not None
+
+    def is_speech(self, frame):
+        """Check if one frame contains speech"""
+        if self.vad is None:
+            return True
+        return self.vad.is_speech(frame, self.sample_rate)
+
+    def record(self, accepted, trimmed_frames=0):
+        """Count a finished phrase as accepted (with the silence trimmed from it) or rejected"""
+        with self.lock:
+            if accepted:
+                self.accepted += 1
+                self.trimmed_seconds += trimmed_frames * self.frame_seconds
+            else:
+                self.rejected += 1
+
+    def get_stats(self):
+        """Accepted/rejected phrase counts and the acceptance rate"""
+        with self.lock:
+            total = self.accepted + self.rejected
+            return {
+                'enabled': self.enabled,
+                'accepted': self.accepted,
+                'rejected': self.rejected,
+                'accept_rate': self.accepted / total if total else 0.0,
+                'trimmed_seconds': round(self.trimmed_seconds, 1)
+            }
+
+    def format_stats(self):
+        """Short text line for overlay or console"""
+        stats = self.get_stats()
+        if not stats['enabled']:
+            return "vad: off"
+        return (f"vad: {stats['accepted']} accepted, {stats['rejected']} rejected "
+                f"({stats['accept_rate']:.0%}), {stats['trimmed_seconds']}s silence trimmed")
@@ -0,0 +1,200 @@
+"""
+Declarative voice command registry, compiled into a word-level Aho-Corasick automaton
+"""
+
+import importlib
+import re
+import threading
+import time
+from collections import deque
+
+SLOT_PATTERN = re.compile(r"^\{(\w+)\}$")
+TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+
+
+def tokenize(text):
+    """Lower-case words without punctuation"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class CommandMatch:
+    """A recognized command: its intent, the phrase that matched and the extracted slots"""
+
+    __slots__ = ('intent', 'phrase', 'text', 'slots', 'handler')
+
+    def __init__(self, intent, phrase, text, slots, handler):
+        self.intent = intent
+        self.phrase = phrase
+        self.text = text
+        self.slots = slots
+        self.handler = handler
+
+    def __repr__(self):
+        return f"CommandMatch({self.intent!r}, phrase={self.phrase!r}, slots={self.slots!r})"
+
+
+class CommandRegistry:
+    """
+    Commands are registered as an intent, its phrases and a handler(match). A phrase is a word
+    sequence that may end in a slot, e.g. "send message to {contact}": the words after the literal
+    part fill the slot. All phrases are compiled into one Aho-Corasick automaton over words, so
+    match() finds every phrase of every command in a single pass over the transcript, however
+    many commands are registered.
+    When several commands match, the one registered first wins (like an if/elif chain); within
+    one command the longest phrase wins, and between phrases of equal length one whose slot
+    gets filled wins ("notify nikhil" fills {contact} rather than matching plain "notify").
+    Plugin modules add commands through a register_commands(registry) function.
+    """
+
+    def __init__(self):
+        self.commands = []  # (intent, handler), in registration order
+        self.patterns = []  # (command index, literal words, slot name or None)
+        self.automaton = None  # built lazily, dropped whenever a command is added
+        self.lock = threading.Lock()
+
+        # Statistics
+        self.matched = 0
+        self.unmatched = 0
+        self.total_seconds = 0.0
+
+    def register(self, intent, phrases, handler):
+        """Add a command; phrases is a string or a list of them"""
+        if isinstance(phrases, str):
+            phrases = [phrases]
+
+        patterns = []
+        for phrase in phrases:
+            words = phrase.lower().split()
+            slot = None
+            if words:
+                slot_match = SLOT_PATTERN.match(words[-1])
+                if slot_match:
+                    slot = slot_match.group(1)
+                    words = words[:-1]
+            literal = tuple(tokenize(" ".join(words)))
+            if not literal:
+                raise ValueError(f"Command '{intent}' phrase '{phrase}' has no words to match")
+            if any(SLOT_PATTERN.match(word) for word in words):
+                raise ValueError(f"Command '{intent}' phrase '{phrase}': a slot must be the last word")
+            patterns.append((literal, slot))
+
+        with self.lock:
+            index = len(self.commands)
+            self.commands.append((intent, handler))
+            self.patterns.extend((index, literal, slot) for literal, slot in patterns)
+            self.automaton = None
+
+    def command(self, intent, *phrases):
+        """Decorator form of register(), for plugin modules"""
+        def decorator(handler):
+            self.register(intent, list(phrases), handler)
+            return handler
+        return decorator
+
+    def load_plugins(self, module_names):
+        """Import each plugin module and let it register its commands"""
+        for name in module_names:
+            try:
+                module = importlib.import_module(name)
+                module.register_commands(self)
+                print(f"[INFO] Loaded command plugin '{name}'")
+            except Exception as e:
+                print(f"[ERROR] Command plugin '{name}' failed to load: {e}")
+
+    def _compile(self):
+        # Trie of the literal words: goto[node][word] -> node, out[node] -> pattern indexes
+        goto = [{}]
+        out = [[]]
+        for pattern_index, (_, literal, _) in enumerate(self.patterns):
+            node = 0
+            for word in literal:
+                child = goto[node].get(word)
+                if child is None:
+                    child = len(goto)
+                    goto[node][word] = child
+                    goto.append({})
+                    out.append([])
+                node = child
+            out[node].append(pattern_index)
+
+        # Failure links, breadth first: the longest proper suffix that is also a trie path
+        fail = [0] * len(goto)
+        pending = deque(goto[0].values())
+        while pending:
+            node = pending.popleft()
+            for word, child in goto[node].items():
+                pending.append(child)
+                state = fail[node]
+                while state and word not in goto[state]:
+                    state = fail[state]
+                fail[child] = goto[state].get(word, 0)
+                out[child] = out[child] + out[fail[child]]
+        return goto, fail, out
+
+    def match(self, text):
+        """Best CommandMatch for a transcript, or None"""
+        start = time.perf_counter()
+        with self.lock:
+            if self.automaton is None:
+                self.automaton = self._compile()
+            goto, fail, out = self.automaton
+            commands, patterns = self.commands, self.patterns
+
+        words = tokenize(text)
+        best = None
+        node = 0
+        for position, word in enumerate(words):
+            while node and word not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(word, 0)
+            for pattern_index in out[node]:
+                command_index, literal, slot = patterns[pattern_index]
+                # On a tie, a slot phrase that has words to capture beats the bare phrase
+                fills_slot = slot is not None and position + 1 < len(words)
+                key = (command_index, -len(literal), not fills_slot, position)
+                if best is None or key < best[0]:
+                    best = (key, pattern_index, position)
+
+        result = None
+        if best is not None:
+            _, pattern_index, end = best
+            command_index, literal, slot = patterns[pattern_index]
+            intent, handler = commands[command_index]
+            slots = {}
+            if slot is not None and end + 1 < len(words):
+                slots[slot] = " ".join(words[end + 1:])
+            result = CommandMatch(intent, " ".join(literal), text, slots, handler)
+
+        with self.lock:
+            self.total_seconds += time.perf_counter() - start
+            if result is not None:
+                self.matched += 1
+            else:
+                self.unmatched += 1
+        return result
+
+    def dispatch(self, text, fallback):
+        """Run the matching command's handler, or fallback(text) when nothing matches"""
+        match = self.match(text)
+        if match is None:
+            return fallback(text)
+        print(f"[VOICE] Command: {match.intent}")
+        return match.handler(match)
+
+    def get_stats(self):
+        """Registered commands and phrases, match counts and average match time"""
+        with self.lock:
+            total = self.matched + self.unmatched
+            return {
+                'commands': len(self.commands),
+                'phrases': len(self.patterns),
+                'matched': self.matched,
+                'unmatched': self.unmatched,
+                'avg_us': 1e6 * self.total_seconds / total if total else 0.0
+            }
+
+    def format_stats(self):
+        """Short text line for overlay or console"""
+        stats = self.get_stats()
+        return (f"commands: {stats['commands']} ({stats['phrases']} phrases), {stats['matched']} matched, "
+                f"{stats['unmatched']} unmatched, {stats['avg_us']:.0f}us")
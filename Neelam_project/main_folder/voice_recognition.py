@@ -1,100 +1,118 @@
 """
 Voice recognition and command processing module
 """
-import speech_recognition as sr
 import webbrowser
 import time
 import threading
 from config import *
+from audio_stream import AudioStream
+from speech_backends import create_backend
+from transcriber import Transcriber
+from voice_commands import CommandRegistry
 
 class VoiceRecognizer:
     def __init__(self):
-        self.recognizer = sr.Recognizer()
-        self.recognizer.energy_threshold = VOICE_ENERGY_THRESHOLD
-        self.recognizer.dynamic_energy_threshold = VOICE_DYNAMIC_THRESHOLD
+        self.backend = create_backend()
+        # Transcribes on its own workers so the listener never stops taking phrases
+        self.transcriber = Transcriber(self.backend, self.on_transcript)
+        # One microphone stream for the app's lifetime; it tracks the noise floor itself
+        self.audio_stream = AudioStream(phrase_time_limit=VOICE_PHRASE_TIME_LIMIT)
         self.last_voice_input = ""
         self.is_listening = False
         self.listener_thread = None
         self.running = False
+        # Set by update_listening_state; the listener thread sleeps on the condition while it is False
+        self.listen_allowed = False
+        self.listen_condition = threading.Condition()
+        # Commands are matched in one pass over the transcript; plugins can add more
+        self.command_registry = CommandRegistry()
+        self.register_commands()
+        self.command_registry.load_plugins(VOICE_COMMAND_PLUGINS)
+    
+    def register_commands(self):
+        """Built-in voice commands"""
+        self.command_registry.register("open_google", ["google", "open google"], self.open_google)
+        self.command_registry.register("tell_time", ["time", "what time is it"], self.tell_time)
     
     def process_voice_command(self, word):
         """Process recognized voice commands"""
-        word_lower = word.lower()
-        
-        if "google" in word_lower:
-            webbrowser.open("https://www.google.com")
-            return f"Opening Google... You said: {word}"
-        elif "time" in word_lower:
-            current_time = time.strftime('%I:%M %p')
-            print(f"[TIME] {current_time}")
-            return f"Current time: {current_time}"
-        else:
-            return f"You said: {word}"
+        return self.command_registry.dispatch(word, lambda text: f"You said: {text}")
+    
+    def open_google(self, match):
+        webbrowser.open("https://www.google.com")
+        return f"Opening Google... You said: {match.text}"
+    
+    def tell_time(self, match):
+        current_time = time.strftime('%I:%M %p')
+        print(f"[TIME] {current_time}")
+        return f"Current time: {current_time}"
+    
+    def update_listening_state(self, allowed):
+        """Allow or stop listening; wakes the listener thread immediately on a transition"""
+        with self.listen_condition:
+            if allowed == self.listen_allowed:
+                return
+            self.listen_allowed = allowed
+            self.audio_stream.set_active(allowed)
+            self.listen_condition.notify_all()
+        if not allowed:
+            # Phrases already handed to the transcriber must not run once access is withdrawn
+            self.transcriber.clear()
     
-    def listen_for_commands(self, is_known_face_present_func, is_unknown_detected_func, is_verification_in_progress_func):
+    def wait_until_allowed(self):
+        """Block without polling until listening is allowed or the thread is stopped"""
+        with self.listen_condition:
+            self.listen_condition.wait_for(lambda: self.listen_allowed or not self.running)
+            return self.running
+    
+    def listen_for_commands(self):
         """Continuous voice listening in background thread"""
-        while self.running:
-            try:
-                if (is_known_face_present_func() and 
-                    not is_unknown_detected_func() and 
-                    not is_verification_in_progress_func()):
-                    
-                    with sr.Microphone() as source:
-                        self.recognizer.adjust_for_ambient_noise(source, duration=1)
-                        
-                        while (self.running and 
-                               is_known_face_present_func() and 
-                               not is_unknown_detected_func() and 
-                               not is_verification_in_progress_func()):
-                            try:
-                                # Start listening
-                                self.is_listening = True
-                                audio = self.recognizer.listen(source, 
-                                                             timeout=VOICE_TIMEOUT, 
-                                                             phrase_time_limit=VOICE_PHRASE_TIME_LIMIT)
-                                
-                                word = self.recognizer.recognize_google(audio, language=VOICE_LANGUAGE)
-                                print(f"[WORD] {word}")
-                                self.last_voice_input = self.process_voice_command(word)
-                                
-                            except sr.WaitTimeoutError:
-                                # No speech detected
-                                self.is_listening = False
-                                continue
-                            except Exception as e:
-                                self.is_listening = False
-                                continue
-                    
-                    self.is_listening = False
-                else:
-                    self.is_listening = False
-                    time.sleep(0.5)
-            except:
-                self.is_listening = False
-                time.sleep(0.5)
+        while self.wait_until_allowed():
+            # The stream is already open and calibrated: phrases arrive as soon as listening is allowed
+            self.is_listening = True
+            while self.running and self.listen_allowed:
+                audio = self.audio_stream.get_phrase(timeout=VOICE_TIMEOUT)
+                if audio is None:
+                    # No speech detected
+                    continue
+                self.transcriber.submit(audio)
+            
+            self.is_listening = False
+    
+    def on_transcript(self, seq, word, error):
+        """Transcriber callback, called in the order the phrases were spoken"""
+        if error is not None or not self.listen_allowed:
+            return
+        print(f"[WORD] {word}")
+        self.last_voice_input = self.process_voice_command(word)
     
-    def start_listening(self, is_known_face_present_func, is_unknown_detected_func, is_verification_in_progress_func):
+    def start_listening(self):
         """Start the voice recognition thread"""
         if not self.running:
+            self.audio_stream.start()
+            self.transcriber.start()
             self.running = True
-            self.listener_thread = threading.Thread(
-                target=self.listen_for_commands,
-                args=(is_known_face_present_func, is_unknown_detected_func, is_verification_in_progress_func),
-                daemon=True
-            )
+            self.listener_thread = threading.Thread(target=self.listen_for_commands, daemon=True)
             self.listener_thread.start()
     
     def stop_listening(self):
         """Stop the voice recognition thread"""
-        self.running = False
+        with self.listen_condition:
+            self.running = False
+            self.listen_condition.notify_all()
         if self.listener_thread:
             self.listener_thread.join(timeout=1)
+        self.audio_stream.stop()
+        self.transcriber.stop()
+        print(f"[VOICE] {self.audio_stream.vad_gate.format_stats()}")
+        print(f"[VOICE] {self.transcriber.format_stats()}")
     
     def get_voice_status(self):
         """Get current voice recognition status"""
         return {
             'last_input': self.last_voice_input,
-            'is_listening': self.is_listening
+            'is_listening': self.is_listening,
+            'vad': self.audio_stream.vad_gate.get_stats()
         }
     
     def clear_voice_input(self):
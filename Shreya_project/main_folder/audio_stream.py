@@ -0,0 +1,247 @@
+"""
+Persistent microphone stream: one long-lived input, rolling noise floor and phrase segmentation
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import speech_recognition as sr
+from config import (AUDIO_SAMPLE_RATE, AUDIO_FRAME_MS, AUDIO_PREROLL_SECONDS, AUDIO_PAUSE_SECONDS,
+                    AUDIO_MIN_PHRASE_SECONDS, AUDIO_NOISE_ADAPT_SECONDS, AUDIO_THRESHOLD_RATIO,
+                    AUDIO_MIN_ENERGY, AUDIO_PHRASE_QUEUE, VAD_PADDING_SECONDS, WAKE_WORD_WINDOW_SECONDS)
+from voice_activity import VoiceActivityGate
+
+WAKE_UP = object()  # queued by set_active(False) to release a waiting get_phrase()
+
+
+def frame_energy(data):
+    """RMS energy of 16-bit PCM bytes (same scale as Recognizer.energy_threshold)"""
+    samples = np.frombuffer(data, dtype=np.int16).astype(np.float32)
+    if samples.size == 0:
+        return 0.0
+    return float(np.sqrt(np.mean(samples * samples)))
+
+
+class AudioStream:
+    """
+    Opens the microphone once and reads it on a capture thread for the lifetime of the app.
+    Every frame updates a rolling noise floor, and the speech threshold follows it, so there is
+    no calibration pause when listening resumes. While active, frames above the threshold start
+    a phrase (including the pre-roll ring buffer) that ends after a pause. The VAD gate decides
+    which loud frames are speech; phrases without enough of it are dropped, the rest are trimmed
+    to the speech plus padding and queued as sr.AudioData for recognition.
+    With a wake word spotter, active frames go to the spotter first and a phrase is only started
+    within WAKE_WORD_WINDOW_SECONDS of a detection, so one phrase per wake word reaches STT.
+    While inactive, audio only feeds the noise floor.
+    """
+
+    def __init__(self, phrase_time_limit=None, wake_word=None):
+        self.sample_rate = AUDIO_SAMPLE_RATE
+        self.frame_samples = AUDIO_SAMPLE_RATE * AUDIO_FRAME_MS // 1000
+        self.frame_seconds = AUDIO_FRAME_MS / 1000.0
+        self.sample_width = 2  # paInt16
+        self.phrase_time_limit = phrase_time_limit
+        self.vad_gate = VoiceActivityGate(AUDIO_SAMPLE_RATE, AUDIO_FRAME_MS)
+        self.min_speech_frames = max(1, int(AUDIO_MIN_PHRASE_SECONDS / self.frame_seconds))
+        self.padding_frames = int(VAD_PADDING_SECONDS / self.frame_seconds)
+        self.wake_word = wake_word
+        self.wake_deadline = 0.0  # phrases may start until then
+
+        self.preroll = deque(maxlen=max(1, int(AUDIO_PREROLL_SECONDS / self.frame_seconds)))
+        self.phrases = queue.Queue(maxsize=AUDIO_PHRASE_QUEUE)
+        self.noise_floor = None
+        self.active = False
+        self.lock = threading.Lock()
+
+        self.microphone = None
+        self.thread = None
+        self.running = False
+
+        # Statistics
+        self.phrase_count = 0
+        self.dropped = 0
+
+    # === Control ===
+
+    def start(self):
+        """Open the microphone and start the capture thread; returns False if there is no microphone"""
+        if self.running:
+            return True
+        try:
+            self.microphone = sr.Microphone(sample_rate=self.sample_rate, chunk_size=self.frame_samples)
+            self.microphone.__enter__()
+        except Exception as e:
+            print(f"Could not open microphone: {e}")
+            self.microphone = None
+            return False
+        self.sample_width = self.microphone.SAMPLE_WIDTH
+        self.running = True
+        self.thread = threading.Thread(target=self._capture_loop, name="audio-capture", daemon=True)
+        self.thread.start()
+        print("Microphone stream opened")
+        return True
+
+    def stop(self):
+        """Stop the capture thread and close the microphone"""
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=1)
+            self.thread = None
+        if self.microphone is not None:
+            try:
+                self.microphone.__exit__(None, None, None)
+            except Exception as e:
+                print(f"Closing microphone failed: {e}")
+            self.microphone = None
+
+    def set_active(self, active):
+        """
+        Start or stop handing out phrases; deactivating drops the unfinished and queued ones and
+        wakes a get_phrase() that is waiting, so the thread blocked in it is free at once
+        """
+        with self.lock:
+            self.active = active
+            self.wake_deadline = 0.0
+            self._clear_phrases()
+            if not active:
+                self.phrases.put_nowait(WAKE_UP)
+
+    def get_phrase(self, timeout=None):
+        """Next finished phrase as sr.AudioData, or None after timeout or when listening stops"""
+        try:
+            audio = self.phrases.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        return None if audio is WAKE_UP else audio
+
+    @property
+    def energy_threshold(self):
+        """Current speech threshold derived from the noise floor"""
+        if self.noise_floor is None:
+            return AUDIO_MIN_ENERGY
+        return max(AUDIO_MIN_ENERGY, self.noise_floor * AUDIO_THRESHOLD_RATIO)
+
+    # === Capture thread ===
+
+    def _capture_loop(self):
+        stream = self.microphone.stream
+        pause_frames = max(1, int(AUDIO_PAUSE_SECONDS / self.frame_seconds))
+        phrase = None
+        speech_flags = None
+        silent = 0
+
+        while self.running:
+            try:
+                data = stream.read(self.frame_samples)
+            except Exception as e:
+                print(f"Microphone read failed: {e}")
+                time.sleep(0.1)
+                continue
+
+            energy = frame_energy(data)
+            is_loud = energy > self.energy_threshold
+
+            with self.lock:
+                active = self.active
+            if not active:
+                phrase = None
+
+            if active and self.wake_word is not None and self.wake_word.process(data, is_loud):
+                # Drop the wake phrase itself; whatever follows it is the command
+                print("Wake word detected")
+                self.wake_deadline = time.monotonic() + WAKE_WORD_WINDOW_SECONDS
+                self.preroll.clear()
+                phrase = None
+                continue
+
+            if phrase is None:
+                # Non-speech audio feeds the noise floor; while inactive everything does,
+                # so a lasting change in background noise (a fan, traffic) is learned
+                if not is_loud or not active:
+                    self._update_noise_floor(energy)
+                self.preroll.append(data)
+                if active and is_loud and self._awake() and self.vad_gate.is_speech(data):
+                    phrase = list(self.preroll)
+                    speech_flags = [False] * (len(phrase) - 1) + [True]
+                    self.preroll.clear()
+                    silent = 0
+                continue
+
+            # Loud noise the VAD rejects counts as silence, so it cannot hold a phrase open
+            is_speech = is_loud and self.vad_gate.is_speech(data)
+            phrase.append(data)
+            speech_flags.append(is_speech)
+            silent = 0 if is_speech else silent + 1
+
+            too_long = (self.phrase_time_limit is not None and
+                        len(phrase) * self.frame_seconds >= self.phrase_time_limit)
+            if silent >= pause_frames or too_long:
+                self._finish_phrase(phrase, speech_flags)
+                phrase = None
+
+    def _finish_phrase(self, phrase, speech_flags):
+        if sum(speech_flags) < self.min_speech_frames:
+            self.vad_gate.record(False)
+            return
+
+        # Trim leading and trailing silence, keeping some padding around the speech
+        first = speech_flags.index(True)
+        last = len(speech_flags) - 1 - speech_flags[::-1].index(True)
+        start = max(0, first - self.padding_frames)
+        end = min(len(phrase), last + 1 + self.padding_frames)
+        self.vad_gate.record(True, len(phrase) - (end - start))
+        # One command per wake word
+        self.wake_deadline = 0.0
+        self._emit(b"".join(phrase[start:end]))
+
+    def _awake(self):
+        """Whether a phrase may start: always without a wake word, else shortly after one"""
+        if self.wake_word is None or not self.wake_word.enabled:
+            return True
+        return time.monotonic() < self.wake_deadline
+
+    def _update_noise_floor(self, energy):
+        if self.noise_floor is None:
+            self.noise_floor = energy
+            return
+        # Exponential moving average; falls quickly and rises slowly so speech does not raise it
+        alpha = self.frame_seconds / AUDIO_NOISE_ADAPT_SECONDS
+        if energy < self.noise_floor:
+            alpha = min(1.0, alpha * 4)
+        self.noise_floor += (energy - self.noise_floor) * alpha
+
+    def _emit(self, data):
+        audio = sr.AudioData(data, self.sample_rate, self.sample_width)
+        with self.lock:
+            if not self.active:
+                return
+            if self.phrases.full():
+                # Recognition is behind: the oldest phrase is dropped
+                try:
+                    self.phrases.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+            self.phrases.put_nowait(audio)
+            self.phrase_count += 1
+
+    def _clear_phrases(self):
+        while True:
+            try:
+                self.phrases.get_nowait()
+            except queue.Empty:
+                break
+
+    def get_stats(self):
+        """Noise floor, threshold, phrase counts, VAD accept/reject counts and wake word spotting"""
+        return {
+            'noise_floor': round(self.noise_floor or 0.0, 1),
+            'energy_threshold': round(self.energy_threshold, 1),
+            'phrases': self.phrase_count,
+            'dropped': self.dropped,
+            'vad': self.vad_gate.get_stats(),
+            'wake_word': self.wake_word.get_stats() if self.wake_word is not None else None
+        }
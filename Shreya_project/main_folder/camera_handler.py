@@ -1,5 +1,6 @@
 import cv2
 import imutils
+from overlay import OverlayCompositor
 
 class CameraHandler:
     def __init__(self, camera_index=0, width=1280, height=720, fps=30):
@@ -8,6 +9,7 @@ class CameraHandler:
         self.width = width
         self.height = height
         self.fps = fps
+        self.overlay = OverlayCompositor()
         
     def initialize_camera(self):
         """Initialize camera with optimal settings"""
@@ -73,31 +75,26 @@ class CameraHandler:
         cv2.resizeWindow(window_name, width, height)
     
     def display_frame_with_status(self, frame, status_info, window_name="Smart Camera"):
-        """Display frame with status overlay"""
-        display_frame = frame.copy()
+        """Display frame with status overlay (drawn in place: the display frame is not reused)"""
+        display_frame = frame
         
         # Status display
         status = status_info.get('status', 'Unknown')
         color = status_info.get('color', (255, 255, 255))
         
-        cv2.putText(display_frame, status, (20, 40), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.8, color, 2)
+        self.overlay.draw_text(display_frame, status, (20, 40), 0.8, color, 2)
         
         # Additional info
         if status_info.get('gaze_detected'):
-            cv2.putText(display_frame, "Gaze: CENTER", (20, 80), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+            self.overlay.draw_text(display_frame, "Gaze: CENTER", (20, 80), 0.6, (0, 255, 0), 2)
         
         if status_info.get('continuous_listening'):
-            cv2.putText(display_frame, "🎤 LISTENING CONTINUOUSLY", (20, 120), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+            self.overlay.draw_text(display_frame, "🎤 LISTENING CONTINUOUSLY", (20, 120), 0.6, (0, 255, 0), 2)
         elif status_info.get('listening_for_command'):
-            cv2.putText(display_frame, "Listening for command...", (20, 120), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 0, 255), 2)
+            self.overlay.draw_text(display_frame, "Listening for command...", (20, 120), 0.6, (255, 0, 255), 2)
         
-        cv2.putText(display_frame, "Press 'q' to quit | Say 'stop listening' to pause", 
-                   (20, display_frame.shape[0] - 20), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        self.overlay.draw_text(display_frame, "Press 'q' to quit | Say 'stop listening' to pause", 
+                              (20, display_frame.shape[0] - 20), 0.5, (255, 255, 255), 1)
         
         cv2.imshow(window_name, display_frame)
     
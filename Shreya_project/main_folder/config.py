@@ -7,6 +7,8 @@ MANAGER_IMAGE_PATH = "Shreya.jpg"
 # System Timing Settings
 NO_PERSON_TIMEOUT = 10  # seconds before reset if no person detected
 RECOGNITION_RESET_DELAY = 3  # seconds before allowing retry after failed recognition
+SPEECH_DRAIN_TIMEOUT = 5  # seconds queued speech may take to finish on shutdown
+TTS_MAX_AGE = 10  # seconds a queued prompt stays worth saying
 
 # Camera Settings
 CAMERA_INDEX = 0
@@ -14,6 +16,7 @@ CAMERA_WIDTH = 1280
 CAMERA_HEIGHT = 720
 CAMERA_FPS = 30
 DISPLAY_WIDTH = 800  # Width for display frame (processing optimization)
+DISPLAY_FPS = 15  # preview refresh rate, independent of the processing rate
 
 # Processing Frame Size (for faster processing)
 PROCESSING_WIDTH = 640
@@ -26,11 +29,46 @@ GAZE_CENTER_MIN = 0.4
 GAZE_CENTER_MAX = 0.6
 
 # Voice Recognition Settings
-AMBIENT_NOISE_DURATION = 0.3
 VOICE_TIMEOUT = 1  # seconds to wait for voice input
 PHRASE_TIME_LIMIT = 5  # maximum seconds for a single phrase
+COMMAND_PLUGINS = []  # modules with register_commands(registry) adding voice commands
+
+# Speech-to-Text Backend
+SPEECH_BACKEND = "google"  # "google" (online), "vosk" or "sphinx" (offline)
+SPEECH_FALLBACK_BACKEND = "google"  # used when the configured backend cannot be loaded; None to fail
+SPEECH_LANGUAGE = "en-US"  # language for the Google backend
+TRANSCRIBER_WORKERS = 2  # phrases transcribed concurrently while capture keeps listening
+TRANSCRIBER_USE_PROCESSES = False  # run the speech backend in worker processes
+TRANSCRIBER_QUEUE = 4  # phrases waiting for a worker before the oldest is dropped
+VOSK_MODEL_PATH = "models/vosk-model-small-en-us-0.15"
+SPHINX_LANGUAGE = "en-US"
+
+# Audio Stream Settings (one microphone stream stays open for the whole run)
+AUDIO_SAMPLE_RATE = 16000
+AUDIO_FRAME_MS = 30  # microphone read size (10, 20 or 30 for the VAD)
+AUDIO_PREROLL_SECONDS = 0.5  # audio kept from before speech starts
+AUDIO_PAUSE_SECONDS = 0.8  # silence that ends a phrase
+AUDIO_MIN_PHRASE_SECONDS = 0.3  # phrases with less detected speech are discarded
+AUDIO_NOISE_ADAPT_SECONDS = 2.0  # time constant of the rolling noise floor
+AUDIO_THRESHOLD_RATIO = 3.0  # speech threshold = noise floor * ratio
+AUDIO_MIN_ENERGY = 300  # lowest speech threshold in a silent room
+AUDIO_PHRASE_QUEUE = 4  # finished phrases waiting for recognition
+VAD_AGGRESSIVENESS = 2  # webrtcvad 0 (lenient) .. 3 (strict)
+VAD_PADDING_SECONDS = 0.3  # silence kept before and after the speech
+
+# Wake Word Settings (needs vosk and VOSK_MODEL_PATH; without them every phrase is transcribed)
+WAKE_WORD_ENABLED = True
+WAKE_WORD_PHRASES = ["hey camera"]  # lower-case, words must be in the Vosk model's vocabulary
+WAKE_WORD_WINDOW_SECONDS = 5  # the command must start this soon after the wake word
+WAKE_WORD_HANGOVER_SECONDS = 0.3  # quiet audio still fed to the spotter after speech
+WAKE_WORD_CPU_BUDGET = 0.15  # share of one core the spotter may use
+WAKE_WORD_BUDGET_WINDOW_SECONDS = 5
 WHATSAPP_WAIT_TIME = 15  # seconds to wait before closing WhatsApp tab
 
+# Voice Command Actions (side effects run off the command task)
+ACTION_TIMEOUT = 30  # seconds before an action is reported as taking too long
+ACTION_MAX_PENDING = 3  # actions waiting or running before new commands are refused
+
 # MediaPipe Settings
 MIN_DETECTION_CONFIDENCE = 0.7
 MIN_TRACKING_CONFIDENCE = 0.7
@@ -39,6 +77,33 @@ REFINE_LANDMARKS = True
 
 # File Paths
 CONTACTS_FILE = "contacts.json"
+CONTACT_MATCH_THRESHOLD = 0.8  # lowest score at which a spoken name picks a contact
+CONTACT_MATCH_MARGIN = 0.1  # lead the best contact needs over the runner-up
+CONTACT_CANDIDATES = 3  # closest contacts suggested when a name is not found
+
+# Speech Output Settings (fixed prompts are rendered to WAV once and played back directly)
+TTS_CACHE_DIR = "tts_cache"
+TTS_CACHED_PROMPTS = [
+    "System ready. Looking for manager...",
+    "Manager verified. Ready for commands.",
+    "Access denied. You are not authorized.",
+    "Voice commands now active. I'm listening continuously.",
+    "Voice commands paused",
+    "Command not recognized. Try 'send message', 'reset', or 'quit'",
+    "Still sending earlier messages, please try again shortly",
+    "Please specify who to send the message to.",
+    "Contact not found. Please check the name.",
+    "Failed to send message due to an error.",
+    "System reset",
+    "System reset due to no person detected",
+    "Shutting down system",
+    "System shutdown",
+]
+# Prompts with a small set of fillers: a list of values, or a JSON file whose keys are the values
+TTS_PROMPT_TEMPLATES = {
+    "Voice commands now active. Say {phrase} before a command.": {"phrase": WAKE_WORD_PHRASES},
+    "Message sent to {contact}": {"contact": CONTACTS_FILE},
+}
 
 # Display Colors (BGR format for OpenCV)
 COLOR_GREEN = (0, 255, 0)
@@ -54,6 +119,7 @@ COLOR_MAGENTA = (255, 0, 255)
 WINDOW_NAME = "Smart Camera"
 WINDOW_WIDTH = 1200
 WINDOW_HEIGHT = 900
+OVERLAY_MAX_SPRITES = 256  # pre-rendered overlay text sprites kept in memory
 
 # Counter Thresholds
 MAX_NO_FACE_COUNTER = 150  # frames without face before reset
\ No newline at end of file
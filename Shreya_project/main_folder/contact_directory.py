@@ -0,0 +1,204 @@
+"""
+Contact directory: contacts.json loaded once, reloaded when the file changes, and indexed for spoken names
+"""
+
+import json
+import os
+import re
+import threading
+import unicodedata
+from difflib import SequenceMatcher
+
+from config import CONTACT_CANDIDATES, CONTACT_MATCH_MARGIN, CONTACT_MATCH_THRESHOLD
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+PREFIX_LENGTH = 3
+
+SOUNDEX_CODES = {}
+for letters, code in (("bfpv", "1"), ("cgjkqsxz", "2"), ("dt", "3"), ("l", "4"), ("mn", "5"), ("r", "6")):
+    for letter in letters:
+        SOUNDEX_CODES[letter] = code
+
+# Spellings that sound alike, rewritten before the metaphone-style key is built
+PHONETIC_RULES = [
+    (re.compile(r"ph"), "f"), (re.compile(r"[ck]h"), "k"), (re.compile(r"gh"), "g"),
+    (re.compile(r"sh|sch"), "x"), (re.compile(r"th"), "t"), (re.compile(r"ck|q"), "k"),
+    (re.compile(r"c(?=[eiy])"), "s"), (re.compile(r"c"), "k"), (re.compile(r"z"), "s"),
+    (re.compile(r"w"), "v"), (re.compile(r"([a-z])h"), r"\1"), (re.compile(r"(.)\1+"), r"\1"),
+]
+
+
+def normalize(name):
+    """Lower-case ASCII words: "  Nikhíl_Sharma " -> "nikhil sharma" """
+    text = unicodedata.normalize("NFKD", name)
+    text = "".join(char for char in text if not unicodedata.combining(char)).lower()
+    return " ".join(TOKEN_PATTERN.findall(text))
+
+
+def soundex(word):
+    """Classic four-character Soundex code: "nikil" and "nikhil" -> N240"""
+    if not word:
+        return ""
+    code = word[0].upper()
+    previous = SOUNDEX_CODES.get(word[0], "")
+    for letter in word[1:]:
+        digit = SOUNDEX_CODES.get(letter, "")
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        if letter not in "hw":
+            previous = digit
+    return code.ljust(4, "0")
+
+
+def phonetic_key(word):
+    """Metaphone-style key: the first letter, then consonants with alike spellings merged"""
+    if not word:
+        return ""
+    for pattern, replacement in PHONETIC_RULES:
+        word = pattern.sub(replacement, word)
+    return word[0] + re.sub(r"[aeiouy]", "", word[1:])
+
+
+class ContactDirectory:
+    """
+    The contacts file is parsed once and reloaded only when its modification time or size changes,
+    so a command costs one os.stat() instead of a read and a parse.
+    Each contact name is indexed by its normalized form, its words, the first letters of its words
+    and two phonetic keys per word (Soundex and a metaphone-style key). A spoken name is resolved
+    with a few dictionary lookups per word, so a misheard "nikil" finds "nikhil" without scanning
+    the directory, and only the contacts those lookups return are scored. Each of the contact's
+    words scores 1 for an exact match, its spelling similarity (0 to 1) when it sounds alike or one
+    word starts with the other, else 0. The contact's score is its best word's score, scaled by
+    0.8 + 0.2 x the average over all its words, so "nikhil" alone still finds "Nikhil Sharma".
+    find() only picks a contact scoring CONTACT_MATCH_THRESHOLD that leads the runner-up by
+    CONTACT_MATCH_MARGIN, because the result decides who receives a real message.
+    """
+
+    def __init__(self, contacts_file):
+        self.contacts_file = contacts_file
+        self.lock = threading.Lock()
+        self.signature = None
+        self.contacts = None
+        self.by_name = {}  # normalized name -> contact name
+        self.by_word = {}  # word -> contact names
+        self.by_prefix = {}
+        self.by_sound = {}  # Soundex code or phonetic key -> contact names
+        self.words = {}  # contact name -> its (word, Soundex code, phonetic key)
+
+        # Statistics
+        self.loads = 0
+        self.lookups = 0
+        self.misses = 0
+
+    def load(self):
+        """Contacts dict (name -> number), reloaded if the file changed; None if missing or invalid"""
+        try:
+            stat = os.stat(self.contacts_file)
+        except FileNotFoundError:
+            print("Contacts file not found.")
+            return None
+
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self.lock:
+            if signature == self.signature:
+                return self.contacts
+            try:
+                with open(self.contacts_file, "r") as file:
+                    contacts = json.load(file)
+            except json.JSONDecodeError:
+                print("Contacts file format error.")
+                return None
+            except Exception as e:
+                print(f"Error loading contacts: {e}")
+                return None
+            self._index(contacts)
+            self.signature = signature
+            self.loads += 1
+            return self.contacts
+
+    def _index(self, contacts):
+        # Called with the lock held
+        self.contacts = contacts
+        self.by_name, self.by_word, self.by_prefix, self.by_sound, self.words = {}, {}, {}, {}, {}
+        for name in contacts:
+            normalized = normalize(name)
+            if not normalized:
+                continue
+            self.by_name.setdefault(normalized, name)
+            self.words[name] = [(word, soundex(word), phonetic_key(word)) for word in normalized.split()]
+            for word, code, key in self.words[name]:
+                self.by_word.setdefault(word, set()).add(name)
+                self.by_prefix.setdefault(word[:PREFIX_LENGTH], set()).add(name)
+                self.by_sound.setdefault(code, set()).add(name)
+                self.by_sound.setdefault(key, set()).add(name)
+
+    def candidates(self, spoken, limit=None):
+        """Contacts that could be meant by a spoken name, best first, as (name, score) pairs"""
+        if self.load() is None:
+            return []
+        query = normalize(spoken)
+        with self.lock:
+            self.lookups += 1
+            exact = self.by_name.get(query)
+            if exact is not None:
+                return [(exact, 1.0)]
+
+            query_words = [(word, soundex(word), phonetic_key(word)) for word in query.split()]
+            found = set()
+            for word, code, key in query_words:
+                found |= self.by_word.get(word, set())
+                found |= self.by_prefix.get(word[:PREFIX_LENGTH], set())
+                found |= self.by_sound.get(code, set())
+                found |= self.by_sound.get(key, set())
+
+            ranked = []
+            for name in found:
+                score = self._score(self.words[name], query_words)
+                if score > 0:
+                    similarity = SequenceMatcher(None, query, normalize(name)).ratio()
+                    ranked.append((score, similarity, name))
+            ranked.sort(key=lambda item: (-item[0], -item[1], item[2]))
+            if not ranked:
+                self.misses += 1
+        return [(name, round(score, 3)) for score, _, name in ranked[:limit or CONTACT_CANDIDATES]]
+
+    def _score(self, words, query_words):
+        scores = []
+        for word, code, key in words:
+            best = 0.0
+            for spoken, spoken_code, spoken_key in query_words:
+                if spoken == word:
+                    best = 1.0
+                    break
+                if (spoken.startswith(word) or word.startswith(spoken)
+                        or spoken_code == code or spoken_key == key):
+                    best = max(best, SequenceMatcher(None, spoken, word).ratio())
+            scores.append(best)
+        return max(scores) * (0.8 + 0.2 * sum(scores) / len(scores))
+
+    def find(self, spoken):
+        """
+        The contact a spoken name most likely means, or None when nothing scores CONTACT_MATCH_THRESHOLD
+        or the best two are within CONTACT_MATCH_MARGIN of each other
+        """
+        ranked = self.candidates(spoken, limit=2)
+        if not ranked or ranked[0][1] < CONTACT_MATCH_THRESHOLD:
+            return None
+        if len(ranked) > 1 and ranked[0][1] - ranked[1][1] < CONTACT_MATCH_MARGIN:
+            print(f"Contact '{spoken}' is ambiguous: {[name for name, _ in ranked]}")
+            return None
+        return ranked[0][0]
+
+    def get_stats(self):
+        """Contacts, index sizes, file loads and lookups"""
+        with self.lock:
+            return {
+                'contacts': len(self.contacts or {}),
+                'words': len(self.by_word),
+                'sounds': len(self.by_sound),
+                'loads': self.loads,
+                'lookups': self.lookups,
+                'misses': self.misses
+            }
@@ -0,0 +1,108 @@
+"""
+Display thread that shows the newest frame at its own refresh rate
+"""
+
+import threading
+import time
+
+import cv2
+from config import DISPLAY_FPS
+
+
+class DisplayThread:
+    """
+    Owns the OpenCV window on its own thread. Producers submit items (latest wins) and never wait;
+    the thread renders at most `fps` times per second and drops the items in between.
+    All window calls (setup, render, waitKey, teardown) happen on this thread.
+    """
+
+    def __init__(self, render, fps=None, on_key=None, setup=None, teardown=None, interval_scale=None):
+        self.render = render  # render(item): draw and imshow
+        self.fps = fps or DISPLAY_FPS
+        self.on_key = on_key  # on_key(key) for every waitKey result
+        self.setup = setup
+        self.teardown = teardown
+        self.interval_scale = interval_scale  # optional callable slowing the refresh rate down
+
+        self.latest = None
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+        # Statistics
+        self.submitted = 0
+        self.shown = 0
+        self.dropped = 0
+        self.started_at = None
+
+    def submit(self, item):
+        """Offer a new item; replaces one the display thread has not shown yet"""
+        with self.lock:
+            if self.latest is not None:
+                self.dropped += 1
+            self.latest = item
+            self.submitted += 1
+
+    def _take_latest(self):
+        with self.lock:
+            item, self.latest = self.latest, None
+            return item
+
+    def start(self):
+        """Start the display thread"""
+        self.started_at = time.monotonic()
+        self.thread = threading.Thread(target=self._run, name="display", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop the display thread and wait for it to close the window"""
+        self.stop_event.set()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join()
+
+    def _run(self):
+        if self.setup:
+            self.setup()
+
+        next_tick = time.monotonic()
+        while not self.stop_event.is_set():
+            item = self._take_latest()
+            if item is not None:
+                try:
+                    self.render(item)
+                    self.shown += 1
+                except Exception as e:
+                    print(f"Display error: {e}")
+
+            # Keep the window responsive even when no new frame arrived
+            key = cv2.waitKey(1) & 0xFF
+            if self.on_key:
+                self.on_key(key)
+
+            interval = 1.0 / self.fps
+            if self.interval_scale:
+                interval *= self.interval_scale()
+            next_tick += interval
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                self.stop_event.wait(delay)
+            else:
+                # Fell behind: do not try to catch up with a burst of frames
+                next_tick = time.monotonic()
+
+        if self.teardown:
+            self.teardown()
+
+    def get_stats(self):
+        """Get shown/dropped counts and the achieved refresh rate"""
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0.0
+        return {
+            'shown': self.shown,
+            'dropped': self.dropped,
+            'fps': self.shown / elapsed if elapsed > 0 else 0.0
+        }
+
+    def format_stats(self):
+        """Short text line for overlay or console"""
+        stats = self.get_stats()
+        return f"display: {stats['fps']:.1f}/{self.fps} fps, {stats['dropped']} dropped"
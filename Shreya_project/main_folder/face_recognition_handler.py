@@ -3,15 +3,32 @@ import cv2
 import os
 import threading
 import time
+from config import RECOGNITION_RESET_DELAY
+from timer_scheduler import get_scheduler
 
 class FaceRecognitionHandler:
-    def __init__(self, face_match_threshold=0.6):
+    def __init__(self, face_match_threshold=0.6, scheduler=None):
         self.face_match_threshold = face_match_threshold
+        self.scheduler = scheduler or get_scheduler()
         self.manager_encoding = None
         self.face_recognition_running = False
         self.manager_verified = False
         self.recognition_done = False
         
+        # Persistent worker with a single-slot mailbox: a new frame overwrites an unprocessed one
+        self.mailbox = None
+        self.mailbox_condition = threading.Condition()
+        self.worker_thread = None
+        self.worker_running = False
+        self.generation = 0  # bumped on reset so in-flight results are dropped
+        self.retry_timer = None
+        
+        # Worker statistics
+        self.completed = 0
+        self.overwritten = 0
+        self.total_service_time = 0.0
+        self.last_service_time = 0.0
+        
     def load_manager_face(self, image_path):
         """Load and encode manager's face from image file"""
         try:
@@ -34,14 +51,26 @@ class FaceRecognitionHandler:
             print(f"Error loading manager image: {e}")
             return False
     
-    def delayed_recognition_reset(self):
-        """Reset recognition after delay"""
-        time.sleep(3)
+    def allow_retry(self):
+        """Allow recognition to run again after a failed match"""
         self.recognition_done = False
         print("Recognition reset after delay")
     
-    def run_face_recognition(self, frame_rgb, success_callback=None):
-        """Run face recognition in a separate thread"""
+    def schedule_retry(self):
+        """Allow a retry after RECOGNITION_RESET_DELAY without blocking a thread"""
+        self.cancel_retry()
+        self.retry_timer = self.scheduler.schedule(RECOGNITION_RESET_DELAY, self.allow_retry, name="recognition-retry")
+    
+    def cancel_retry(self):
+        """Cancel a pending retry"""
+        self.scheduler.cancel(self.retry_timer)
+        self.retry_timer = None
+    
+    def match_manager(self, frame_rgb):
+        """
+        Match faces in the frame against the manager (blocking, does not change verification state)
+        Returns "verified", "denied" or "no_face"
+        """
         self.face_recognition_running = True
         
         try:
@@ -65,7 +94,6 @@ class FaceRecognitionHandler:
                     frame_rgb, scaled_locations, num_jitters=1, model="small"
                 )
                 
-                face_matched = False
                 for face_encoding in face_encodings:
                     matches = face_recognition.compare_faces(
                         [self.manager_encoding], face_encoding, 
@@ -73,41 +101,115 @@ class FaceRecognitionHandler:
                     )
                     
                     if matches[0]:
-                        self.manager_verified = True
-                        self.recognition_done = True
-                        face_matched = True
-                        print("Manager verification successful!")
-                        
-                        if success_callback:
-                            success_callback()
-                        break
+                        return "verified"
                 
-                if not face_matched:
-                    print("Face not matched - access denied")
-                    self.recognition_done = True
-                    # Reset recognition after delay to allow retry
-                    threading.Thread(target=self.delayed_recognition_reset, daemon=True).start()
-            else:
-                print("No face detected in recognition frame")
+                return "denied"
+            
+            print("No face detected in recognition frame")
                 
         except Exception as e:
             print(f"Face recognition error: {e}")
         finally:
             self.face_recognition_running = False
+        
+        return "no_face"
+    
+    def apply_result(self, result):
+        """Update verification state from a match_manager result"""
+        if result == "verified":
+            self.manager_verified = True
+            self.recognition_done = True
+            print("Manager verification successful!")
+        elif result == "denied":
+            print("Face not matched - access denied")
+            self.recognition_done = True
+    
+    def start_worker(self):
+        """Start the long-lived recognition worker"""
+        with self.mailbox_condition:
+            if self.worker_running:
+                return
+            self.worker_running = True
+        self.worker_thread = threading.Thread(target=self._worker_loop, name="face-recognition", daemon=True)
+        self.worker_thread.start()
+    
+    def stop_worker(self):
+        """Stop the worker after its current frame and cancel a pending retry"""
+        self.cancel_retry()
+        with self.mailbox_condition:
+            self.worker_running = False
+            self.mailbox = None
+            self.mailbox_condition.notify()
+        if self.worker_thread is not None:
+            self.worker_thread.join()
+            self.worker_thread = None
     
-    def start_recognition_thread(self, frame_rgb, success_callback=None):
-        """Start face recognition in a new thread"""
-        if not self.face_recognition_running:
-            threading.Thread(
-                target=self.run_face_recognition, 
-                args=(frame_rgb.copy(), success_callback), 
-                daemon=True
-            ).start()
+    def submit(self, frame_rgb, result_callback=None):
+        """
+        Put a frame in the mailbox, replacing any frame the worker has not picked up yet.
+        The caller must not modify the frame afterwards. result_callback(result) runs on the worker thread.
+        """
+        self.start_worker()
+        with self.mailbox_condition:
+            if self.mailbox is not None:
+                self.overwritten += 1
+            self.mailbox = (frame_rgb, result_callback, self.generation)
+            self.mailbox_condition.notify()
+    
+    def _worker_loop(self):
+        while True:
+            with self.mailbox_condition:
+                while self.worker_running and self.mailbox is None:
+                    self.mailbox_condition.wait()
+                if not self.worker_running:
+                    break
+                frame_rgb, result_callback, generation = self.mailbox
+                self.mailbox = None
+            
+            # A frame queued before an earlier result was applied is no longer needed
+            if self.recognition_done:
+                continue
+            
+            start = time.monotonic()
+            result = self.match_manager(frame_rgb)
+            service_time = time.monotonic() - start
+            
+            with self.mailbox_condition:
+                self.completed += 1
+                self.total_service_time += service_time
+                self.last_service_time = service_time
+                # Results requested before a reset belong to the old session
+                if generation != self.generation:
+                    continue
+                self.apply_result(result)
+                if result == "denied":
+                    # Reset recognition after delay to allow retry
+                    self.schedule_retry()
+            
+            if result_callback:
+                result_callback(result)
+    
+    def get_worker_stats(self):
+        """Get mailbox depth, completed/overwritten counts and service times (ms)"""
+        with self.mailbox_condition:
+            average = self.total_service_time / self.completed if self.completed else 0.0
+            return {
+                'queue_depth': 0 if self.mailbox is None else 1,
+                'busy': self.face_recognition_running,
+                'completed': self.completed,
+                'overwritten': self.overwritten,
+                'avg_ms': average * 1000,
+                'last_ms': self.last_service_time * 1000
+            }
     
     def reset_system(self):
         """Reset face recognition system"""
-        self.manager_verified = False
-        self.recognition_done = False
+        self.cancel_retry()
+        with self.mailbox_condition:
+            self.mailbox = None
+            self.generation += 1
+            self.manager_verified = False
+            self.recognition_done = False
         print("Face recognition system reset")
     
     def is_manager_verified(self):
@@ -4,8 +4,8 @@ Smart Camera System - Main Controller
 Integrates all components for face recognition, gaze tracking, and voice commands
 """
 
-import time
-import threading
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 
 # Import custom modules
 from speech_handler import SpeechHandler
@@ -14,66 +14,312 @@ from gaze_tracker import GazeTracker
 from whatsapp_handler import WhatsAppHandler
 from camera_handler import CameraHandler
 from system_controller import SystemController
+from timer_scheduler import get_scheduler
+from display import DisplayThread
+from voice_commands import CommandRegistry
+from tts_worker import PRIORITY_URGENT, PRIORITY_NORMAL
+from config import SPEECH_DRAIN_TIMEOUT, COMMAND_PLUGINS, ACTION_TIMEOUT, ACTION_MAX_PENDING
 
 class SmartCameraSystem:
+    """
+    Runs frame processing, voice commands and messaging as asyncio tasks; speech has its own thread.
+    Blocking libraries run on dedicated single-thread executors; tasks are cancelled on reset and shutdown.
+    Face recognition runs on the face handler's persistent worker.
+    """
+    
+    # One thread per blocking library: camera + MediaPipe, microphone, pywhatkit
+    # (dlib recognition runs on the face handler's persistent worker, pyttsx3 on the TTS worker)
+    EXECUTORS = ("camera", "voice", "messaging")
+    
     def __init__(self):
         # Initialize all components
         self.speech_handler = SpeechHandler()
+        self.speech_handler.command_callback = self.on_voice_command
         self.face_handler = FaceRecognitionHandler()
         self.gaze_tracker = GazeTracker()
         self.whatsapp_handler = WhatsAppHandler()
         self.camera_handler = CameraHandler()
         self.system_controller = SystemController()
+        # The preview window refreshes on its own thread and rate
+        self.display = DisplayThread(self.render_display, on_key=self.on_key,
+                                     setup=self.camera_handler.create_window,
+                                     teardown=self.camera_handler.destroy_windows)
         
         # Configuration
         self.manager_image_path = "Shreya.jpg"
         
-    def process_voice_command(self, command):
-        """Process voice commands"""
-        print(f"Processing command: {command}")
+        # Commands are matched in one pass over the transcript; plugins can add more
+        self.command_registry = CommandRegistry()
+        self.register_commands()
+        self.command_registry.load_plugins(COMMAND_PLUGINS)
         
-        if "send message" in command or "notify" in command:
-            print("Processing WhatsApp command...")
-            self.whatsapp_handler.send_whatsapp_message(
-                command, 
-                speak_callback=self.speech_handler.speak
+        # Task orchestration state (created when the event loop starts)
+        self.loop = None
+        self.command_queue = None
+        self.tasks = {}
+        self.action_count = 0
+        self.pending_actions = 0  # accepted actions whose blocking call has not returned
+        self.executors = {
+            name: ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+            for name in self.EXECUTORS
+        }
+    
+    # === Task helpers ===
+    
+    async def run_blocking(self, executor_name, func, *args):
+        """Run a blocking call on the named executor"""
+        return await self.loop.run_in_executor(self.executors[executor_name], func, *args)
+    
+    def start_task(self, name, coro):
+        """Start a named task and track it until it finishes"""
+        task = self.loop.create_task(coro, name=name)
+        self.tasks[name] = task
+        task.add_done_callback(lambda t: self._on_task_done(name, t))
+        return task
+    
+    def _on_task_done(self, name, task):
+        if self.tasks.get(name) is task:
+            del self.tasks[name]
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Task {name} failed: {task.exception()}")
+    
+    def is_task_running(self, name):
+        """Check if a named task is running"""
+        return name in self.tasks
+    
+    async def cancel_tasks(self, *names):
+        """Cancel the named tasks and wait until they have finished"""
+        current = asyncio.current_task()
+        pending = [self.tasks[name] for name in names if name in self.tasks]
+        others = [task for task in pending if task is not current]
+        for task in others:
+            task.cancel()
+        if others:
+            await asyncio.gather(*others, return_exceptions=True)
+        if current in pending:
+            # A task cancelling itself finishes its current step and stops at its next await
+            current.cancel()
+    
+    def say(self, text, priority=PRIORITY_NORMAL, key=None):
+        """Queue text for speech without waiting (safe to call from any thread)"""
+        self.speech_handler.speak(text, priority, key)
+    
+    # === Tasks ===
+    
+    async def voice_task(self):
+        """Feed spoken phrases to the transcriber while the manager is verified"""
+        print("Starting continuous voice listening...")
+        self.speech_handler.set_listening(True)
+        try:
+            while self.face_handler.is_manager_verified() and self.system_controller.is_system_active():
+                # Only waiting for the next phrase blocks; transcription overlaps with listening
+                audio = await self.run_blocking("voice", self.speech_handler.next_phrase)
+                if audio is not None:
+                    self.speech_handler.transcribe(audio)
+        finally:
+            self.speech_handler.set_listening(False)
+            print("Continuous voice listening stopped")
+    
+    async def command_task(self):
+        """Run transcribed commands one at a time, in the order they were spoken"""
+        while True:
+            command = await self.command_queue.get()
+            try:
+                await self.process_voice_command(command)
+            except Exception as e:
+                print(f"Command '{command}' failed: {e}")
+    
+    def on_voice_command(self, seq, command):
+        """Called on a transcriber worker; hand the command to the event loop"""
+        if self.loop is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.command_queue.put_nowait, command)
+    
+    # === Command actions ===
+    
+    def submit_action(self, name, executor_name, func, *args, on_done=None):
+        """
+        Run a command's blocking side effect on its executor without waiting for it.
+        Each executor has one thread, which is the concurrency limit per kind of action; at most
+        ACTION_MAX_PENDING actions may be outstanding. Returns False when the action is refused.
+        """
+        if self.pending_actions >= ACTION_MAX_PENDING:
+            print(f"Action {name} refused: {self.pending_actions} actions pending")
+            return False
+        self.pending_actions += 1
+        self.action_count += 1
+        self.start_task(f"action-{name}-{self.action_count}",
+                        self.action_task(name, executor_name, func, args, on_done))
+        return True
+    
+    async def action_task(self, name, executor_name, func, args, on_done):
+        """
+        Wait up to ACTION_TIMEOUT for the action, then report it through on_done(result, error).
+        A thread cannot be interrupted, so a timed-out call stays pending until it returns.
+        """
+        result, error = None, None
+        try:
+            result = await asyncio.wait_for(
+                self.run_blocking(executor_name, self.run_tracked, func, *args), ACTION_TIMEOUT)
+        except asyncio.TimeoutError:
+            error = TimeoutError(f"{name} took over {ACTION_TIMEOUT}s")
+        except Exception as e:
+            error = e
+        if error is not None:
+            print(f"Action {name} failed: {error}")
+        if on_done is not None:
+            on_done(result, error)
+    
+    def run_tracked(self, func, *args):
+        """Runs on the executor thread; frees the action's slot once the call really returns"""
+        try:
+            return func(*args)
+        finally:
+            self.loop.call_soon_threadsafe(self.on_action_returned)
+    
+    def on_action_returned(self):
+        self.pending_actions -= 1
+    
+    def on_message_done(self, result, error):
+        """deliver_message speaks its own outcome; only timeouts and crashes are reported here"""
+        if isinstance(error, TimeoutError):
+            self.say("Sending the message is taking longer than expected")
+        elif error is not None:
+            self.say("Failed to send message due to an error.")
+    
+    async def frame_task(self):
+        """Capture, gaze tracking, recognition trigger and reset check; hands frames to the display"""
+        while self.system_controller.is_system_active():
+            # Get camera frames and process gaze tracking off the event loop
+            ret, person_detected, gaze_detected, frame_rgb, display_frame = await self.run_blocking(
+                "camera", self.capture_and_track)
+            if not ret:
+                print("Failed to read frame")
+                continue
+            
+            # Update system controller
+            self.system_controller.update_person_detection(person_detected)
+            
+            # Check for face recognition trigger (the mailbox keeps only the newest frame)
+            if not self.face_handler.is_recognition_done() and gaze_detected:
+                self.face_handler.submit(frame_rgb, self.on_recognition_result)
+            
+            # Check if system should reset due to no person
+            if self.system_controller.should_reset_system(
+                self.face_handler.is_manager_verified(),
+                self.face_handler.is_recognition_done()
+            ):
+                print("No person detected - resetting system")
+                await self.reset_system()
+                self.say("System reset due to no person detected", key="reset")
+                self.system_controller.reset_detection_timer()
+            
+            # Get status for display
+            status_info = self.system_controller.get_status_info(
+                manager_verified=self.face_handler.is_manager_verified(),
+                recognition_done=self.face_handler.is_recognition_done(),
+                person_detected=person_detected,
+                gaze_detected=gaze_detected,
+                face_recognition_running=self.face_handler.is_recognition_running(),
+                continuous_listening=self.is_task_running("voice"),
+                listening_for_command=False
             )
-        elif "reset" in command:
-            self.reset_system()
-        elif "quit" in command or "exit" in command:
-            self.speech_handler.speak("Shutting down system")
+            
+            # The display thread shows the newest frame at its own rate
+            self.display.submit((display_frame, status_info))
+    
+    def capture_and_track(self):
+        """Read frames and run gaze tracking (blocking, camera executor)"""
+        ret, frame, frame_rgb, display_frame = self.camera_handler.get_processed_frames()
+        if not ret:
+            return False, False, False, None, None
+        person_detected, gaze_detected, gaze_results = self.gaze_tracker.process_frame(frame_rgb)
+        return True, person_detected, gaze_detected, frame_rgb, display_frame
+    
+    def render_display(self, item):
+        """Draw the status overlay and show the frame (display thread)"""
+        display_frame, status_info = item
+        self.camera_handler.display_frame_with_status(display_frame, status_info)
+    
+    # === Commands and callbacks ===
+    
+    def on_key(self, key):
+        """Keyboard input from the display thread"""
+        if key == ord('q'):
             self.system_controller.shutdown_system()
-        elif "stop listening" in command or "pause" in command:
-            self.speech_handler.speak("Voice commands paused")
-            self.speech_handler.stop_continuous_listening()
-        else:
-            print(f"Unknown command: {command}")
-            self.speech_handler.speak("Command not recognized. Try 'send message', 'reset', or 'quit'")
+    
+    # === Voice commands ===
+    
+    def register_commands(self):
+        """Built-in voice commands, in priority order"""
+        self.command_registry.register(
+            "send_message",
+            ["send message", "send a message", "send message to {contact}", "send a message to {contact}",
+             "notify", "notify {contact}"],
+            self.on_send_message_command)
+        self.command_registry.register("reset", "reset", self.on_reset_command)
+        self.command_registry.register("quit", ["quit", "exit"], self.on_quit_command)
+        self.command_registry.register("pause", ["stop listening", "pause"], self.on_pause_command)
+    
+    async def process_voice_command(self, command):
+        """Process voice commands; handlers may be coroutines or return a reply to speak"""
+        print(f"Processing command: {command}")
+        result = self.command_registry.dispatch(command, self.on_unknown_command)
+        if asyncio.iscoroutine(result):
+            result = await result
+        if isinstance(result, str):
+            self.say(result)
+    
+    def on_send_message_command(self, match):
+        print("Processing WhatsApp command...")
+        if not self.submit_action("message", "messaging", self.whatsapp_handler.deliver_message,
+                                  match.text, self.say, match.slots.get("contact"), on_done=self.on_message_done):
+            return "Still sending earlier messages, please try again shortly"
+    
+    async def on_reset_command(self, match):
+        await self.reset_system()
+    
+    def on_quit_command(self, match):
+        self.say("Shutting down system", PRIORITY_URGENT)
+        self.system_controller.shutdown_system()
+    
+    async def on_pause_command(self, match):
+        self.say("Voice commands paused")
+        await self.cancel_tasks("voice")
+    
+    def on_unknown_command(self, command):
+        print(f"Unknown command: {command}")
+        return "Command not recognized. Try 'send message', 'reset', or 'quit'"
+    
+    def on_recognition_result(self, result):
+        """Called on the recognition worker; hand the result to the event loop"""
+        if result == "verified":
+            self.loop.call_soon_threadsafe(self.on_manager_verified)
     
     def on_manager_verified(self):
         """Callback when manager is verified"""
-        self.speech_handler.speak("Manager verified. Ready for commands.")
+        self.say("Manager verified. Ready for commands.", key="verification")
         # Start continuous listening
-        self.speech_handler.start_continuous_listening(
-            manager_verified=lambda: self.face_handler.is_manager_verified(),
-            system_active=lambda: self.system_controller.is_system_active(),
-            command_callback=self.process_voice_command
-        )
+        if not self.is_task_running("voice"):
+            self.start_task("voice", self.voice_task())
+            if self.speech_handler.wake_word.enabled:
+                self.say(f"Voice commands now active. Say {self.speech_handler.wake_word.phrases[0]} before a command.")
+            else:
+                self.say("Voice commands now active. I'm listening continuously.")
     
     def on_access_denied(self):
         """Callback when access is denied"""
-        self.speech_handler.speak("Access denied. You are not authorized.")
+        self.say("Access denied. You are not authorized.", PRIORITY_URGENT, key="verification")
     
-    def reset_system(self):
+    async def reset_system(self):
         """Reset the entire system"""
-        # Stop continuous listening first
-        self.speech_handler.stop_continuous_listening()
+        # Stop listening first; the face handler drops in-flight recognition and pending retries
+        await self.cancel_tasks("voice")
         
         # Reset all components
         self.face_handler.reset_system()
         self.gaze_tracker.reset_gaze()
         
-        self.speech_handler.speak("System reset")
+        self.say("System reset", key="reset")
         print("System manually reset")
     
     def initialize_system(self):
@@ -90,81 +336,41 @@ class SmartCameraSystem:
             self.speech_handler.speak("Camera not accessible.")
             return False
         
-        # Create display window
-        self.camera_handler.create_window()
+        # Keep the microphone open (voice commands are unavailable without one)
+        self.speech_handler.start_audio()
         
         # System ready
         self.speech_handler.speak("System ready. Looking for manager...")
         print("System initialization complete!")
         return True
     
+    async def run_async(self):
+        """Start the speech task and run the frame loop until shutdown"""
+        self.loop = asyncio.get_running_loop()
+        self.command_queue = asyncio.Queue()
+        self.start_task("commands", self.command_task())
+        
+        try:
+            await self.frame_task()
+        finally:
+            await self.shutdown_tasks()
+    
+    async def shutdown_tasks(self):
+        """Stop all tasks in a fixed order: actions in flight finish first (up to their timeout)"""
+        await self.cancel_tasks("voice", "commands")
+        actions = [task for name, task in self.tasks.items() if name.startswith("action-")]
+        if actions:
+            await asyncio.gather(*actions, return_exceptions=True)
+    
     def run(self):
         """Main system loop"""
         if not self.initialize_system():
+            self.speech_handler.stop_speech(SPEECH_DRAIN_TIMEOUT)
             return
         
         try:
-            while self.system_controller.is_system_active():
-                # Get camera frames
-                ret, frame, frame_rgb, display_frame = self.camera_handler.get_processed_frames()
-                if not ret:
-                    print("Failed to read frame")
-                    continue
-                
-                # Process gaze tracking
-                person_detected, gaze_detected, gaze_results = self.gaze_tracker.process_frame(frame_rgb)
-                
-                # Update system controller
-                self.system_controller.update_person_detection(person_detected)
-                
-                # Check for face recognition trigger
-                if (not self.face_handler.is_recognition_done() and 
-                    gaze_detected and 
-                    not self.face_handler.is_recognition_running()):
-                    
-                    print("Starting face recognition thread...")
-                    
-                    def success_callback():
-                        self.on_manager_verified()
-                    
-                    def failure_callback():
-                        self.on_access_denied()
-                    
-                    # Start face recognition with callbacks
-                    self.face_handler.start_recognition_thread(
-                        frame_rgb, 
-                        success_callback=success_callback
-                    )
-                
-                # Check if system should reset due to no person
-                if self.system_controller.should_reset_system(
-                    self.face_handler.is_manager_verified(),
-                    self.face_handler.is_recognition_done()
-                ):
-                    print("No person detected - resetting system")
-                    self.speech_handler.stop_continuous_listening()
-                    self.reset_system()
-                    self.speech_handler.speak("System reset due to no person detected")
-                    self.system_controller.reset_detection_timer()
-                
-                # Get status for display
-                status_info = self.system_controller.get_status_info(
-                    manager_verified=self.face_handler.is_manager_verified(),
-                    recognition_done=self.face_handler.is_recognition_done(),
-                    person_detected=person_detected,
-                    gaze_detected=gaze_detected,
-                    face_recognition_running=self.face_handler.is_recognition_running(),
-                    continuous_listening=self.speech_handler.is_listening(),
-                    listening_for_command=False
-                )
-                
-                # Display frame with status
-                self.camera_handler.display_frame_with_status(display_frame, status_info)
-                
-                # Check for quit key
-                if self.camera_handler.check_quit_key():
-                    self.system_controller.shutdown_system()
-                    
+            self.display.start()
+            asyncio.run(self.run_async())
         except KeyboardInterrupt:
             print("\nKeyboard interrupt received")
         except Exception as e:
@@ -176,10 +382,23 @@ class SmartCameraSystem:
         """Clean up system resources"""
         print("Cleaning up system...")
         self.system_controller.shutdown_system()
-        self.speech_handler.stop_continuous_listening()
+        
+        # Wait for running blocking calls and drop queued ones
+        self.face_handler.stop_worker()
+        get_scheduler().stop()
+        for executor in self.executors.values():
+            executor.shutdown(wait=True, cancel_futures=True)
+        
+        stats = self.face_handler.get_worker_stats()
+        print(f"Recognition worker: {stats['completed']} done, {stats['overwritten']} frames replaced, "
+              f"avg {stats['avg_ms']:.0f}ms")
+        
+        # Closes the window on the display thread
+        self.display.stop()
         self.camera_handler.release_camera()
-        self.camera_handler.destroy_windows()
-        self.speech_handler.speak("System shutdown")
+        self.speech_handler.stop_audio()
+        self.speech_handler.speak("System shutdown", PRIORITY_URGENT)
+        self.speech_handler.stop_speech(SPEECH_DRAIN_TIMEOUT)
         print("System shutdown complete")
 
 def main():
@@ -0,0 +1,152 @@
+"""
+Pre-rendered speech for fixed prompts: synthesized to WAV once, then played back directly
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import string
+import threading
+import wave
+
+from config import TTS_CACHE_DIR, TTS_CACHED_PROMPTS, TTS_PROMPT_TEMPLATES
+
+PLAYBACK_CHUNK = 1024
+
+
+def expand_templates(templates):
+    """Every text a template can produce: {"Attempt {n}": {"n": ["1", "2"]}} -> Attempt 1, Attempt 2"""
+    texts = []
+    for template, fillers in templates.items():
+        fields = [name for _, name, _, _ in string.Formatter().parse(template) if name]
+        choices = [_filler_values(fillers[field]) for field in fields]
+        for values in itertools.product(*choices):
+            texts.append(template.format(**dict(zip(fields, values))))
+    return texts
+
+
+def _filler_values(values):
+    # A string names a JSON file (e.g. contacts.json) whose keys are the values
+    if not isinstance(values, str):
+        return list(values)
+    try:
+        with open(values, "r") as file:
+            return list(json.load(file))
+    except (OSError, ValueError) as e:
+        print(f"Could not read prompt fillers from {values}: {e}")
+        return []
+
+
+class PhraseCache:
+    """
+    Known prompts (TTS_CACHED_PROMPTS plus every filling of TTS_PROMPT_TEMPLATES) are rendered
+    to WAV files once with the same pyttsx3 engine and played back from memory afterwards, which
+    starts in milliseconds instead of waiting for synthesis. Files are named by a hash of the
+    voice, rate, volume and text, so changing the voice settings renders them again.
+    Only the TTS thread may call render() and play(), as it owns the engine.
+    """
+
+    def __init__(self, engine, cache_dir=None):
+        self.engine = engine
+        self.cache_dir = cache_dir or TTS_CACHE_DIR
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.settings = "|".join(str(self.engine.getProperty(name)) for name in ('voice', 'rate', 'volume'))
+        self.known = set(TTS_CACHED_PROMPTS) | set(expand_templates(TTS_PROMPT_TEMPLATES))
+        self.unrendered = [text for text in sorted(self.known) if not os.path.exists(self.path_for(text))]
+        self.loaded = {}  # path -> (sample width, channels, rate, frames)
+        self.pyaudio = None
+        self.lock = threading.Lock()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.rendered = 0
+
+    def path_for(self, text):
+        """WAV file for a text under the current voice settings"""
+        digest = hashlib.sha1(f"{self.settings}|{text}".encode("utf-8")).hexdigest()[:20]
+        return os.path.join(self.cache_dir, f"{digest}.wav")
+
+    def is_known(self, text):
+        return text in self.known
+
+    def render(self, text):
+        """Synthesize text to its cache file"""
+        path = self.path_for(text)
+        temp_path = path + ".tmp.wav"
+        self.engine.save_to_file(text, temp_path)
+        self.engine.runAndWait()
+        if os.path.exists(temp_path) and os.path.getsize(temp_path) > 0:
+            os.replace(temp_path, path)
+            with self.lock:
+                self.rendered += 1
+            return True
+        print(f"Could not render prompt: {text}")
+        return False
+
+    def render_next(self):
+        """Render one prompt that is not on disk yet (for idle time); False when all are done"""
+        while self.unrendered:
+            text = self.unrendered.pop()
+            if not os.path.exists(self.path_for(text)):
+                self.render(text)
+                return True
+        return False
+
+    def play(self, text):
+        """Play a known prompt, rendering it first on first use; False if it has to be spoken live"""
+        if text not in self.known:
+            return False
+        path = self.path_for(text)
+        if not os.path.exists(path) and not self.render(text):
+            return False
+
+        try:
+            sample_width, channels, rate, frames = self._load(path)
+            if self.pyaudio is None:
+                import pyaudio
+                self.pyaudio = pyaudio.PyAudio()
+            stream = self.pyaudio.open(format=self.pyaudio.get_format_from_width(sample_width),
+                                       channels=channels, rate=rate, output=True)
+            try:
+                step = PLAYBACK_CHUNK * sample_width * channels
+                for offset in range(0, len(frames), step):
+                    stream.write(frames[offset:offset + step])
+            finally:
+                stream.stop_stream()
+                stream.close()
+        except Exception as e:
+            print(f"Cached prompt playback failed: {e}")
+            with self.lock:
+                self.misses += 1
+            return False
+
+        with self.lock:
+            self.hits += 1
+        return True
+
+    def _load(self, path):
+        sound = self.loaded.get(path)
+        if sound is None:
+            with wave.open(path, 'rb') as wav:
+                sound = (wav.getsampwidth(), wav.getnchannels(), wav.getframerate(),
+                         wav.readframes(wav.getnframes()))
+            self.loaded[path] = sound
+        return sound
+
+    def close(self):
+        if self.pyaudio is not None:
+            self.pyaudio.terminate()
+            self.pyaudio = None
+
+    def get_stats(self):
+        """Known prompts, rendered files and cache hits"""
+        with self.lock:
+            return {
+                'known': len(self.known),
+                'pending_render': len(self.unrendered),
+                'rendered': self.rendered,
+                'hits': self.hits,
+                'misses': self.misses
+            }
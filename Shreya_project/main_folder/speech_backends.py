@@ -0,0 +1,169 @@
+"""
+Speech-to-text backends behind one interface, selectable per deployment
+"""
+
+import json
+import os
+import threading
+import time
+
+import speech_recognition as sr
+from config import SPEECH_LANGUAGE, SPEECH_BACKEND, SPEECH_FALLBACK_BACKEND, VOSK_MODEL_PATH, SPHINX_LANGUAGE
+
+
+_vosk_models = {}
+_vosk_lock = threading.Lock()
+
+
+def load_vosk_model(model_path=None):
+    """Load a Vosk model once per process; the STT backend and the wake word spotter share it"""
+    try:
+        import vosk
+    except ImportError:
+        raise RuntimeError("Vosk needs the vosk package (pip install vosk)")
+
+    model_path = model_path or VOSK_MODEL_PATH
+    if not os.path.isdir(model_path):
+        raise RuntimeError(f"Vosk model not found: {model_path}")
+
+    with _vosk_lock:
+        model = _vosk_models.get(model_path)
+        if model is None:
+            vosk.SetLogLevel(-1)
+            model = vosk.Model(model_path)
+            _vosk_models[model_path] = model
+        return model
+
+
+class SpeechBackend:
+    """
+    Base class for speech-to-text engines.
+    transcribe(audio) takes sr.AudioData and returns the text, raising sr.UnknownValueError when
+    nothing was understood and sr.RequestError when the engine itself failed, like recognize_google.
+    """
+
+    name = "base"
+    offline = False
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+        self.total_seconds = 0.0
+
+    def transcribe(self, audio):
+        raise NotImplementedError
+
+    def recognize(self, audio):
+        """Transcribe and record the call's latency"""
+        start = time.monotonic()
+        failed = True
+        try:
+            text = self.transcribe(audio)
+            failed = False
+            return text
+        finally:
+            self.record(time.monotonic() - start, failed)
+
+    def record(self, seconds, failed=False):
+        """Count one transcription, e.g. one that ran in a worker process"""
+        with self.lock:
+            self.calls += 1
+            self.total_seconds += seconds
+            if failed:
+                self.failures += 1
+
+    def get_stats(self):
+        """Get call count, failures and average latency"""
+        with self.lock:
+            return {
+                'backend': self.name,
+                'calls': self.calls,
+                'failures': self.failures,
+                'avg_ms': 1000.0 * self.total_seconds / self.calls if self.calls else 0.0
+            }
+
+
+class GoogleBackend(SpeechBackend):
+    """Google Web Speech API (needs network access)"""
+
+    name = "google"
+
+    def __init__(self, language=None):
+        super().__init__()
+        self.language = language or SPEECH_LANGUAGE
+        self.recognizer = sr.Recognizer()
+
+    def transcribe(self, audio):
+        return self.recognizer.recognize_google(audio, language=self.language)
+
+
+class VoskBackend(SpeechBackend):
+    """Offline Kaldi models through Vosk; the model is loaded once and shared by all calls"""
+
+    name = "vosk"
+    offline = True
+    sample_rate = 16000
+
+    def __init__(self, model_path=None):
+        super().__init__()
+        self.model = load_vosk_model(model_path)
+        import vosk
+        self.vosk = vosk
+
+    def transcribe(self, audio):
+        # KaldiRecognizer is cheap to create and not thread-safe, so use one per phrase
+        recognizer = self.vosk.KaldiRecognizer(self.model, self.sample_rate)
+        recognizer.AcceptWaveform(audio.get_raw_data(convert_rate=self.sample_rate, convert_width=2))
+        text = json.loads(recognizer.FinalResult()).get('text', '')
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+class SphinxBackend(SpeechBackend):
+    """Offline CMU PocketSphinx through speech_recognition"""
+
+    name = "sphinx"
+    offline = True
+
+    def __init__(self, language=None):
+        super().__init__()
+        try:
+            import pocketsphinx  # noqa: F401
+        except ImportError:
+            raise RuntimeError("Sphinx backend needs the pocketsphinx package (pip install pocketsphinx)")
+        self.language = language or SPHINX_LANGUAGE
+        self.recognizer = sr.Recognizer()
+
+    def transcribe(self, audio):
+        return self.recognizer.recognize_sphinx(audio, language=self.language)
+
+
+BACKENDS = {
+    'google': GoogleBackend,
+    'vosk': VoskBackend,
+    'sphinx': SphinxBackend
+}
+
+
+def create_backend(name=None):
+    """
+    Create the configured backend (SPEECH_BACKEND unless a name is given).
+    If it cannot be loaded (missing package or model), fall back to SPEECH_FALLBACK_BACKEND.
+    """
+    name = name or SPEECH_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown speech backend '{name}', expected one of {sorted(BACKENDS)}")
+
+    try:
+        backend = BACKENDS[name]()
+    except RuntimeError as e:
+        fallback = SPEECH_FALLBACK_BACKEND
+        if not fallback or fallback == name:
+            raise
+        print(f"{e} - falling back to '{fallback}'")
+        backend = BACKENDS[fallback]()
+
+    print(f"Speech backend: {backend.name} ({'offline' if backend.offline else 'online'})")
+    return backend
@@ -1,77 +1,70 @@
-import pyttsx3
 import speech_recognition as sr
-import threading
-import time
+from audio_stream import AudioStream
+from wake_word import WakeWordSpotter
+from tts_worker import TTSWorker, PRIORITY_NORMAL
+from speech_backends import create_backend
+from transcriber import Transcriber
+from config import VOICE_TIMEOUT, PHRASE_TIME_LIMIT
 
 class SpeechHandler:
     def __init__(self):
-        self.engine = pyttsx3.init()
-        self.recognizer = sr.Recognizer()
-        self.mic = sr.Microphone()
-        self.continuous_listening_active = False
-        self.listening_for_command = False
-        self.voice_thread = None
+        # Speech output runs on its own thread; speak() never waits for it
+        self.tts = TTSWorker()
+        self.backend = create_backend()
+        # Only the phrase after the wake word is transcribed
+        self.wake_word = WakeWordSpotter()
+        # Opened once by start_audio; tracks the noise floor so commands need no calibration pause
+        self.audio_stream = AudioStream(phrase_time_limit=PHRASE_TIME_LIMIT, wake_word=self.wake_word)
+        # Transcribes phrases on its own workers while the stream keeps capturing
+        self.transcriber = Transcriber(self.backend, self.on_transcript)
+        self.command_callback = None  # command_callback(seq, command), in the order spoken
         
-    def speak(self, text):
-        """Text-to-speech function with error handling"""
-        try:
-            print("SPEAKING:", text)
-            self.engine.say(text)
-            self.engine.runAndWait()
-        except Exception as e:
-            print(f"Speech error: {e}")
+    def speak(self, text, priority=PRIORITY_NORMAL, key=None):
+        """Queue text for speech and return immediately (see TTSWorker for priorities and coalescing)"""
+        self.tts.speak(text, priority, key)
     
-    def continuous_voice_listener(self, manager_verified, system_active, command_callback):
-        """Continuous voice listening function"""
-        print("Starting continuous voice listening...")
-        
-        while self.continuous_listening_active and manager_verified() and system_active():
-            try:
-                with self.mic as source:
-                    print("Ready for voice command...")
-                    self.recognizer.adjust_for_ambient_noise(source, duration=0.3)
-                    audio = self.recognizer.listen(source, timeout=1, phrase_time_limit=5)
-                
-                command = self.recognizer.recognize_google(audio).lower()
-                print(f"Command received: {command}")
-                
-                # Call the command callback function
-                if command_callback:
-                    command_callback(command)
-                    
-            except sr.WaitTimeoutError:
-                continue
-            except sr.UnknownValueError:
-                print("Could not understand audio - continuing to listen")
-                continue
-            except sr.RequestError as e:
-                print(f"Speech recognition error: {e}")
-                time.sleep(1)
-                continue
-            except Exception as e:
-                print(f"Unexpected error in voice listener: {e}")
-                time.sleep(1)
-                continue
-        
-        print("Continuous voice listening stopped")
+    def stop_speech(self, timeout=None):
+        """Finish queued speech for up to timeout seconds and stop the speech thread"""
+        self.tts.stop(timeout)
+        print(self.tts.format_stats())
+    
+    def start_audio(self):
+        """Open the persistent microphone stream and start the transcription workers"""
+        self.transcriber.start()
+        return self.audio_stream.start()
+    
+    def stop_audio(self):
+        """Close the microphone stream and stop the transcription workers"""
+        self.audio_stream.stop()
+        self.transcriber.stop()
+        print(self.audio_stream.vad_gate.format_stats())
+        print(self.wake_word.format_stats())
+        print(self.transcriber.format_stats())
+    
+    def set_listening(self, active):
+        """Start or stop collecting command phrases; stopping also drops phrases not yet transcribed"""
+        self.audio_stream.set_active(active)
+        if not active:
+            self.transcriber.clear()
     
-    def start_continuous_listening(self, manager_verified, system_active, command_callback):
-        """Start continuous listening thread"""
-        if not self.continuous_listening_active:
-            self.continuous_listening_active = True
-            self.voice_thread = threading.Thread(
-                target=self.continuous_voice_listener, 
-                args=(manager_verified, system_active, command_callback),
-                daemon=True
-            )
-            self.voice_thread.start()
-            self.speak("Voice commands now active. I'm listening continuously.")
+    def next_phrase(self):
+        """Wait for the next phrase from the stream (blocking), or None after VOICE_TIMEOUT"""
+        return self.audio_stream.get_phrase(timeout=VOICE_TIMEOUT)
     
-    def stop_continuous_listening(self):
-        """Stop continuous listening"""
-        self.continuous_listening_active = False
-        print("Stopping continuous voice listening...")
+    def transcribe(self, audio):
+        """Queue a phrase for transcription; the command arrives through command_callback"""
+        return self.transcriber.submit(audio)
     
-    def is_listening(self):
-        """Check if continuous listening is active"""
-        return self.continuous_listening_active
\ No newline at end of file
+    def on_transcript(self, seq, text, error):
+        """Transcriber callback, called in the order the phrases were spoken"""
+        if isinstance(error, sr.UnknownValueError):
+            print("Could not understand audio - continuing to listen")
+        elif isinstance(error, sr.RequestError):
+            print(f"Speech recognition error: {error}")
+        elif error is not None:
+            print(f"Unexpected error in voice listener: {error}")
+        else:
+            command = text.lower()
+            print(f"Command received: {command}")
+            if self.command_callback:
+                self.command_callback(seq, command)
@@ -1,38 +1,72 @@
+import threading
 import time
+from timer_scheduler import get_scheduler
 
 class SystemController:
-    def __init__(self, no_person_timeout=10):
+    def __init__(self, no_person_timeout=10, scheduler=None):
         self.system_active = True
         self.no_person_timeout = no_person_timeout
-        self.last_person_detected_time = time.time()
+        self.scheduler = scheduler or get_scheduler()
+        # The frame task and the scheduler thread both touch the no-person state
+        self.lock = threading.Lock()
+        self.last_person_detected_time = time.monotonic()
+        self.no_person_timer = None
+        self.no_person_expired = False
         self.no_face_counter = 0
+        with self.lock:
+            self.arm_no_person_timer(no_person_timeout)
+    
+    def arm_no_person_timer(self, delay):
+        """Register the no-person deadline with the scheduler (call with the lock held)"""
+        self.scheduler.cancel(self.no_person_timer)
+        self.no_person_timer = self.scheduler.schedule(delay, self._on_no_person_timeout, name="no-person")
+    
+    def _on_no_person_timeout(self):
+        with self.lock:
+            if not self.system_active or (self.no_person_timer is not None and self.no_person_timer.is_pending()):
+                # Shut down, or re-armed by the frame task after this timer fired: the newer one decides
+                return
+            # Frames only record when a person was last seen; re-arm for the rest of the timeout
+            remaining = self.last_person_detected_time + self.no_person_timeout - time.monotonic()
+            if remaining > 0:
+                self.arm_no_person_timer(remaining)
+            else:
+                self.no_person_expired = True
         
     def update_person_detection(self, person_detected):
         """Update person detection status"""
         if person_detected:
-            self.last_person_detected_time = time.time()
-            self.no_face_counter = 0
+            with self.lock:
+                self.last_person_detected_time = time.monotonic()
+                self.no_face_counter = 0
+                if self.no_person_expired:
+                    self.no_person_expired = False
+                    self.arm_no_person_timer(self.no_person_timeout)
         else:
             self.no_face_counter += 1
     
     def should_reset_system(self, manager_verified, recognition_done):
         """Check if system should be reset due to no person detected"""
-        time_since_last_person = time.time() - self.last_person_detected_time
-        
-        if (time_since_last_person > self.no_person_timeout or 
-            self.no_face_counter > 150):
+        with self.lock:
+            expired = self.no_person_expired
+        if expired or self.no_face_counter > 150:
             if manager_verified or recognition_done:
                 return True
         return False
     
     def reset_detection_timer(self):
         """Reset the detection timer"""
-        self.last_person_detected_time = time.time()
-        self.no_face_counter = 0
+        with self.lock:
+            self.last_person_detected_time = time.monotonic()
+            self.no_person_expired = False
+            self.no_face_counter = 0
+            self.arm_no_person_timer(self.no_person_timeout)
     
     def shutdown_system(self):
         """Shutdown the system"""
         self.system_active = False
+        with self.lock:
+            self.scheduler.cancel(self.no_person_timer)
     
     def is_system_active(self):
         """Check if system is active"""
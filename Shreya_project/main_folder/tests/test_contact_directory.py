@@ -0,0 +1,46 @@
+"""
+Contact lookup checks: python -m pytest tests
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contact_directory import ContactDirectory
+
+
+def make_directory(tmp_path, names):
+    path = tmp_path / "contacts.json"
+    path.write_text(json.dumps({name: "+10000000000" for name in names}), encoding="utf-8")
+    return ContactDirectory(str(path))
+
+
+def test_misheard_name_resolves(tmp_path):
+    directory = make_directory(tmp_path, ["nikhil", "neha", "shravani"])
+    assert directory.find("nikil") == "nikhil"
+    assert directory.find("Shravni") == "shravani"
+    assert directory.find("nikhil please") == "nikhil"
+
+
+def test_weak_matches_are_rejected(tmp_path):
+    directory = make_directory(tmp_path, ["nikhil", "neha"])
+    assert directory.find("na") is None
+    assert directory.find("nik") is None
+    assert directory.find("xyz") is None
+
+
+def test_ambiguous_first_name_is_rejected(tmp_path):
+    directory = make_directory(tmp_path, ["nikhil sharma", "nikhil rao"])
+    assert directory.find("nikhil") is None
+    assert directory.find("nikil sharma") == "nikhil sharma"
+
+
+def test_reloads_when_the_file_changes(tmp_path):
+    directory = make_directory(tmp_path, ["neha"])
+    assert directory.find("disha") is None
+    path = tmp_path / "contacts.json"
+    path.write_text(json.dumps({"neha": "+1", "disha": "+2", "meet": "+3"}), encoding="utf-8")
+    assert directory.find("disha") == "disha"
+    assert directory.get_stats()['loads'] == 2
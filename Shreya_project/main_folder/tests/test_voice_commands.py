@@ -0,0 +1,50 @@
+"""
+Command grammar checks: python -m pytest tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from voice_commands import CommandRegistry
+
+
+def make_registry():
+    # Same phrases as SmartCameraSystem.register_commands
+    registry = CommandRegistry()
+    registry.register(
+        "send_message",
+        ["send message", "send a message", "send message to {contact}", "send a message to {contact}",
+         "notify", "notify {contact}"],
+        None)
+    registry.register("reset", "reset", None)
+    registry.register("quit", ["quit", "exit"], None)
+    registry.register("pause", ["stop listening", "pause"], None)
+    return registry
+
+
+def test_slot_phrase_beats_bare_phrase_of_same_length():
+    match = make_registry().match("notify nikhil")
+    assert match.intent == "send_message"
+    assert match.slots == {"contact": "nikhil"}
+
+
+def test_bare_phrase_without_slot_words():
+    match = make_registry().match("notify")
+    assert match.intent == "send_message"
+    assert match.slots == {}
+
+
+def test_longest_phrase_captures_slot():
+    match = make_registry().match("please send a message to Nikhil Sharma")
+    assert match.phrase == "send a message to"
+    assert match.slots == {"contact": "nikhil sharma"}
+
+
+def test_first_registered_command_wins():
+    assert make_registry().match("reset and quit").intent == "reset"
+
+
+def test_whole_words_only():
+    assert make_registry().match("resetting the exits") is None
@@ -0,0 +1,141 @@
+"""
+Central monotonic timer scheduler for retry delays and timeouts
+"""
+
+import heapq
+import itertools
+import threading
+import time
+
+# Rebuild the heap when cancelled entries make up more than half of it
+COMPACT_MIN_SIZE = 64
+
+
+class TimerHandle:
+    """A registered deadline; returned by TimerScheduler.schedule"""
+
+    def __init__(self, deadline, callback, name=None):
+        self.deadline = deadline
+        self.callback = callback
+        self.name = name
+        self.cancelled = False
+        self.fired = False
+
+    def is_pending(self):
+        """Check if the timer has neither fired nor been cancelled"""
+        return not (self.cancelled or self.fired)
+
+    def remaining(self):
+        """Seconds until the deadline (0 once fired or cancelled)"""
+        if not self.is_pending():
+            return 0.0
+        return max(0.0, self.deadline - time.monotonic())
+
+
+class TimerScheduler:
+    """
+    Heap of deadlines on time.monotonic(), so wall-clock changes do not affect them.
+    A background thread sleeps until the earliest deadline and runs only the expired callbacks.
+    Callbacks run on the scheduler thread and must be short (set a flag, queue an event).
+    """
+
+    def __init__(self, name="timers"):
+        self.name = name
+        self.heap = []
+        self.counter = itertools.count()  # tie-breaker for equal deadlines
+        self.cancelled_count = 0
+        self.condition = threading.Condition()
+        self.thread = None
+        self.running = False
+
+    def schedule(self, delay, callback, name=None):
+        """Run callback() after delay seconds; returns a TimerHandle"""
+        handle = TimerHandle(time.monotonic() + delay, callback, name)
+        with self.condition:
+            heapq.heappush(self.heap, (handle.deadline, next(self.counter), handle))
+            # Wake the thread only if the new timer is now the earliest
+            if self.heap[0][2] is handle:
+                self.condition.notify()
+        self.start()
+        return handle
+
+    def cancel(self, handle):
+        """Cancel a pending timer (removed lazily from the heap)"""
+        if handle is None:
+            return
+        with self.condition:
+            if not handle.is_pending():
+                return
+            handle.cancelled = True
+            self.cancelled_count += 1
+            if self.cancelled_count > COMPACT_MIN_SIZE and self.cancelled_count * 2 > len(self.heap):
+                self.heap = [entry for entry in self.heap if not entry[2].cancelled]
+                heapq.heapify(self.heap)
+                self.cancelled_count = 0
+
+    def poll(self):
+        """Fire all expired timers; returns the number fired"""
+        now = time.monotonic()
+        expired = []
+        with self.condition:
+            while self.heap and self.heap[0][0] <= now:
+                handle = heapq.heappop(self.heap)[2]
+                if handle.cancelled:
+                    self.cancelled_count -= 1
+                    continue
+                handle.fired = True
+                expired.append(handle)
+
+        for handle in expired:
+            try:
+                handle.callback()
+            except Exception as e:
+                print(f"Timer {handle.name} error: {e}")
+        return len(expired)
+
+    def pending_count(self):
+        """Number of timers that have not fired or been cancelled"""
+        with self.condition:
+            return len(self.heap) - self.cancelled_count
+
+    def start(self):
+        """Start the scheduler thread (called automatically by schedule)"""
+        with self.condition:
+            if self.running:
+                return
+            self.running = True
+        self.thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop the scheduler thread; pending timers do not fire"""
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join()
+        self.thread = None
+
+    def _run(self):
+        while True:
+            with self.condition:
+                if not self.running:
+                    break
+                timeout = self.heap[0][0] - time.monotonic() if self.heap else None
+                if timeout is None or timeout > 0:
+                    self.condition.wait(timeout)
+                    continue
+            self.poll()
+
+
+_shared_scheduler = None
+_shared_lock = threading.Lock()
+
+
+def get_scheduler():
+    """Process-wide scheduler shared by all components"""
+    global _shared_scheduler
+    with _shared_lock:
+        if _shared_scheduler is None:
+            _shared_scheduler = TimerScheduler()
+        return _shared_scheduler
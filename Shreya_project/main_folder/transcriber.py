@@ -0,0 +1,194 @@
+"""
+Speech transcription decoupled from audio capture: a small worker pool with in-order delivery
+"""
+
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from config import TRANSCRIBER_WORKERS, TRANSCRIBER_USE_PROCESSES, TRANSCRIBER_QUEUE
+from speech_backends import create_backend
+
+# Per-process state, filled in by _init_worker
+_worker_state = {}
+
+
+def _init_worker(backend_name):
+    """Runs once in every worker process: load the speech backend (and its model)"""
+    _worker_state['backend'] = create_backend(backend_name)
+
+
+def _transcribe_in_worker(audio):
+    """Returns (text, error, seconds) so the parent's backend can record the latency"""
+    start = time.monotonic()
+    try:
+        return _worker_state['backend'].transcribe(audio), None, time.monotonic() - start
+    except Exception as e:
+        return None, e, time.monotonic() - start
+
+
+class Transcriber:
+    """
+    The capture thread hands finished phrases to submit() and goes straight back to listening,
+    while `workers` threads transcribe them concurrently. Every phrase gets a sequence number and
+    results reach on_result(seq, text, error) strictly in that order, one at a time, so a short
+    follow-up command never overtakes the one spoken before it. error is None on success, else the
+    backend's exception (sr.UnknownValueError, sr.RequestError, ...).
+    With use_processes the backend runs in worker processes, keeping STT off the video loop's GIL.
+    """
+
+    def __init__(self, backend, on_result, workers=None, use_processes=None, max_queued=None):
+        self.backend = backend
+        self.on_result = on_result
+        self.workers = workers or TRANSCRIBER_WORKERS
+        self.max_queued = max_queued or TRANSCRIBER_QUEUE
+        if use_processes is None:
+            use_processes = TRANSCRIBER_USE_PROCESSES
+
+        self.pool = None
+        if use_processes:
+            # spawn: forking a process that already runs camera and MediaPipe threads is unsafe
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(backend.name,)
+            )
+
+        # Phrases waiting for a worker: (seq, generation, audio)
+        self.queue = deque()
+        self.condition = threading.Condition()
+        self.next_seq = 0
+        self.generation = 0  # bumped by clear(); results of older phrases are discarded
+        self.running = False
+        self.threads = []
+
+        # In-order delivery
+        self.delivery_lock = threading.Lock()
+        self.finished = {}  # seq -> (text, error), or None for a skipped phrase
+        self.next_delivery = 0
+
+        # Statistics
+        self.submitted = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.total_seconds = 0.0
+
+    def start(self):
+        """Start the worker threads"""
+        with self.condition:
+            if self.running:
+                return
+            self.running = True
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop, name=f"transcriber-{index}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        mode = "processes" if self.pool is not None else "threads"
+        print(f"Transcriber started with {self.workers} worker {mode}")
+
+    def stop(self):
+        """Stop the workers; queued phrases are dropped, running transcriptions finish"""
+        with self.condition:
+            self.running = False
+            self.queue.clear()
+            self.condition.notify_all()
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+        if self.pool is not None:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+
+    def submit(self, audio):
+        """Queue a phrase for transcription without blocking; returns its sequence number"""
+        skipped = []
+        with self.condition:
+            seq = self.next_seq
+            self.next_seq += 1
+            self.submitted += 1
+            if len(self.queue) >= self.max_queued:
+                # Workers are behind: the oldest waiting phrase is dropped
+                skipped.append(self.queue.popleft()[0])
+                self.dropped += 1
+            self.queue.append((seq, self.generation, audio))
+            self.condition.notify()
+        for old_seq in skipped:
+            self._finish(old_seq, None)
+        return seq
+
+    def clear(self):
+        """Drop waiting phrases and discard the results of those being transcribed (e.g. on reset)"""
+        with self.condition:
+            self.generation += 1
+            skipped = [item[0] for item in self.queue]
+            self.queue.clear()
+        for seq in skipped:
+            self._finish(seq, None)
+
+    def _worker_loop(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.queue or not self.running)
+                if not self.running:
+                    return
+                seq, generation, audio = self.queue.popleft()
+                self.in_flight += 1
+
+            start = time.monotonic()
+            text, error = None, None
+            try:
+                if self.pool is not None:
+                    text, worker_error, seconds = self.pool.submit(_transcribe_in_worker, audio).result()
+                    self.backend.record(seconds, worker_error is not None)
+                    if worker_error is not None:
+                        raise worker_error
+                else:
+                    text = self.backend.recognize(audio)
+            except Exception as e:
+                error = e
+
+            with self.condition:
+                self.in_flight -= 1
+                self.completed += 1
+                self.total_seconds += time.monotonic() - start
+                current = generation == self.generation
+            self._finish(seq, (text, error) if current else None)
+
+    def _finish(self, seq, result):
+        # Holding the delivery lock while calling back keeps deliveries ordered and one at a time
+        with self.delivery_lock:
+            self.finished[seq] = result
+            while self.next_delivery in self.finished:
+                ready_seq = self.next_delivery
+                ready = self.finished.pop(ready_seq)
+                self.next_delivery += 1
+                if ready is None:
+                    continue
+                self.delivered += 1
+                try:
+                    self.on_result(ready_seq, *ready)
+                except Exception as e:
+                    print(f"Transcript handler failed: {e}")
+
+    def get_stats(self):
+        """Get submitted/delivered/dropped counts, backlog and average transcription time"""
+        with self.condition:
+            return {
+                'workers': self.workers,
+                'submitted': self.submitted,
+                'delivered': self.delivered,
+                'dropped': self.dropped,
+                'queued': len(self.queue),
+                'in_flight': self.in_flight,
+                'avg_ms': 1000.0 * self.total_seconds / self.completed if self.completed else 0.0
+            }
+
+    def format_stats(self):
+        """Short text line for overlay or console"""
+        stats = self.get_stats()
+        return (f"stt x{stats['workers']}: {stats['delivered']} done {stats['in_flight']} busy "
+                f"{stats['queued']} queued {stats['dropped']} dropped {stats['avg_ms']:.0f}ms")
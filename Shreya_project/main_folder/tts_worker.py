@@ -0,0 +1,185 @@
+"""
+Text-to-speech on its own thread: a prioritized queue that coalesces repeated and superseded prompts
+"""
+
+import heapq
+import itertools
+import threading
+import time
+
+import pyttsx3
+from config import TTS_MAX_AGE
+from phrase_cache import PhraseCache
+
+PRIORITY_URGENT = 0  # access denied, shutdown: drops every queued message of lower priority
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+
+class Utterance:
+    """One queued message"""
+
+    __slots__ = ('priority', 'seq', 'text', 'key', 'created', 'cancelled')
+
+    def __init__(self, priority, seq, text, key):
+        self.priority = priority
+        self.seq = seq
+        self.text = text
+        self.key = key
+        self.created = time.monotonic()
+        self.cancelled = False
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class TTSWorker:
+    """
+    speak() only queues the text and returns. One thread owns the pyttsx3 engine (it is not
+    thread-safe) and speaks the queue in priority order, oldest first within a priority.
+    - Messages with the same key coalesce: a newer one takes the queued one's place, so several
+      "Face not recognized" prompts in a row are spoken once, with the latest attempt count.
+    - An urgent message drops every queued message of lower priority.
+    - Messages still queued TTS_MAX_AGE seconds after they were requested are dropped as stale.
+    The sentence being spoken is always finished.
+    Fixed prompts are played from a PhraseCache of pre-rendered WAV files; the thread renders
+    the ones still missing whenever the queue is empty.
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.by_key = {}  # key -> its queued Utterance
+        self.counter = itertools.count()
+        self.condition = threading.Condition()
+        self.thread = None
+        self.running = False
+        self.speaking = None
+        self.cache = None
+
+        # Statistics
+        self.spoken = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    def start(self):
+        """Start the speech thread (called automatically by speak)"""
+        with self.condition:
+            if self.running:
+                return
+            self.running = True
+        self.thread = threading.Thread(target=self._run, name="tts", daemon=True)
+        self.thread.start()
+
+    def speak(self, text, priority=PRIORITY_NORMAL, key=None):
+        """Queue text without waiting; key groups messages that supersede each other (default: the text)"""
+        key = key or text
+        with self.condition:
+            seq = next(self.counter)
+            queued = self.by_key.get(key)
+            if queued is not None and not queued.cancelled:
+                # Take the superseded message's place in the queue
+                queued.cancelled = True
+                self.coalesced += 1
+                seq = queued.seq
+                priority = min(priority, queued.priority)
+            if priority == PRIORITY_URGENT:
+                for stale in self.heap:
+                    if not stale.cancelled and stale.priority > PRIORITY_URGENT:
+                        stale.cancelled = True
+                        self.dropped += 1
+            utterance = Utterance(priority, seq, text, key)
+            heapq.heappush(self.heap, utterance)
+            self.by_key[key] = utterance
+            self.condition.notify()
+        self.start()
+
+    def stop(self, timeout=None):
+        """Speak what is still queued for up to timeout seconds, then stop the thread"""
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        if self.thread is not None:
+            self.thread.join(timeout)
+            if self.thread.is_alive():
+                print("Dropping queued speech")
+                with self.condition:
+                    self.heap.clear()
+                    self.by_key.clear()
+        self.thread = None
+
+    def _next(self):
+        # Called with the lock held: the next live message, or None when the queue is empty
+        while self.heap:
+            utterance = heapq.heappop(self.heap)
+            if utterance.cancelled:
+                continue
+            if self.by_key.get(utterance.key) is utterance:
+                del self.by_key[utterance.key]
+            if time.monotonic() - utterance.created > TTS_MAX_AGE:
+                self.dropped += 1
+                continue
+            return utterance
+        return None
+
+    def _run(self):
+        engine = pyttsx3.init()
+        try:
+            self.cache = PhraseCache(engine)
+        except Exception as e:
+            print(f"Phrase cache unavailable: {e}")
+        try:
+            while True:
+                with self.condition:
+                    if not self.heap and self.running and self.cache is not None and self.cache.unrendered:
+                        idle = True
+                    else:
+                        idle = False
+                        self.condition.wait_for(lambda: self.heap or not self.running)
+                        utterance = self._next()
+                        if utterance is None:
+                            if not self.running:
+                                return
+                            continue
+                        self.speaking = utterance
+
+                if idle:
+                    # Nothing to say: render one missing prompt, then look at the queue again
+                    try:
+                        self.cache.render_next()
+                    except Exception as e:
+                        print(f"Prompt rendering failed, speaking prompts live: {e}")
+                        self.cache.unrendered.clear()
+                    continue
+
+                try:
+                    print("SPEAKING:", utterance.text)
+                    if self.cache is None or not self.cache.play(utterance.text):
+                        engine.say(utterance.text)
+                        engine.runAndWait()
+                except Exception as e:
+                    print(f"Speech error: {e}")
+
+                with self.condition:
+                    self.speaking = None
+                    self.spoken += 1
+        finally:
+            if self.cache is not None:
+                self.cache.close()
+
+    def get_stats(self):
+        """Spoken, coalesced and dropped message counts"""
+        with self.condition:
+            return {
+                'queued': sum(1 for utterance in self.heap if not utterance.cancelled),
+                'spoken': self.spoken,
+                'coalesced': self.coalesced,
+                'dropped': self.dropped,
+                'cache': self.cache.get_stats() if self.cache is not None else None
+            }
+
+    def format_stats(self):
+        """Short text line for the console"""
+        stats = self.get_stats()
+        return (f"tts: {stats['spoken']} spoken, {stats['coalesced']} coalesced, "
+                f"{stats['dropped']} dropped, {stats['queued']} queued"
+                + (f", {stats['cache']['hits']} cached" if stats['cache'] else ""))
@@ -0,0 +1,132 @@
+"""
+Wake word spotting: a small grammar-limited recognizer decides which phrases reach full speech-to-text
+"""
+
+import json
+import threading
+import time
+
+from config import (AUDIO_SAMPLE_RATE, AUDIO_FRAME_MS, VOSK_MODEL_PATH, WAKE_WORD_ENABLED, WAKE_WORD_PHRASES,
+                    WAKE_WORD_HANGOVER_SECONDS, WAKE_WORD_CPU_BUDGET, WAKE_WORD_BUDGET_WINDOW_SECONDS)
+from speech_backends import load_vosk_model
+
+
+class WakeWordSpotter:
+    """
+    Runs Vosk restricted to a grammar of only the wake phrases (plus "[unk]" for everything else),
+    which decodes much faster than open-vocabulary recognition and never leaves the device.
+    The audio stream feeds it every frame; silent frames are skipped, so the spotter costs CPU only
+    while someone talks. The CPU time of every frame is measured and capped at WAKE_WORD_CPU_BUDGET
+    of one core per window: once a window has used its share, the partial hypothesis is dropped and
+    the rest of the utterance is skipped, so a phrase is never decoded with frames missing from it.
+    Without vosk or its model the spotter is disabled and every phrase is transcribed as before.
+    """
+
+    def __init__(self, phrases=None, cpu_budget=None):
+        self.phrases = [phrase.lower() for phrase in (phrases or WAKE_WORD_PHRASES)]
+        self.cpu_budget = cpu_budget if cpu_budget is not None else WAKE_WORD_CPU_BUDGET
+        self.window_seconds = WAKE_WORD_BUDGET_WINDOW_SECONDS
+        self.hangover_frames = max(1, int(WAKE_WORD_HANGOVER_SECONDS * 1000 / AUDIO_FRAME_MS))
+
+        self.recognizer = None
+        if WAKE_WORD_ENABLED:
+            try:
+                model = load_vosk_model(VOSK_MODEL_PATH)
+                import vosk
+                grammar = json.dumps(self.phrases + ["[unk]"])
+                self.recognizer = vosk.KaldiRecognizer(model, AUDIO_SAMPLE_RATE, grammar)
+            except RuntimeError as e:
+                print(f"{e} - wake word disabled, every phrase is transcribed")
+
+        self.quiet_frames = self.hangover_frames  # frames since the last loud one
+        self.fed = False  # the recognizer holds audio since its last reset
+        self.throttling = False  # the current utterance ran out of CPU budget
+        self.window_start = time.monotonic()
+        self.window_cpu = 0.0
+
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.detections = 0
+        self.frames = 0
+        self.decoded = 0
+        self.throttled = 0
+        self.cpu_seconds = 0.0
+
+    @property
+    def enabled(self):
+        return self.recognizer is not None
+
+    def process(self, frame, is_loud=True):
+        """Feed one 16-bit mono frame from the audio stream; True when a wake phrase was just heard"""
+        if self.recognizer is None:
+            return False
+
+        self.frames += 1
+        self.quiet_frames = 0 if is_loud else self.quiet_frames + 1
+        if self.quiet_frames >= self.hangover_frames:
+            # Nobody is talking: skip decoding and forget the unfinished hypothesis
+            self.reset()
+            self.throttling = False
+            return False
+
+        now = time.monotonic()
+        if now - self.window_start >= self.window_seconds:
+            self.window_start = now
+            self.window_cpu = 0.0
+        if self.throttling or self.window_cpu >= self.cpu_budget * self.window_seconds:
+            if not self.throttling:
+                # Out of budget: give up on this utterance rather than decode it with gaps
+                self.reset()
+                self.throttling = True
+            self.throttled += 1
+            return False
+
+        start = time.thread_time()
+        if self.recognizer.AcceptWaveform(frame):
+            text = json.loads(self.recognizer.Result()).get('text', '')
+        else:
+            text = json.loads(self.recognizer.PartialResult()).get('partial', '')
+        elapsed = time.thread_time() - start
+        self.fed = True
+        self.window_cpu += elapsed
+        with self.lock:
+            self.decoded += 1
+            self.cpu_seconds += elapsed
+
+        if not any(phrase in text for phrase in self.phrases):
+            return False
+        self.reset()
+        with self.lock:
+            self.detections += 1
+        return True
+
+    def reset(self):
+        """Drop the partial hypothesis (end of an utterance)"""
+        if self.fed:
+            self.recognizer.Reset()
+            self.fed = False
+
+    def get_stats(self):
+        """Detections, frames decoded/throttled and CPU use as a share of one core"""
+        with self.lock:
+            elapsed = max(1e-6, time.monotonic() - self.started)
+            return {
+                'enabled': self.enabled,
+                'phrases': self.phrases,
+                'detections': self.detections,
+                'decoded_frames': self.decoded,
+                'throttled_frames': self.throttled,
+                'cpu_seconds': round(self.cpu_seconds, 2),
+                'cpu_share': self.cpu_seconds / elapsed,
+                'cpu_budget': self.cpu_budget,
+                'ms_per_frame': 1000.0 * self.cpu_seconds / self.decoded if self.decoded else 0.0
+            }
+
+    def format_stats(self):
+        """Short text line for overlay or console"""
+        stats = self.get_stats()
+        if not stats['enabled']:
+            return "wake word: off"
+        return (f"wake word: {stats['detections']} heard, cpu {stats['cpu_share']:.1%} "
+                f"(budget {stats['cpu_budget']:.0%}), {stats['ms_per_frame']:.1f}ms/frame, "
+                f"{stats['throttled_frames']} throttled")
@@ -1,80 +1,68 @@
 import pywhatkit
 import json
-import os
 import threading
+from contact_directory import ContactDirectory
 
 class WhatsAppHandler:
     def __init__(self, contacts_file="contacts.json"):
         self.contacts_file = contacts_file
+        self.directory = ContactDirectory(contacts_file)
         
     def load_contacts(self):
-        """Load contacts from JSON file"""
-        try:
-            if not os.path.exists(self.contacts_file):
-                print("Contacts file not found.")
-                return None
-                
-            with open(self.contacts_file, "r") as file:
-                contacts = json.load(file)
-                return contacts
-        except json.JSONDecodeError:
-            print("Contacts file format error.")
-            return None
-        except Exception as e:
-            print(f"Error loading contacts: {e}")
-            return None
+        """Load contacts from JSON file (cached until the file changes)"""
+        return self.directory.load()
     
     def find_contact(self, contacts, name_part):
-        """Find contact by name (case-insensitive)"""
-        name_part = name_part.strip().lower()
-        
-        for contact in contacts:
-            if contact.lower() in name_part or name_part in contact.lower():
-                return contact
-        return None
+        """Find the contact a spoken name most likely means (exact, word, prefix or sound-alike match)"""
+        return self.directory.find(name_part)
     
     def send_whatsapp_message(self, command, speak_callback=None):
         """Send WhatsApp message based on voice command"""
-        def send_message():
-            try:
-                contacts = self.load_contacts()
-                if not contacts:
-                    if speak_callback:
-                        speak_callback("Contacts file not found or invalid.")
-                    return
+        threading.Thread(target=self.deliver_message, args=(command, speak_callback), daemon=True).start()
+    
+    def deliver_message(self, command, speak_callback=None, contact=None):
+        """Send the WhatsApp message (blocking); without a contact from the command grammar, parse it from the command"""
+        try:
+            contacts = self.load_contacts()
+            if not contacts:
+                if speak_callback:
+                    speak_callback("Contacts file not found or invalid.")
+                return
 
+            if contact:
+                name_part = contact.strip().lower()
+            else:
                 # Better parsing of contact name
                 command_parts = command.split("to")
                 if len(command_parts) < 2:
                     if speak_callback:
                         speak_callback("Please specify who to send the message to.")
                     return
-                    
+                        
                 name_part = command_parts[-1].strip().lower()
                 
-                # Find contact (case-insensitive)
-                contact_name = self.find_contact(contacts, name_part)
+            # Find contact (case-insensitive)
+            contact_name = self.find_contact(contacts, name_part)
                 
-                if contact_name and contact_name in contacts:
-                    number = contacts[contact_name]
-                    message = f"Hello {contact_name.title()}, the manager wants to see you."
+            if contact_name and contact_name in contacts:
+                number = contacts[contact_name]
+                message = f"Hello {contact_name.title()}, the manager wants to see you."
                     
-                    print(f"Sending message to {contact_name} at {number}")
-                    pywhatkit.sendwhatmsg_instantly(number, message, wait_time=15, tab_close=True)
+                print(f"Sending message to {contact_name} at {number}")
+                pywhatkit.sendwhatmsg_instantly(number, message, wait_time=15, tab_close=True)
                     
-                    if speak_callback:
-                        speak_callback(f"Message sent to {contact_name}")
-                else:
-                    if speak_callback:
-                        speak_callback("Contact not found. Please check the name.")
-                    print(f"Available contacts: {list(contacts.keys())}")
-                    
-            except Exception as e:
-                print(f"Error sending message: {e}")
                 if speak_callback:
-                    speak_callback("Failed to send message due to an error.")
-
-        threading.Thread(target=send_message, daemon=True).start()
+                    speak_callback(f"Message sent to {contact_name}")
+            else:
+                if speak_callback:
+                    speak_callback("Contact not found. Please check the name.")
+                closest = [name for name, _ in self.directory.candidates(name_part)]
+                print(f"No contact matches '{name_part}'. Closest: {closest}")
+                    
+        except Exception as e:
+            print(f"Error sending message: {e}")
+            if speak_callback:
+                speak_callback("Failed to send message due to an error.")
     
     def create_sample_contacts(self):
         """Create a sample contacts file"""
@@ -94,10 +82,8 @@ class WhatsAppHandler:
     def add_contact(self, name, number):
         """Add a new contact to the contacts file"""
         try:
-            contacts = self.load_contacts()
-            if contacts is None:
-                contacts = {}
-                
+            # Copy: the loaded dict is the directory's cached one
+            contacts = dict(self.load_contacts() or {})
             contacts[name.lower()] = number
             
             with open(self.contacts_file, "w") as file:
@@ -1,3 +1,5 @@
+import heapq
+import itertools
 import threading
 import cv2
 import face_recognition
@@ -9,9 +11,11 @@ import mediapipe as mp
 import time
 import pywhatkit
 import json
+import re
+from difflib import SequenceMatcher
+from concurrent.futures import ThreadPoolExecutor
 
 # Initialize components
-engine = pyttsx3.init()
 recognizer = sr.Recognizer()
 mic = sr.Microphone()
 mp_face_mesh = mp.solutions.face_mesh
@@ -26,6 +30,10 @@ face_mesh = mp_face_mesh.FaceMesh(
 CONTACTS_FILE = "contacts.json"
 FACE_MATCH_THRESHOLD = 0.48  # Fixed threshold for proper face matching
 NO_PERSON_TIMEOUT = 10  # seconds before reset if no person detected
+CONTACT_MATCH_THRESHOLD = 0.8  # lowest score at which a spoken name picks a contact
+CONTACT_MATCH_MARGIN = 0.1  # lead the best contact needs over the runner-up
+SPEECH_BACKEND = "google"  # "google" (online), "vosk" or "sphinx" (offline)
+VOSK_MODEL_PATH = "models/vosk-model-small-en-us-0.15"
 
 # Global variables
 manager_verified = False
@@ -45,15 +53,57 @@ last_attempt_time = 0
 face_recognition_running = False
 continuous_listening_active = False
 voice_thread = None
+# Messages are sent one at a time in the background; the voice listener keeps running meanwhile
+message_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="messaging")
+
+# Speech runs on its own thread: speak() queues the text and returns at once.
+# Queue entries are [priority, seq, text, key, cancelled, created]; lower priority values are spoken first.
+SPEECH_URGENT = 0  # drops every queued message of lower priority
+SPEECH_NORMAL = 1
+SPEECH_MAX_AGE = 10  # seconds a queued prompt stays worth saying
+SPEECH_DRAIN_TIMEOUT = 5  # seconds queued speech may take to finish on exit
+speech_queue = []
+speech_condition = threading.Condition()
+speech_counter = itertools.count()
+speech_busy = False
 
 # Speech function with error handling
-def speak(text):
-    try:
-        print("SPEAKING:", text)
-        engine.say(text)
-        engine.runAndWait()
-    except Exception as e:
-        print(f"Speech error: {e}")
+def speak(text, priority=SPEECH_NORMAL, key=None):
+    key = key or text
+    with speech_condition:
+        for entry in speech_queue:
+            # A newer message with the same key supersedes the queued one (e.g. attempt counts)
+            if not entry[4] and (entry[3] == key or (priority == SPEECH_URGENT and entry[0] > SPEECH_URGENT)):
+                entry[4] = True
+        heapq.heappush(speech_queue, [priority, next(speech_counter), text, key, False, time.monotonic()])
+        speech_condition.notify_all()
+
+def speech_worker():
+    global speech_busy
+    engine = pyttsx3.init()  # pyttsx3 is used only from this thread
+    while True:
+        with speech_condition:
+            speech_busy = False
+            speech_condition.notify_all()
+            speech_condition.wait_for(lambda: speech_queue)
+            priority, seq, text, key, cancelled, created = heapq.heappop(speech_queue)
+            if cancelled or time.monotonic() - created > SPEECH_MAX_AGE:
+                continue
+            speech_busy = True
+        try:
+            print("SPEAKING:", text)
+            engine.say(text)
+            engine.runAndWait()
+        except Exception as e:
+            print(f"Speech error: {e}")
+
+def wait_for_speech(timeout):
+    # Let queued messages finish before the process exits
+    with speech_condition:
+        if not speech_condition.wait_for(lambda: not speech_queue and not speech_busy, timeout):
+            print("Dropping queued speech")
+
+threading.Thread(target=speech_worker, name="tts", daemon=True).start()
 
 # Gaze detection for both eyes separately
 def get_both_eyes_gaze_direction(landmarks):
@@ -120,14 +170,14 @@ def run_face_recognition_once(frame_rgb):
         clarity = cv2.Laplacian(gray, cv2.CV_64F).var()
 
         if clarity < 40:
-            speak("Face too blurry. Please come closer or adjust lighting.")
+            speak("Face too blurry. Please come closer or adjust lighting.", key="verification")
             print("Blurry face detected. Clarity:", clarity)
             return
 
         face_locations = face_recognition.face_locations(frame_for_recognition, model="hog")
 
         if not face_locations:
-            speak("No face detected. Try again.")
+            speak("No face detected. Try again.", key="verification")
             return
 
         scaled_locations = [(top * 2, right * 2, bottom * 2, left * 2)
@@ -151,7 +201,7 @@ def run_face_recognition_once(frame_rgb):
             if face_distance < FACE_MATCH_THRESHOLD:
                 manager_verified = True
                 recognition_completed = True
-                speak("Manager verified. Ready for commands.")
+                speak("Manager verified. Ready for commands.", key="verification")
                 print(" Manager verification successful")
                 start_continuous_listening()
                 return
@@ -160,11 +210,12 @@ def run_face_recognition_once(frame_rgb):
             print(f" Face not matched - Attempt {verification_attempts}")
 
             if verification_attempts >= MAX_ATTEMPTS:
-                speak("Access denied after three failed attempts.")
+                speak("Access denied after three failed attempts.", SPEECH_URGENT, key="verification")
                 recognition_completed = True
                 print("Access locked for this person.") 
             else:
-                speak(f"Face not recognized. Attempt {verification_attempts} of {MAX_ATTEMPTS}. Try again.")
+                speak(f"Face not recognized. Attempt {verification_attempts} of {MAX_ATTEMPTS}. Try again.",
+                      key="verification")
 
     except Exception as e:
         print(f"Error during face recognition: {e}")
@@ -175,6 +226,40 @@ def run_face_recognition_once(frame_rgb):
         face_recognition_running = False
 
 
+# Speech-to-text: Google needs the network, Vosk and Sphinx run offline.
+# A backend that cannot load (missing package or model) falls back to Google.
+vosk_model = None
+
+def load_speech_backend():
+    global SPEECH_BACKEND, vosk_model
+    try:
+        if SPEECH_BACKEND == "vosk":
+            import vosk
+            if not os.path.isdir(VOSK_MODEL_PATH):
+                raise RuntimeError(f"Vosk model not found: {VOSK_MODEL_PATH}")
+            vosk.SetLogLevel(-1)
+            vosk_model = vosk.Model(VOSK_MODEL_PATH)
+        elif SPEECH_BACKEND == "sphinx":
+            import pocketsphinx  # noqa: F401
+    except (ImportError, RuntimeError) as e:
+        print(f"Speech backend '{SPEECH_BACKEND}' unavailable ({e}) - falling back to 'google'")
+        SPEECH_BACKEND = "google"
+    print(f"Speech backend: {SPEECH_BACKEND}")
+
+def transcribe(audio):
+    # Raises sr.UnknownValueError / sr.RequestError like recognize_google for every backend
+    if SPEECH_BACKEND == "vosk":
+        import vosk
+        kaldi = vosk.KaldiRecognizer(vosk_model, 16000)
+        kaldi.AcceptWaveform(audio.get_raw_data(convert_rate=16000, convert_width=2))
+        text = json.loads(kaldi.FinalResult()).get("text", "")
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+    if SPEECH_BACKEND == "sphinx":
+        return recognizer.recognize_sphinx(audio)
+    return recognizer.recognize_google(audio)
+
 # Continuous voice listener in background thread
 def continuous_voice_listener():
     global continuous_listening_active, manager_verified, system_active
@@ -188,7 +273,7 @@ def continuous_voice_listener():
                 recognizer.adjust_for_ambient_noise(source, duration=0.3)
                 audio = recognizer.listen(source, timeout=5, phrase_time_limit=5)
             
-            command = recognizer.recognize_google(audio).lower()
+            command = transcribe(audio).lower()
             print(f"Command received: {command}")
             
             if "send message" in command or "notify" in command:
@@ -198,7 +283,7 @@ def continuous_voice_listener():
                 reset_system()
                 break
             elif "quit" in command or "exit" in command:
-                speak("Shutting down system")
+                speak("Shutting down system", SPEECH_URGENT)
                 system_active = False
                 break
             elif "stop listening" in command or "pause" in command:
@@ -255,25 +340,78 @@ def reset_system():
     speak("System reset")
     print("System manually reset - recognition will be performed again")
 
-# Send WhatsApp message thread with error handling
+# Contacts are parsed once and re-read only when contacts.json changes (mtime or size).
+# Names are indexed by word and by Soundex code, so "nikil" finds "nikhil" without a scan.
+# Only the single messaging worker touches the cache.
+contacts_cache = {"signature": None, "contacts": None, "words": {}, "by_key": {}}
+SOUNDEX_CODES = {}
+for letters, digit in (("bfpv", "1"), ("cgjkqsxz", "2"), ("dt", "3"), ("l", "4"), ("mn", "5"), ("r", "6")):
+    SOUNDEX_CODES.update(dict.fromkeys(letters, digit))
+
+def soundex(word):
+    code, previous = word[0].upper(), SOUNDEX_CODES.get(word[0], "")
+    for letter in word[1:]:
+        digit = SOUNDEX_CODES.get(letter, "")
+        if digit and digit != previous:
+            code += digit
+        if letter not in "hw":
+            previous = digit
+    return code[:4].ljust(4, "0")
+
+def load_contacts():
+    stat = os.stat(CONTACTS_FILE)  # FileNotFoundError if missing
+    signature = (stat.st_mtime_ns, stat.st_size)
+    if signature != contacts_cache["signature"]:
+        with open(CONTACTS_FILE, "r") as file:
+            contacts = json.load(file)
+        words, by_key = {}, {}
+        for name in contacts:
+            words[name] = re.findall(r"[a-z0-9]+", name.lower())
+            for word in words[name]:
+                for key in (word, soundex(word), word[:3]):
+                    by_key.setdefault(key, set()).add(name)
+        contacts_cache.update(signature=signature, contacts=contacts, words=words, by_key=by_key)
+    return contacts_cache["contacts"]
+
+def find_contact(name_part):
+    # Score only the contacts sharing a word, Soundex code or first letters with the spoken name
+    spoken_words = re.findall(r"[a-z0-9]+", name_part.lower())
+    found = set()
+    for spoken in spoken_words:
+        for key in (spoken, soundex(spoken), spoken[:3]):
+            found |= contacts_cache["by_key"].get(key, set())
+
+    def score(name):
+        # Best word's similarity, scaled by how much of the name was said
+        scores = []
+        for word in contacts_cache["words"][name]:
+            best = 0.0
+            for spoken in spoken_words:
+                if spoken == word:
+                    best = 1.0
+                elif spoken.startswith(word) or word.startswith(spoken) or soundex(spoken) == soundex(word):
+                    best = max(best, SequenceMatcher(None, spoken, word).ratio())
+            scores.append(best)
+        return max(scores) * (0.8 + 0.2 * sum(scores) / len(scores)) if scores else 0.0
+
+    ranked = sorted(((score(name), name) for name in found), key=lambda item: (-item[0], item[1]))
+    if not ranked or ranked[0][0] < CONTACT_MATCH_THRESHOLD:
+        return None
+    # A real message is sent: refuse when the runner-up is about as likely
+    if len(ranked) > 1 and ranked[0][0] - ranked[1][0] < CONTACT_MATCH_MARGIN:
+        print(f"Contact '{name_part}' is ambiguous: {[name for _, name in ranked[:2]]}")
+        return None
+    return ranked[0][1]
+
 # Send WhatsApp message thread with error handling
 def send_whatsapp_message(command):
     def send_message():
-        global continuous_listening_active, voice_thread
-
         try:
-            # Temporarily pause voice listening
-            if continuous_listening_active:
-                print("Pausing voice command listening during message sending.")
-                continuous_listening_active = False
-                voice_thread.join(timeout=5)  # Wait for current voice thread to stop
-
             if not os.path.exists(CONTACTS_FILE):
                 speak("Contacts file not found.")
                 return
 
-            with open(CONTACTS_FILE, "r") as file:
-                contacts = json.load(file)
+            contacts = load_contacts()
 
             command_parts = command.split("to")
             if len(command_parts) < 2:
@@ -282,11 +420,7 @@ def send_whatsapp_message(command):
 
             name_part = command_parts[-1].strip().lower()
 
-            name = None
-            for contact in contacts:
-                if contact.lower() in name_part or name_part in contact.lower():
-                    name = contact
-                    break
+            name = find_contact(name_part)
 
             if name and name in contacts:
                 number = contacts[name]
@@ -296,25 +430,23 @@ def send_whatsapp_message(command):
                 speak(f"Message sent to {name}")
             else:
                 speak("Contact not found. Please check the name.")
-                print(f"Available contacts: {list(contacts.keys())}")
+                print(f"No contact matches '{name_part}'")
 
         except json.JSONDecodeError:
             speak("Contacts file format error.")
         except Exception as e:
             print(f"Error sending message: {e}")
             speak("Failed to send message due to an error.")
-        finally:
-            # Resume voice command listening
-            print("Resuming voice command listening.")
-            start_continuous_listening()
 
-    threading.Thread(target=send_message, daemon=True).start()
+    message_executor.submit(send_message)
 
 
 def main():
     global manager_encoding, system_active, manager_verified, recognition_completed, both_eyes_gaze_detected
     global last_person_detected_time, no_face_counter, face_recognition_running, continuous_listening_active
     
+    load_speech_backend()
+    
     # Load manager image and encoding
     try:
         if not os.path.exists("C:\\Users\\DeLL\\smart_camera_project\\mains\\Shreya.jpg"):
@@ -424,7 +556,7 @@ def main():
             
             key = cv2.waitKey(1) & 0xFF
             if key == ord('q'):
-                speak("System shutting down")
+                speak("System shutting down", SPEECH_URGENT)
                 break
             elif key == ord('r'):
                 reset_system()
@@ -439,3 +571,4 @@ def main():
 
 if __name__ == "__main__":
     main()
+    wait_for_speech(SPEECH_DRAIN_TIMEOUT)